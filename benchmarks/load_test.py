@@ -0,0 +1,126 @@
+"""
+End-to-end search load test against the mock Scansan server.
+
+    python benchmarks/load_test.py --users 8 --searches 200 --latency-ms 80
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8765/v1 --cache-bytes 0
+    python benchmarks/load_test.py --client-rate-scale 1   # with the production client-side quotas
+
+Starts src/mock_scansan_server.py in-process (unless --base-url is given),
+points config at it through SCANSAN_BASE_URL and runs search_properties
+from several concurrent "users". Reports throughput and p50/p95/p99 latency.
+Client-side rate limiting is off by default (it would cap throughput at the
+Scansan plan quota, not measure the app), see --client-rate-scale.
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+import mock_scansan_server
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_load(search_properties, areas, users, searches):
+    """searches calls spread over users threads -> (latencies in seconds, errors, wall seconds)"""
+    def one_search(i):
+        start = time.perf_counter()
+        try:
+            properties = search_properties(areas[i % len(areas)], query=areas[i % len(areas)])
+            ok = bool(properties)
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    start = time.perf_counter()
+    # main.py prints per-request diagnostics - keep the report readable
+    with redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=users) as pool:
+            results = list(pool.map(one_search, range(searches)))
+    wall = time.perf_counter() - start
+
+    latencies = [seconds for seconds, _ in results]
+    errors = sum(1 for _, ok in results if not ok)
+    return latencies, errors, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test search_properties against a mock Scansan API")
+    parser.add_argument("--base-url", default=None, help="use an already running server instead of starting one")
+    parser.add_argument("--users", type=int, default=8, help="concurrent searches")
+    parser.add_argument("--searches", type=int, default=100, help="total searches")
+    parser.add_argument("--areas", type=int, default=20, help="distinct areas searched (fewer = more cache hits)")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--client-rate-scale", type=float, default=0.0,
+                        help="multiply the client-side RATE_LIMITS (0 = off, 1 = production quotas)")
+    parser.add_argument("--cache-bytes", type=int, default=None, help="override CACHE_MAX_BYTES (0 disables the response cache)")
+    parser.add_argument("--output", default=None, help="write results JSON here")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if (base_url is None):
+        server, base_url = mock_scansan_server.start_server(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                                            error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate)
+
+    # config reads the base URL at import time, so set it before importing the app
+    os.environ["SCANSAN_BASE_URL"] = base_url
+    os.environ.setdefault("SCANSAN_API_KEY", "load-test")
+    os.environ["SCANSAN_RATE_LIMIT_SCALE"] = str(args.client_rate_scale)
+    import scansan_client
+    from config import UK_AREAS
+    from main import search_properties
+
+    if (args.cache_bytes is not None):
+        scansan_client.response_cache.max_bytes = args.cache_bytes
+
+    areas = UK_AREAS[:args.areas]
+    latencies, errors, wall = run_load(search_properties, areas, args.users, args.searches)
+
+    report = {
+        "base_url": base_url,
+        "users": args.users,
+        "client_rate_scale": args.client_rate_scale,
+        "searches": args.searches,
+        "errors": errors,
+        "throughput": args.searches / wall,
+        "mean": statistics.mean(latencies),
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "cache": scansan_client.get_cache_stats(),
+        "requests": scansan_client.get_rate_limit_stats(),
+    }
+
+    print(f"{args.searches} searches, {args.users} users against {base_url}")
+    print(f"throughput {report['throughput']:8.1f} searches/s   errors {errors}")
+    print(f"latency    p50 {report['p50'] * 1000:.0f} ms   p95 {report['p95'] * 1000:.0f} ms   p99 {report['p99'] * 1000:.0f} ms")
+    print(f"cache      {report['cache']}")
+    print(f"requests   {report['requests']}")
+
+    if (args.output):
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if (server is not None):
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
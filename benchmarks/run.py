@@ -0,0 +1,185 @@
+"""
+Training and inference benchmarks on deterministic synthetic data.
+
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --output new.json --compare bench.json
+
+Each benchmark is repeated and reported as min/median seconds. With
+--compare, benchmarks slower than the previous run by more than
+--threshold are listed and the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+sys.path.insert(0, BENCH_DIR)
+
+import catboost
+import numpy as np
+import pandas as pd
+from catboost import CatBoostRegressor
+
+import model
+import predictor
+from dataset import read_compact
+from feature_schema import TARGET_COLUMN
+from preprocessing import preprocess
+from http_client import json_loads
+from synthetic import make_epc_descriptions, make_historical_payload, make_training_frame
+from translator import sort_descriptions
+from valuation_store import PostcodeValuations
+
+
+def timed(function, repeats):
+    """Run function repeats times -> (last result, list of seconds)"""
+    seconds = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        seconds.append(time.perf_counter() - start)
+    return result, seconds
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(rows, iterations, repeats, description_rows, threads):
+    results = {}
+
+    def record(name, function, times=repeats):
+        result, seconds = timed(function, times)
+        results[name] = {
+            "min": min(seconds),
+            "median": statistics.median(seconds),
+            "repeats": times,
+        }
+        print(f"{name:<24} median {results[name]['median'] * 1000:10.1f} ms   min {results[name]['min'] * 1000:10.1f} ms")
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # setup - not timed
+        data_path = os.path.join(tmp, "training_data.parquet")
+        make_training_frame(rows).to_parquet(data_path, index=False)
+
+        raw = record("parquet_load", lambda: read_compact(data_path))
+        df = record("preprocess", lambda: preprocess(raw.copy()))
+
+        X = df.drop(columns=[TARGET_COLUMN])
+        y = df[TARGET_COLUMN]
+        train_pool, test_pool, y_test = record("pool_construction", lambda: model.make_pools(X, y))
+
+        fit_params = {**model.params, "iterations": iterations, "thread_count": threads, "allow_writing_files": False}
+        fit_params.pop("od_type")
+        fit_params.pop("od_wait")
+
+        def fit():
+            regressor = CatBoostRegressor(**fit_params)
+            regressor.fit(train_pool, verbose=False)
+            return regressor
+
+        fitted = record("fit", fit, times=1)
+        results["fit"]["iterations"] = iterations
+
+        # prediction goes through predictor, as the app does
+        model_path = os.path.join(tmp, "bench.cbm")
+        fitted.save_model(model_path)
+        predictor.load_model(model_path)
+
+        rng = np.random.default_rng(0)
+        for name, n in [("predict_1", 1), ("predict_1k", 1_000), ("predict_100k", 100_000)]:
+            batch = X.iloc[rng.integers(0, len(X), n)].reset_index(drop=True)
+            record(name, lambda: predictor.predict(batch, model_path))
+
+        # the details page forecast path - per-model latency comes from predictor's stats
+        batch = X.iloc[rng.integers(0, len(X), 1_000)].reset_index(drop=True)
+        record("predict_ensemble_1k", lambda: predictor.predict_ensemble(batch, [model_path], thread_count=threads))
+        results["predict_ensemble_1k"]["models"] = {
+            os.path.basename(name): stats for name, stats in predictor.get_latency_stats().items()
+        }
+
+        descriptions = make_epc_descriptions(description_rows)
+        record("sort_descriptions", lambda: sort_descriptions(descriptions.copy()))
+        results["sort_descriptions"]["rows"] = description_rows
+
+        # historical valuations payload -> per-address columns (200 properties x 25 years)
+        payload = make_historical_payload(200, 300)
+        record("parse_valuations", lambda: PostcodeValuations.from_response(json_loads(payload)))
+        record("parse_valuations_rows", lambda: PostcodeValuations.from_records(json_loads(payload)["data"]))
+        results["parse_valuations"]["bytes"] = len(payload)
+
+    return results
+
+
+def compare(results, previous, threshold):
+    """Names of benchmarks whose median grew by more than threshold (a fraction)."""
+    slower = []
+    for name, current in results.items():
+        before = previous.get("results", {}).get(name)
+        if (not before):
+            continue
+        change = current["median"] / before["median"] - 1
+        flag = "  <-- slower" if change > threshold else ""
+        print(f"{name:<24} {before['median'] * 1000:10.1f} ms -> {current['median'] * 1000:10.1f} ms ({change:+.0%}){flag}")
+        if (change > threshold):
+            slower.append(name)
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark training and inference on synthetic data")
+    parser.add_argument("--rows", type=int, default=200_000, help="synthetic training rows")
+    parser.add_argument("--iterations", type=int, default=100, help="CatBoost iterations for the fit benchmark")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--description-rows", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=model.physical_cores())
+    parser.add_argument("--output", default=None, help="write results JSON here")
+    parser.add_argument("--compare", default=None, help="previous results JSON to diff against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown fraction that counts as a regression")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.rows, args.iterations, args.repeats, args.description_rows, args.threads)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "catboost": catboost.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "rows": args.rows,
+            "threads": args.threads,
+        },
+        "results": results,
+    }
+
+    if (args.output):
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if (args.compare):
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print(f"\nCompared with {args.compare} ({previous.get('meta', {}).get('commit')}):")
+        if (compare(results, previous, args.threshold)):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
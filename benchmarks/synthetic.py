@@ -0,0 +1,89 @@
+"""
+Deterministic synthetic data shaped like the model.py training schema, so
+benchmarks run offline and give the same data on every machine.
+"""
+
+import numpy as np
+import pandas as pd
+
+POSTCODE_AREAS = ["SW1A", "NW1", "SE25", "M1", "B2", "LS1", "G1", "EH1", "BS8", "L1", "CF10", "BT1", "NG8", "SS0"]
+RATINGS = ["A", "B", "C", "D", "E", "F", "G"]
+EFFICIENCY = ["Very Good", "Good", "Average", "Poor", "Very Poor"]
+
+# description texts in the style of the EPC register
+FLOOR_TEXTS = ["Solid, no insulation (assumed)", "Suspended, insulated (assumed)", "(another dwelling below)",
+               "To unheated space, limited insulation (assumed)", "Solid, insulated", "To external air, uninsulated"]
+WINDOWS_TEXTS = ["Fully double glazed", "Mostly double glazing", "Some secondary glazing", "Single glazed",
+                 "Full triple glazing", "Partial multiple glazing"]
+WALLS_TEXTS = ["Cavity wall, filled cavity", "Solid brick, as built, no insulation (assumed)",
+               "Timber frame, as built, insulated (assumed)", "Sandstone or limestone, with internal insulation",
+               "Granite or whinstone, as built, partial insulation", "System built, with external insulation", "Cob, as built"]
+ROOF_TEXTS = ["Pitched, 200 mm loft insulation", "Flat, limited insulation (assumed)", "(another premises above)",
+              "Roof room(s), no insulation (assumed)", "Pitched, 300+ mm loft insulation", "Thatched, with additional insulation"]
+MAINHEAT_TEXTS = ["Boiler and radiators, mains gas", "Electric storage heaters", "Air source heat pump, radiators, electric",
+                  "Room heaters, electric", "Boiler and radiators, oil", "Community scheme", "Boiler and radiators, LPG",
+                  "Warm air, mains gas", "Electric underfloor heating", "Boiler and radiators, coal"]
+
+
+def make_epc_descriptions(rows, seed=42):
+    """Raw description columns as translator.get_desc_values produces them."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "FLOOR_DESCRIPTION": rng.choice(FLOOR_TEXTS, rows),
+        "WINDOWS_DESCRIPTION": rng.choice(WINDOWS_TEXTS, rows),
+        "WALLS_DESCRIPTION": rng.choice(WALLS_TEXTS, rows),
+        "ROOF_DESCRIPTION": rng.choice(ROOF_TEXTS, rows),
+        "MAINHEAT_DESCRIPTION": rng.choice(MAINHEAT_TEXTS, rows),
+    }, dtype="string")
+
+
+def make_training_frame(rows, seed=42):
+    """Raw training frame: features + dateoftransfer + price, as in data/training_data.parquet."""
+    from translator import sort_descriptions, desc_columns
+
+    rng = np.random.default_rng(seed)
+
+    postcodes = [f"{area} {rng.integers(1, 10)}{chr(65 + rng.integers(0, 26))}{chr(65 + rng.integers(0, 26))}"
+                 for area in rng.choice(POSTCODE_AREAS, 2000)]
+    floor_area = rng.uniform(25, 300, rows).round(1)
+    rooms = rng.integers(1, 10, rows)
+    years = rng.integers(1995, 2026, rows)
+
+    df = pd.DataFrame({
+        "postcode": rng.choice(postcodes, rows),
+        "propertytype": rng.choice(["F", "D", "S", "T"], rows),
+        "TOTAL_FLOOR_AREA": floor_area,
+        "NUMBER_HABITABLE_ROOMS": rooms,
+        "CURRENT_ENERGY_RATING": rng.choice(RATINGS, rows),
+        "ENERGY_CONSUMPTION_CURRENT": rng.integers(50, 500, rows),
+        "CO2_EMISSIONS_CURRENT": rng.uniform(0.5, 15, rows).round(1),
+        "HEATING_COST_CURRENT": rng.integers(150, 3000, rows),
+        "HOT_WATER_COST_CURRENT": rng.integers(50, 600, rows),
+        "MAINHEAT_ENERGY_EFF": rng.choice(EFFICIENCY, rows),
+        "dateoftransfer": [f"{year}-{month:02d}-{day:02d}" for year, month, day in
+                           zip(years, rng.integers(1, 13, rows), rng.integers(1, 29, rows))],
+    })
+
+    descriptions = sort_descriptions(make_epc_descriptions(rows, seed))
+    for column in desc_columns:
+        df[column] = descriptions[column].to_numpy()
+
+    noise = rng.normal(1, 0.15, rows)
+    df["price"] = ((floor_area * 2500 + rooms * 10000) * (1 + (years - 1995) * 0.04) * noise).astype(int)
+    return df
+
+
+def make_historical_payload(properties, months, seed=42):
+    """Historical valuations response body (bytes) for one postcode, as the API returns it."""
+    import json
+
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2000-01-01", periods=months, freq="MS").strftime("%Y-%m-%d").tolist()
+    data = []
+    for i in range(properties):
+        prices = (200_000 * np.cumprod(rng.normal(1.003, 0.01, months))).astype(int).tolist()
+        data.append({
+            "property_address": f"{i + 1} High Street",
+            "valuations": [{"date": d, "valuation": p} for d, p in zip(dates, prices)],
+        })
+    return json.dumps({"data": data}).encode()
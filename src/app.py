@@ -1,6 +1,9 @@
 import streamlit as st
-from main import search_properties, get_uk_areas, is_full_postcode, sort_properties, validate_search_input, get_detected_area_from_properties, get_dynamic_uk_areas
+from main import search_properties, get_uk_areas, is_full_postcode, sort_properties, validate_search_input, get_detected_area_from_properties, get_dynamic_uk_areas, index_detected_area
+from main import get_postcode_districts, get_street_suggestions, get_district_hint, resolve_street
 from household_integration import render_household_details_view, initialise_household_session_state, has_selected_property
+from prefetch import Prefetcher
+from config import PREFETCH_TOP_N, PREFETCH_MAX_WORKERS, PREFETCH_POLL_SECONDS
 
 st.set_page_config(page_title="UK Property Search", layout="wide")
 
@@ -35,12 +38,24 @@ def render_sidebar_search():
             with st.expander("Search by Postcode District + Street"):
                 st.caption("To search by street, provide BOTH the postcode district AND street name.")
                 col_district, col_street = st.columns(2)
+                districts = get_postcode_districts()
                 with col_district:
-                    postcode_district = st.text_input(
-                        "Postcode District",
-                        placeholder="e.g. SW1A, NG8, SS0",
-                        help="The first part of a postcode (before the space)"
-                    )
+                    if districts:
+                        # type-ahead over the local postcode index
+                        postcode_district = st.selectbox(
+                            "Postcode District",
+                            districts,
+                            index=None,
+                            placeholder="e.g. SW1A, NG8, SS0",
+                            accept_new_options=True,
+                            help="The first part of a postcode (before the space)"
+                        ) or ""
+                    else:
+                        postcode_district = st.text_input(
+                            "Postcode District",
+                            placeholder="e.g. SW1A, NG8, SS0",
+                            help="The first part of a postcode (before the space)"
+                        )
                 with col_street:
                     street_name = st.text_input(
                         "Street Name",
@@ -49,6 +64,14 @@ def render_sidebar_search():
                     )
             
             submitted = st.form_submit_button("Search", use_container_width=True, type="primary")
+        
+        # districts/streets the local index knows, when the last search didn't match one
+        district_hint = st.session_state.get("district_hint")
+        if district_hint:
+            st.caption(district_hint)
+        suggestions = st.session_state.get("street_suggestions")
+        if suggestions:
+            st.caption("Did you mean: " + ", ".join(suggestions))
     
     return area, query, postcode_district, street_name, submitted
 
@@ -61,6 +84,12 @@ def initialise_session_state():
         st.session_state.last_search = {"area": None, "query": None}
     if "detected_area" not in st.session_state:
         st.session_state.detected_area = None
+    if "street_suggestions" not in st.session_state:
+        st.session_state.street_suggestions = []
+    if "district_hint" not in st.session_state:
+        st.session_state.district_hint = None
+    if "prefetcher" not in st.session_state:
+        st.session_state.prefetcher = Prefetcher(max_workers=PREFETCH_MAX_WORKERS)
 
     initialise_household_session_state()
 
@@ -73,26 +102,98 @@ def handle_search_submission(submitted, area, query, postcode_district, street_n
         if error_message:
             st.error(error_message)
         else:
-            with st.spinner("Searching properties..."): 
-                results = search_properties(
-                    area=area, 
-                    query=query,
-                    postcode_district=postcode_district.strip() if postcode_district else "",
-                    street=street_name.strip() if street_name else ""
-                )
-                st.session_state.results = results
-                
-                # detect area, then update dropdown to area name
-                detected = get_detected_area_from_properties(results)
-                if detected:
-                    st.session_state.detected_area = detected
-                    st.session_state.last_search = {"area": detected, "query": query or f"{postcode_district} {street_name}".strip()}
-                else:
-                    st.session_state.detected_area = None
-                    st.session_state.last_search = {"area": area, "query": query or f"{postcode_district} {street_name}".strip()}
-                
-                # Rerun to update the dropdown with the detected area
-                st.rerun()
+            # the previous results' prefetch is no longer useful
+            st.session_state.prefetcher.cancel()
+            st.session_state.street_suggestions = []
+            # unknown to the local index isn't invalid (it has no Scotland/NI) - hint, then search anyway
+            st.session_state.district_hint = get_district_hint(postcode_district)
+            if postcode_district and street_name and resolve_street(postcode_district, street_name) is None:
+                st.session_state.street_suggestions = get_street_suggestions(postcode_district, street_name)
+            
+            # draw cards as each area code's valuations arrive, not after the slowest one
+            status = st.empty()
+            placeholder = st.empty()
+            status.info("Searching properties...")
+            
+            results = []
+            for batch in search_properties(
+                area=area, 
+                query=query,
+                postcode_district=postcode_district.strip() if postcode_district else "",
+                street=street_name.strip() if street_name else "",
+                stream=True
+            ):
+                results.extend(batch)
+                status.info(f"Found {len(results)} properties so far...")
+                with placeholder.container():
+                    render_property_grid(results, show_buttons=False)
+            
+            status.empty()
+            st.session_state.results = results
+            
+            # warm the details page for the top cards while the user looks at them
+            st.session_state.prefetcher.start(sort_properties(results, "Default"), top_n=PREFETCH_TOP_N)
+            
+            # detect area, then update dropdown to area name
+            detected = get_detected_area_from_properties(results)
+            if detected:
+                st.session_state.detected_area = detected
+                # it joins the dropdown - index it so picking it there skips get_search
+                index_detected_area(detected)
+                st.session_state.last_search = {"area": detected, "query": query or f"{postcode_district} {street_name}".strip()}
+            else:
+                st.session_state.detected_area = None
+                st.session_state.last_search = {"area": area, "query": query or f"{postcode_district} {street_name}".strip()}
+            
+            # Rerun to update the dropdown with the detected area
+            st.rerun()
+
+
+def render_property_card(prop, prop_idx, show_button=True):
+    """Render one property card (the View Details button is left out while results are still streaming in)."""
+    with st.container(border=True):
+        # address
+        st.markdown(f"**{prop.get('address', 'Unknown')}**")
+        
+        # postcode
+        postcode = prop.get("postcode", "")
+        if postcode:
+            st.caption(postcode)
+        
+        # prices
+        price_col1, price_col2 = st.columns(2)
+        with price_col1:
+            st.caption("Current")
+            current_price = prop.get("current_price")
+            if current_price:
+                st.markdown(f"**£{current_price:,.0f}**")
+            else:
+                st.markdown("**N/A**")
+        
+        with price_col2:
+            st.caption("Future")
+            future_price = prop.get("future_price")
+            if future_price:
+                st.markdown(f"**£{future_price:,.0f}**")
+            else:
+                st.markdown("**—**")
+        
+        # view deets
+        if show_button and st.button("View Details", key=f"view_{prop_idx}", use_container_width=True):
+            st.session_state.selected_property = prop
+            st.rerun()
+
+
+def render_property_grid(properties, show_buttons=True):
+    """Display properties in a 3-column grid."""
+    columns_per_row = 3
+    for row_start in range(0, len(properties), columns_per_row):
+        cols = st.columns(columns_per_row)
+        for col_idx, col in enumerate(cols):
+            prop_idx = row_start + col_idx
+            if prop_idx < len(properties):
+                with col:
+                    render_property_card(properties[prop_idx], prop_idx, show_button=show_buttons)
 
 
 def render_properties_view(last):
@@ -126,51 +227,24 @@ def render_properties_view(last):
             label_visibility="collapsed"
         )
 
-    sorted_results = sort_properties(results, sort_option)
-    
-    # Display properties in 3-column grid
-    columns_per_row = 3
-    for row_start in range(0, len(sorted_results), columns_per_row):
-        cols = st.columns(columns_per_row)
-        for col_idx, col in enumerate(cols):
-            prop_idx = row_start + col_idx
-            if prop_idx < len(sorted_results):
-                prop = sorted_results[prop_idx]
-                
-                with col:
-                    with st.container(border=True):
-                        # address
-                        st.markdown(f"**{prop.get('address', 'Unknown')}**")
-                        
-                        # postcode
-                        postcode = prop.get("postcode", "")
-                        if postcode:
-                            st.caption(postcode)
-                        
-                        # prices
-                        price_col1, price_col2 = st.columns(2)
-                        with price_col1:
-                            st.caption("Current")
-                            current_price = prop.get("current_price")
-                            if current_price:
-                                st.markdown(f"**£{current_price:,.0f}**")
-                            else:
-                                st.markdown("**N/A**")
-                        
-                        with price_col2:
-                            st.caption("Future")
-                            future_price = prop.get("future_price")
-                            if future_price:
-                                st.markdown(f"**£{future_price:,.0f}**")
-                            else:
-                                st.markdown("**—**")
-                        
-                        # view deets
-                        if st.button("View Details", key=f"view_{prop_idx}", use_container_width=True):
-                            st.session_state.selected_property = prop
-                            st.rerun()
+    # while prefetches run, the grid re-runs on its own to show their future prices
+    polling = st.session_state.prefetcher.pending() > 0
+    st.session_state.polling_prefetch = polling
+    st.fragment(render_results_grid, run_every=PREFETCH_POLL_SECONDS if polling else None)(results, sort_option)
 
 
+def render_results_grid(results, sort_option):
+    """Sorted card grid, with the future prices finished prefetches computed written onto the cards."""
+    prefetcher = st.session_state.prefetcher
+    prefetcher.apply_results()
+    
+    render_property_grid(sort_properties(results, sort_option))
+    
+    if st.session_state.get("polling_prefetch") and not prefetcher.pending():
+        # everything is in - one full rerun stops the polling
+        st.session_state.polling_prefetch = False
+        st.rerun()
+
 if __name__ == "__main__":
     initialise_session_state()
     
@@ -0,0 +1,166 @@
+"""
+Local index of area name -> parsed search result (area codes, boroughs, wards).
+
+The ~200 names in config.UK_AREAS resolve to practically static area code
+lists, so they are resolved once (build step below) and kept in SQLite;
+areas detected from search results are added as they come (free-text
+queries are not - see main.resolve_search). Lookups are served from
+memory; entries older than max_age are still returned, and refreshed from
+the API on a background thread.
+
+    python src/area_index.py            # resolve UK_AREAS + every name already indexed
+    python src/area_index.py --missing  # only names not indexed yet
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def normalise_name(name):
+    return " ".join(name.split()).lower()
+
+
+class AreaIndex:
+    def __init__(self, path=None, max_age=30 * 24 * 3600, resolve=None):
+        """
+        INPUTS:
+        path: str | None (SQLite file, None for memory only)
+        max_age: float (seconds before an entry is refreshed in the background)
+        resolve: callable (name -> parsed search result | None), used for refreshes
+        """
+        self.max_age = max_age
+        self.resolve = resolve
+
+        self._entries = {} # normalised name -> (updated_at, parsed)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._refresher = None # created on the first background refresh
+        self._counters = {"hits": 0, "misses": 0, "stale": 0, "refreshes": 0}
+
+        if (path is not None):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS areas ("
+            "name TEXT PRIMARY KEY, display TEXT NOT NULL, updated_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+        for name, updated_at, payload in self._db.execute("SELECT name, updated_at, payload FROM areas"):
+            self._entries[name] = (updated_at, json.loads(payload))
+
+    def __contains__(self, name):
+        with self._lock:
+            return normalise_name(name) in self._entries
+
+    def get(self, name):
+        """
+        OUTPUTS:
+        parsed search result (dict with area_codes, boroughs, wards, ...) | None if not indexed
+        Stale entries are returned as-is and queued for a background refresh.
+        """
+        key = normalise_name(name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if (entry is None):
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            updated_at, parsed = entry
+            stale = time.time() - updated_at > self.max_age
+            if (stale):
+                self._counters["stale"] += 1
+
+        if (stale):
+            self.refresh_in_background(name)
+        return parsed
+
+    def put(self, name, parsed):
+        """Store (or replace) the parsed search result for name."""
+        key = normalise_name(name)
+        updated_at = time.time()
+        with self._lock:
+            self._entries[key] = (updated_at, parsed)
+            self._db.execute(
+                "INSERT OR REPLACE INTO areas (name, display, updated_at, payload) VALUES (?, ?, ?, ?)",
+                (key, name.strip(), updated_at, json.dumps(parsed))
+            )
+            self._db.commit()
+
+    def names(self):
+        """Display names of every indexed area."""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT display FROM areas ORDER BY name")]
+
+    def refresh(self, name):
+        """Re-resolve name now -> parsed result (None and left unchanged if the lookup failed)."""
+        parsed = self.resolve(name) if (self.resolve is not None) else None
+        if (parsed and parsed.get("area_codes")):
+            self.put(name, parsed)
+            with self._lock:
+                self._counters["refreshes"] += 1
+            return parsed
+        return None
+
+    def refresh_in_background(self, name):
+        """Queue a refresh of name unless one is already pending."""
+        key = normalise_name(name)
+        with self._lock:
+            if (self.resolve is None or key in self._refreshing):
+                return
+            self._refreshing.add(key)
+            if (self._refresher is None):
+                self._refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="area-index")
+
+        def run():
+            try:
+                self.refresh(name)
+            except Exception as e:
+                print(f"Area index refresh failed for {name}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresher.submit(run)
+
+    def build(self, names, skip_existing=False):
+        """
+        Resolve every name (synchronously) into the index.
+
+        OUTPUTS:
+        list of names that could not be resolved
+        """
+        failed = []
+        for name in names:
+            if (skip_existing and normalise_name(name) in self._entries):
+                continue
+            if (self.refresh(name) is None):
+                failed.append(name)
+        return failed
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries), "refreshing": len(self._refreshing)}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the local area name -> area code index")
+    parser.add_argument("--missing", action="store_true", help="only resolve names not indexed yet")
+    args = parser.parse_args()
+
+    from config import UK_AREAS
+    from main import get_area_index
+
+    # UK_AREAS plus detected areas earlier searches added
+    area_index = get_area_index()
+    names = list(dict.fromkeys(UK_AREAS + area_index.names()))
+    failed = area_index.build(names, skip_existing=args.missing)
+    print(f"Indexed {len(names) - len(failed)} of {len(names)} areas")
+    if (failed):
+        print("Could not resolve:", ", ".join(failed))
@@ -1,14 +1,25 @@
-from api import API
+import os
+
+# important token - api.py (not committed), or SCANSAN_API_KEY where there is no api.py (CI, mock server)
+try:
+    from api import API
+except ImportError:
+    API = os.environ.get("SCANSAN_API_KEY", "")
 
-# important token
 AUTH_TOKEN = API_KEY = API
 
-# scansan API
-SEARCH_URL = "https://api.scansan.com/v1/area_codes/search"
-SUMMARY_URL = """https://api.scansan.com/v1/area_codes/{area_code}/summary"""
-SALE_HISTORY_URL = """https://api.scansan.com/v1/postcode/{area_code}/sale/history"""
-CURRENT_VALUATIONS_URL = """https://api.scansan.com/v1/postcode/{area_code}/valuations/current"""
-HISTORICAL_VALUATIONS_URL = """https://api.scansan.com/v1/postcode/{area_code}/valuations/historical"""
+# scansan API - set SCANSAN_BASE_URL to point everything at another server,
+# e.g. the mock in mock_scansan_server.py: SCANSAN_BASE_URL=http://127.0.0.1:8765/v1
+SCANSAN_DEFAULT_BASE_URL = "https://api.scansan.com/v1"
+SCANSAN_BASE_URL = os.environ.get("SCANSAN_BASE_URL", SCANSAN_DEFAULT_BASE_URL).rstrip("/")
+
+SEARCH_URL = SCANSAN_BASE_URL + "/area_codes/search"
+SUMMARY_URL = SCANSAN_BASE_URL + "/area_codes/{area_code}/summary"
+SALE_HISTORY_URL = SCANSAN_BASE_URL + "/postcode/{area_code}/sale/history"
+CURRENT_VALUATIONS_URL = SCANSAN_BASE_URL + "/postcode/{area_code}/valuations/current"
+HISTORICAL_VALUATIONS_URL = SCANSAN_BASE_URL + "/postcode/{area_code}/valuations/historical"
+SALE_LISTINGS_URL = SCANSAN_BASE_URL + "/area_codes/{area_code}/sale/listings"
+ENERGY_PERFORMANCE_URL = SCANSAN_BASE_URL + "/postcode/{area_code}/energy/performance"
 
 # header
 HEADERS = {
@@ -16,6 +27,71 @@ HEADERS = {
 "Content-Type": "application/json" # indicates request is JSON
 }
 
+# HTTP session - shared by scansan_client and translator
+HTTP_POOL_SIZE = 10 # keep-alive connections per host (>= VALUATION_MAX_WORKERS)
+HTTP_TIMEOUT = 10 # seconds per request
+HTTP_RETRIES = 3 # retries on 429/5xx and dropped connections
+HTTP_BACKOFF = 0.5 # exponential backoff factor between retries (seconds)
+HTTP_BACKOFF_MAX = 30 # longest single wait, even if Retry-After asks for more
+HTTP_RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+# client-side rate limits - (requests per second, burst) per endpoint, shared by
+# every thread in the process; keep these just under the Scansan plan quota
+RATE_LIMITS = {
+    SEARCH_URL: (2, 4),
+    SUMMARY_URL: (5, 10),
+    SALE_HISTORY_URL: (5, 10),
+    CURRENT_VALUATIONS_URL: (5, 10),
+    HISTORICAL_VALUATIONS_URL: (5, 10),
+    SALE_LISTINGS_URL: (5, 10),
+    ENERGY_PERFORMANCE_URL: (5, 10)
+}
+RATE_LIMIT_DEFAULT = (5, 10) # any other URL
+# SCANSAN_RATE_LIMIT_SCALE multiplies every rate and burst above (e.g. 4 on a
+# bigger plan); 0 turns client-side limiting off - the load test does, against the mock
+RATE_LIMIT_SCALE = float(os.environ.get("SCANSAN_RATE_LIMIT_SCALE", "1"))
+
+# response cache - TTL (seconds) per endpoint, LRU by size in memory
+CACHE_TTLS = {
+    SEARCH_URL: 24 * 3600, # area codes for a name barely change
+    SUMMARY_URL: 6 * 3600,
+    SALE_HISTORY_URL: 24 * 3600,
+    CURRENT_VALUATIONS_URL: 6 * 3600,
+    HISTORICAL_VALUATIONS_URL: 24 * 3600,
+    SALE_LISTINGS_URL: 6 * 3600,
+    ENERGY_PERFORMANCE_URL: 24 * 3600
+}
+CACHE_MAX_BYTES = 64 * 1024 * 1024 # in-memory budget
+CACHE_DB_PATH = None # SQLite file to persist the cache across restarts, e.g. "scansan_cache.sqlite"
+CACHE_DB_MAX_ROWS = 100_000 # rows kept in that file (least recently used go first)
+HISTORICAL_POSTCODE_CACHE_SIZE = 256 # postcodes whose parsed historical valuations are kept for the details page
+POSTCODE_INDEX_CACHE_SIZE = 256 # postcodes whose translator address indexes are kept
+
+# area name -> area codes/boroughs/wards index, so dropdown searches skip get_search
+# (memory only when pointed at another server, so mock data never lands in the real index)
+AREA_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "area_index.sqlite") \
+    if SCANSAN_BASE_URL == SCANSAN_DEFAULT_BASE_URL else None
+AREA_INDEX_MAX_AGE = 30 * 24 * 3600 # seconds before an entry is refreshed in the background
+
+# price model - file in models/ used to fill future_price
+MODEL_NAME = "prototype_3.cbm"
+FORECAST_YEARS = 1 # future_price is the predicted price this many years ahead
+ENSEMBLE_MODELS = ["prototype_1.cbm", "prototype_2.cbm", "prototype_3.cbm"] # averaged for the details page forecast
+FORECAST_HORIZON_YEARS = 5 # length of the details page forecast line
+PREDICT_THREAD_COUNT = -1 # CatBoost predict threads (-1 = all cores)
+
+# details page chart - longer series are LTTB-downsampled to this many points
+CHART_MAX_POINTS = 500
+
+# concurrency - valuations for a search's area codes are fetched in parallel
+VALUATION_MAX_WORKERS = 6 # max concurrent valuation calls per search
+SEARCH_DEADLINE_SECONDS = 15 # overall budget for a search's valuation fan-out
+
+# details-page prefetch - started when results render, cancelled by the next search
+PREFETCH_TOP_N = 6 # cards whose details are warmed
+PREFETCH_MAX_WORKERS = 2 # concurrent prefetches per session
+PREFETCH_POLL_SECONDS = 1 # how often the results grid picks up prefetched future prices
+
 # UK areas
 UK_AREAS = [
     "Aberdeen",
@@ -0,0 +1,89 @@
+"""
+Shared fixtures - a fake requests response, and a fake ScanSan API serving
+one postcode's (SW1A) three documents through the shared fetch path.
+"""
+
+import json
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+
+class FakeResponse:
+    """Just the parts of requests.Response the clients read"""
+
+    def __init__(self, payload=None, status_code=200, headers=None):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.url = ""
+        self.content = json.dumps(payload).encode()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.exceptions.HTTPError(f"{self.status_code} error")
+
+    def json(self):
+        return self.payload
+
+    def close(self):
+        pass
+
+
+EPC_RECORD = {
+    "street_address": "10 Downing Street",
+    "EPC": {"current_rating": "D"},
+    "energy_consumption": {"current_annual_energy_consumption": 210},
+    "annual_CO2_emissions": {"current_emissions": 2.1},
+    "annual_energy_costs": {"current_annual_heating_cost": 403, "current_annual_hot_water_cost": 64},
+    "property_efficiency": {
+        "property_main_heating_energy_efficiency": "Good",
+        "floor_description": "Solid, no insulation (assumed)",
+        "property_windows_description": "Fully double glazed",
+        "property_walls_description": "Cavity wall, filled cavity",
+        "roof_description": "Pitched, 200 mm loft insulation",
+        "property_main_heating_description": "Boiler and radiators, mains gas"
+    }
+}
+
+POSTCODE_PAYLOADS = {
+    "sale/history": {"data": [{"street_address": "10 Downing Street", "property_type": "Terraced"}]},
+    "sale/listings": {"data": {"sale_listings": [
+        {"street_address": "10 Downing Street", "bedrooms": 3, "living_rooms": 2, "property_size": 120}
+    ]}},
+    "energy/performance": {"data": [EPC_RECORD]}
+}
+
+
+@pytest.fixture
+def fake_response():
+    """The FakeResponse class - build one per status/payload a test needs"""
+    return FakeResponse
+
+
+@pytest.fixture
+def postcode_api(monkeypatch):
+    """
+    Route scansan_client's http_get to the fake postcode documents, with an
+    empty response cache.
+
+    OUTPUTS:
+    list of requested urls (appended to as calls are made)
+    """
+    import scansan_client
+
+    calls = []
+
+    def http_get(url, params=None, headers=None, **kwargs):
+        calls.append(url)
+        for route, payload in POSTCODE_PAYLOADS.items():
+            if url.endswith(route):
+                return FakeResponse(payload)
+        raise AssertionError(f"unexpected url {url}")
+
+    monkeypatch.setattr(scansan_client, "http_get", http_get)
+    monkeypatch.setattr(scansan_client, "response_cache", scansan_client.ResponseCache(max_bytes=1_000_000))
+    return calls
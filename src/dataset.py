@@ -0,0 +1,202 @@
+"""
+Streaming loader for the cleaned property data parquet shards.
+
+The shards are read through pyarrow in row-group sized record batches, so
+memory stays bounded by batch_size no matter how much data there is.
+Columns are projected and filters pushed down to the parquet reader.
+"""
+
+import glob
+import os
+import re
+from datetime import date
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from feature_schema import CATEGORICAL_FEATURES, NUMERIC_DTYPES
+
+# paths are relative to the repo root, like model.py's
+SHARD_DIR = "./data/clean/cleaned_property_data"
+SHARD_PATTERN = "cleaned_property_data_part_*.parquet"
+TRAINING_DATA_PATH = "./data/training_data.parquet"
+
+DEFAULT_BATCH_SIZE = 100_000
+
+
+def list_shards(shard_dir=SHARD_DIR):
+    """
+    OUTPUTS:
+    list of shard paths, ordered by part number (part_2 before part_10)
+    """
+    paths = glob.glob(os.path.join(shard_dir, SHARD_PATTERN))
+
+    def part_number(path):
+        match = re.search(r"_part_(\d+)\.parquet$", path)
+        return int(match.group(1)) if match else -1
+
+    return sorted(paths, key=part_number)
+
+
+def open_dataset(paths=None):
+    """
+    INPUTS:
+    paths: shard path(s) or None for every shard in SHARD_DIR
+
+    OUTPUTS:
+    pyarrow.dataset.Dataset (nothing is read yet)
+    """
+    if (paths is None):
+        paths = list_shards()
+    elif (isinstance(paths, str)):
+        paths = [paths]
+
+    return ds.dataset(list(paths), format="parquet")
+
+
+def build_filter(schema, postcode_prefixes=None, years=None, date_column="dateoftransfer"):
+    """
+    INPUTS:
+    schema: pyarrow.Schema of the dataset
+    postcode_prefixes: list of str (e.g. ["SW1A", "NW1 "]) - keep rows whose postcode starts with any
+    years: (first, last) inclusive - keep rows whose date_column falls in those years
+
+    OUTPUTS:
+    pyarrow.dataset.Expression | None
+    """
+    expression = None
+
+    if (postcode_prefixes):
+        postcode = ds.field("postcode")
+        prefix_expression = None
+        for prefix in postcode_prefixes:
+            match = pc.starts_with(postcode, prefix.upper())
+            prefix_expression = match if prefix_expression is None else (prefix_expression | match)
+        expression = prefix_expression
+
+    if (years is not None):
+        first, last = years
+        date_field = ds.field(date_column)
+
+        # dates may be stored as ISO strings or as a temporal type
+        if (pa.types.is_string(schema.field(date_column).type) or pa.types.is_large_string(schema.field(date_column).type)):
+            lower, upper = f"{first:04d}-01-01", f"{last + 1:04d}-01-01"
+        else:
+            lower, upper = date(first, 1, 1), date(last + 1, 1, 1)
+
+        year_expression = (date_field >= lower) & (date_field < upper)
+        expression = year_expression if expression is None else (expression & year_expression)
+
+    return expression
+
+
+def compact_table(table):
+    """
+    Cast a pyarrow Table/RecordBatch to the compact schema: CATEGORICAL_FEATURES
+    dictionary encoded, NUMERIC_DTYPES downcast. Other columns are untouched.
+    """
+    arrays = []
+    for name, column in zip(table.schema.names, table.columns):
+        if (name in CATEGORICAL_FEATURES and not pa.types.is_dictionary(column.type)):
+            column = pc.dictionary_encode(column.cast(pa.string()))
+        elif (name in NUMERIC_DTYPES):
+            column = column.cast(pa.from_numpy_dtype(NUMERIC_DTYPES[name]))
+        arrays.append(column)
+
+    if (isinstance(table, pa.RecordBatch)):
+        return pa.RecordBatch.from_arrays(arrays, names=table.schema.names)
+    return pa.Table.from_arrays(arrays, names=table.schema.names)
+
+
+def read_compact(path=TRAINING_DATA_PATH, columns=None):
+    """
+    Read a parquet file straight into the compact dtypes (no object-string
+    intermediate): categoricals arrive as pandas "category", numerics as 32 bit.
+    """
+    table = pq.read_table(path, columns=columns)
+    return compact_table(table).to_pandas()
+
+
+def rewrite_compact(source_path, target_path, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Rewrite a parquet file with the compact schema, one batch at a time, so
+    later reads come back compact without any casting.
+    """
+    parquet_file = pq.ParquetFile(source_path)
+    writer = None
+    try:
+        for batch in parquet_file.iter_batches(batch_size=batch_size):
+            batch = compact_table(batch)
+            if (writer is None):
+                writer = pq.ParquetWriter(target_path, batch.schema)
+            writer.write_batch(batch)
+    finally:
+        if (writer is not None):
+            writer.close()
+
+
+def iter_batches(paths=None, columns=None, postcode_prefixes=None, years=None, batch_size=DEFAULT_BATCH_SIZE, compact=False):
+    """
+    Stream the shards as pandas DataFrames of at most batch_size rows.
+
+    INPUTS:
+    paths: shard path(s) or None for every shard
+    columns: list of str to read (None for all)
+    postcode_prefixes: see build_filter
+    years: see build_filter
+    batch_size: int (max rows per yielded frame)
+    compact: bool (cast each batch with compact_table)
+
+    OUTPUTS:
+    generator of pandas DataFrames
+    """
+    dataset = open_dataset(paths)
+    expression = build_filter(dataset.schema, postcode_prefixes=postcode_prefixes, years=years)
+
+    for batch in dataset.to_batches(columns=columns, filter=expression, batch_size=batch_size):
+        if (batch.num_rows):
+            yield (compact_table(batch) if compact else batch).to_pandas()
+
+
+def concat_batches(frames):
+    """
+    Concatenate iter_batches(compact=True) frames into one. Each batch is
+    dictionary encoded on its own, so categorical columns are first given the
+    union of every batch's categories - pd.concat would otherwise fall back
+    to object strings for them.
+    """
+    frames = list(frames)
+    if (not frames):
+        return pd.DataFrame()
+
+    for name in frames[0].columns:
+        if (not isinstance(frames[0][name].dtype, pd.CategoricalDtype)):
+            continue
+        categories = union_categoricals([frame[name] for frame in frames]).categories
+        for frame in frames:
+            frame[name] = frame[name].cat.set_categories(categories)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def count_rows(paths=None, postcode_prefixes=None, years=None):
+    """Row count after filtering, read from the parquet metadata when unfiltered."""
+    dataset = open_dataset(paths)
+    expression = build_filter(dataset.schema, postcode_prefixes=postcode_prefixes, years=years)
+    return dataset.count_rows(filter=expression)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rewrite a parquet file with the compact dtype schema")
+    parser.add_argument("source", nargs="?", default=TRAINING_DATA_PATH)
+    parser.add_argument("target", nargs="?", default="./data/training_data_compact.parquet")
+    args = parser.parse_args()
+
+    rewrite_compact(args.source, args.target)
+    print(f"Wrote {args.target}")
@@ -0,0 +1,82 @@
+"""
+Column schema shared by training (model.py) and inference (translator.py).
+"""
+
+TARGET_COLUMN = "price"
+
+# stands in for missing categoricals - CatBoost rejects NaN in categorical columns
+MISSING_CATEGORY = "None"
+
+CATEGORICAL_FEATURES = [
+    'postcode',
+    'propertytype',
+    'CURRENT_ENERGY_RATING',
+    "FLOOR_TYPE",
+    "FLOOR_INSULATED",
+    "WINDOWS_TYPE",
+    "WINDOWS_DEGREE",
+    "WALLS_TYPE",
+    "WALLS_CAVITY",
+    "WALLS_INSULATED",
+    "ROOF_TYPE",
+    "ROOF_INSULATED",
+    "MAINHEAT_TYPE",
+    'MAINHEAT_ENERGY_EFF'
+]
+
+NUMERIC_FEATURES = [
+    "TOTAL_FLOOR_AREA",
+    "NUMBER_HABITABLE_ROOMS",
+    "ENERGY_CONSUMPTION_CURRENT",
+    "CO2_EMISSIONS_CURRENT",
+    "HEATING_COST_CURRENT",
+    "HOT_WATER_COST_CURRENT",
+    "year",
+    "month",
+    "quarter"
+]
+
+# derived from the transfer date in training, from the valuation date at inference
+DATE_FEATURES = ["year", "month", "quarter"]
+
+# model input columns, in the order translator builds them
+FEATURE_COLUMNS = [
+    "postcode",
+    "propertytype",
+    "TOTAL_FLOOR_AREA",
+    "NUMBER_HABITABLE_ROOMS",
+    "CURRENT_ENERGY_RATING",
+    "ENERGY_CONSUMPTION_CURRENT",
+    "CO2_EMISSIONS_CURRENT",
+    "HEATING_COST_CURRENT",
+    "HOT_WATER_COST_CURRENT",
+    "MAINHEAT_ENERGY_EFF",
+    "FLOOR_TYPE",
+    "FLOOR_INSULATED",
+    "WINDOWS_TYPE",
+    "WINDOWS_DEGREE",
+    "WALLS_TYPE",
+    "WALLS_CAVITY",
+    "WALLS_INSULATED",
+    "ROOF_TYPE",
+    "ROOF_INSULATED",
+    "MAINHEAT_TYPE",
+    "year",
+    "month",
+    "quarter"
+]
+
+# compact storage types - categoricals are dictionary encoded (pandas "category"),
+# numerics downcast to 32 bits
+NUMERIC_DTYPES = {
+    "price": "int32",
+    "TOTAL_FLOOR_AREA": "float32",
+    "NUMBER_HABITABLE_ROOMS": "float32",
+    "ENERGY_CONSUMPTION_CURRENT": "float32",
+    "CO2_EMISSIONS_CURRENT": "float32",
+    "HEATING_COST_CURRENT": "float32",
+    "HOT_WATER_COST_CURRENT": "float32",
+    "year": "int16",
+    "month": "int8",
+    "quarter": "int8"
+}
@@ -0,0 +1,127 @@
+"""
+Built Plotly figures for the details page, plus LTTB downsampling.
+
+Figures are cached as go.Figure objects keyed by (postcode, address, data
+version), so a Streamlit rerun (any button click) reuses the figure instead
+of rebuilding every trace - and st.plotly_chart takes a Figure without
+re-validating it, unlike a dict. Long series are downsampled with
+Largest-Triangle-Three-Buckets before plotting, which keeps the visual shape
+(peaks and dips) with a few hundred points instead of shipping thousands to
+the browser.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    INPUTS:
+    x, y: 1-d numeric arrays, x ascending
+    threshold: int (points to keep, >= 3)
+
+    OUTPUTS:
+    numpy array of the kept indices (first and last always kept)
+    """
+    n = len(x)
+    if (threshold >= n or threshold < 3):
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # the points between first and last go into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+
+    a = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+
+        # average of the next bucket (or the last point) is the third vertex
+        next_start, next_end = end, (edges[bucket + 2] if bucket + 2 < len(edges) else n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # twice the triangle area for every candidate in this bucket
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        kept[bucket + 1] = a
+
+    return kept
+
+
+def downsample_frame(df, max_points, x_column="date", y_column="price"):
+    """df reduced to at most max_points rows with LTTB on (x_column, y_column)."""
+    if (df is None or len(df) <= max_points):
+        return df
+    x = df[x_column]
+    if (pd.api.types.is_datetime64_any_dtype(x)):
+        x = x.astype("int64")
+    return df.iloc[lttb(x.to_numpy(), df[y_column].to_numpy(), max_points)]
+
+
+def data_version(*frames):
+    """
+    Short content hash of some DataFrames - changes whenever their data does.
+    Hashes every row, so prefer a version stamp from the data's own cache
+    when there is one.
+    """
+    digest = hashlib.sha1()
+    for df in frames:
+        if (df is None or df.empty):
+            digest.update(b"-")
+        else:
+            digest.update(",".join(map(str, df.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+class FigureCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # key -> go.Figure
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0}
+
+    def get_or_build(self, key, build):
+        """
+        INPUTS:
+        key: hashable, e.g. ("price", postcode, address, data_version(...))
+        build: callable -> plotly Figure, only called on a miss
+
+        OUTPUTS:
+        go.Figure - shared by every caller, so don't modify it
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if (cached is not None):
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return cached
+            self._counters["misses"] += 1
+
+        figure = build()
+
+        with self._lock:
+            self._entries[key] = figure
+            self._entries.move_to_end(key)
+            while (len(self._entries) > self.max_entries):
+                self._entries.popitem(last=False)
+        return figure
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries)}
+
+
+# shared by every session in the process
+figure_cache = FigureCache()
@@ -21,6 +21,38 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 from scansan_client import get_historical_valuation_frame
+from figure_cache import figure_cache, data_version, downsample_frame
+from config import CHART_MAX_POINTS
+
+
+def build_sustainability_gauge(sustainability_score, color):
+    """Plotly gauge chart for a sustainability score (0-100)."""
+    # This shows the score on a semi-circular gauge with color coding
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number",
+        value = sustainability_score,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': "Score"},
+        gauge = {
+            'axis': {'range': [None, 100]},
+            'bar': {'color': color},
+            'steps': [
+                {'range': [0, 40], 'color': "lightgray"},
+                {'range': [40, 60], 'color': "lightyellow"},
+                {'range': [60, 80], 'color': "lightgreen"},
+                {'range': [80, 100], 'color': "green"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+    
+    # Adjust figure size for streamlit
+    fig.update_layout(height=250, margin=dict(l=20, r=20, t=40, b=20))
+    return fig
 
 
 def display_sustainability_score(sustainability_score):
@@ -58,31 +90,11 @@ def display_sustainability_score(sustainability_score):
     
     with col1:
         # Create a Plotly gauge chart for visual representation
-        # This shows the score on a semi-circular gauge with color coding
-        fig = go.Figure(go.Indicator(
-            mode = "gauge+number",
-            value = sustainability_score,
-            domain = {'x': [0, 1], 'y': [0, 1]},
-            title = {'text': "Score"},
-            gauge = {
-                'axis': {'range': [None, 100]},
-                'bar': {'color': color},
-                'steps': [
-                    {'range': [0, 40], 'color': "lightgray"},
-                    {'range': [40, 60], 'color': "lightyellow"},
-                    {'range': [60, 80], 'color': "lightgreen"},
-                    {'range': [80, 100], 'color': "green"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 90
-                }
-            }
-        ))
-        
-        # Adjust figure size for streamlit
-        fig.update_layout(height=250, margin=dict(l=20, r=20, t=40, b=20))
+        # (the gauge only depends on the score, so it is built once per score)
+        fig = figure_cache.get_or_build(
+            ("gauge", sustainability_score, color),
+            lambda: build_sustainability_gauge(sustainability_score, color)
+        )
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
@@ -102,39 +114,30 @@ def display_sustainability_score(sustainability_score):
 
 
 
-def display_price_history_forecast_and_market(
+def prep(df: pd.DataFrame) -> pd.DataFrame:
+    """Dates as datetime64 and in order - copies only when something has to change."""
+    if df.empty:
+        return df
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df = df.assign(date=pd.to_datetime(df["date"]))
+    if not df["date"].is_monotonic_increasing:
+        df = df.sort_values("date")
+    return df
+
+
+def build_price_figure(
     historical_data: pd.DataFrame,
     forecast_data: pd.DataFrame,
     market_data: pd.DataFrame,
-):
+    max_points: int = CHART_MAX_POINTS,
+) -> go.Figure:
     """
-    Plot:
-      - historical prices (solid)
-      - forecast prices (dashed)
-      - local market prices (solid, different style)
-    All DataFrames expect columns: ['date', 'price'].
+    Figure for display_price_history_forecast_and_market. Historical and
+    market series longer than max_points are LTTB-downsampled.
     """
-
-    if historical_data is None or forecast_data is None or market_data is None:
-        st.warning("No data provided.")
-        return
-
-    if historical_data.empty and forecast_data.empty and market_data.empty:
-        st.warning("No data to plot.")
-        return
-
-    # Copy + clean/sort
-    def prep(df: pd.DataFrame) -> pd.DataFrame:
-        if df.empty:
-            return df
-        out = df.copy()
-        out["date"] = pd.to_datetime(out["date"])
-        out = out.sort_values("date")
-        return out
-
-    historical = prep(historical_data)
+    historical = downsample_frame(prep(historical_data), max_points)
     forecast   = prep(forecast_data)
-    market     = prep(market_data)
+    market     = downsample_frame(prep(market_data), max_points)
 
     fig = go.Figure()
 
@@ -147,6 +150,26 @@ def display_price_history_forecast_and_market(
             name="This property (historical)",
         ))
 
+    # Forecast uncertainty band (model spread), drawn under the line
+    if not forecast.empty and {"low", "high"}.issubset(forecast.columns):
+        fig.add_trace(go.Scatter(
+            x=forecast["date"],
+            y=forecast["high"],
+            mode="lines",
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo="skip",
+        ))
+        fig.add_trace(go.Scatter(
+            x=forecast["date"],
+            y=forecast["low"],
+            mode="lines",
+            line=dict(width=0),
+            fill="tonexty",
+            fillcolor="rgba(99, 110, 250, 0.2)",
+            name="Forecast range",
+        ))
+
     # Forecast (dashed)
     if not forecast.empty:
         fig.add_trace(go.Scatter(
@@ -172,6 +195,43 @@ def display_price_history_forecast_and_market(
         yaxis_title="Price",
         hovermode="x unified",
     )
+    return fig
+
+
+def display_price_history_forecast_and_market(
+    historical_data: pd.DataFrame,
+    forecast_data: pd.DataFrame,
+    market_data: pd.DataFrame,
+    postcode: str = "",
+    address: str = "",
+    version=None,
+):
+    """
+    Plot:
+      - historical prices (solid)
+      - forecast prices (dashed), with a shaded band if forecast_data has 'low'/'high'
+      - local market prices (solid, different style)
+    All DataFrames expect columns: ['date', 'price'].
+
+    The figure is cached by (postcode, address, version), so reruns with
+    unchanged data skip building it. version must change whenever any of the
+    frames does (get_details_data stamps one); without it the frames are hashed.
+    """
+
+    if historical_data is None or forecast_data is None or market_data is None:
+        st.warning("No data provided.")
+        return
+
+    if historical_data.empty and forecast_data.empty and market_data.empty:
+        st.warning("No data to plot.")
+        return
+
+    if version is None:
+        version = data_version(historical_data, forecast_data, market_data)
+    fig = figure_cache.get_or_build(
+        ("price", postcode, address, version),
+        lambda: build_price_figure(historical_data, forecast_data, market_data)
+    )
 
     st.plotly_chart(fig, use_container_width=True)
 
@@ -4,11 +4,17 @@ Household Integration Module - Connects property details view with charts and AP
 
 import streamlit as st
 import pandas as pd
+import itertools
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from config import PREFETCH_POLL_SECONDS
+
+# version stamps for get_details_data results - shared figure cache keys stay unique across sessions
+_details_versions = itertools.count()
+
 
 def display_sustainability_from_score(sustainability_score):
     """Display sustainability score using household_info_page."""
@@ -21,17 +27,100 @@ def display_sustainability_from_score(sustainability_score):
         st.error(f"Error displaying sustainability: {str(e)}")
 
 
-def display_price_forecast_from_dataframes(historical_data, forecast_data, market_data):
+def display_price_forecast_from_dataframes(historical_data, forecast_data, market_data, postcode="", address="", version=None):
     """Display price history and forecast chart."""
     try:
         from household_info_page import display_price_history_forecast_and_market
-        display_price_history_forecast_and_market(historical_data, forecast_data, market_data)
+        display_price_history_forecast_and_market(historical_data, forecast_data, market_data, postcode, address, version)
     except ImportError:
         st.warning("Price history module not available")
     except Exception as e:
         st.error(f"Error displaying price forecast: {str(e)}")
 
 
+def get_details_data(postcode, address, refresh=False):
+    """
+    Historical and forecast frames for the details page, cached in this
+    session by (postcode, address) so reruns (any button click) cost no API
+    calls. Underneath, get_historical_valuation_frame shares frames across
+    sessions. refresh=True bypasses and replaces both.
+    
+    The result's "version" is unique in the process for each fetch, so the
+    details charts can be cached on it without hashing the frames.
+    """
+    cache = st.session_state.setdefault("details_cache", {})
+    key = (postcode, address)
+    if not refresh and key in cache:
+        return cache[key]
+    
+    from scansan_client import get_historical_valuation_frame
+    
+    # Get historical data from API
+    historical_data = get_historical_valuation_frame(
+        area_code=postcode,
+        property_address=address,
+        refresh=refresh
+    )
+    
+    forecast_data = pd.DataFrame(columns=["date", "price"])
+    if historical_data is not None and not historical_data.empty:
+        # ensemble forecast (mean line + model spread band)
+        try:
+            from main import get_price_forecast_frame
+            forecast_data = get_price_forecast_frame(postcode, address)
+        except Exception:
+            pass
+    
+    data = {"historical": historical_data, "forecast": forecast_data, "version": next(_details_versions)}
+    
+    # don't pin an empty result - the next render tries the API again
+    if historical_data is not None and not historical_data.empty:
+        cache[key] = data
+    return data
+
+
+def render_future_price_metric(property_data):
+    """
+    Predicted future price metric. The page never fetches for it: a price the
+    cached postcode documents can't give is left to the session's prefetcher,
+    and the metric polls until the prefetch is done.
+    """
+    prefetcher = st.session_state.get("prefetcher")
+    if prefetcher is not None:
+        prefetcher.apply_results()
+    
+    if property_data.get('future_price') is None and property_data.get('postcode'):
+        from main import add_future_prices
+        add_future_prices([property_data], cached_only=True)
+    
+    waiting = False
+    if property_data.get('future_price') is None and property_data.get('postcode') and prefetcher is not None:
+        # one background fill per card - if it can't predict, "Coming Soon" stays
+        requested = st.session_state.setdefault("details_prefetched", set())
+        key = (property_data['postcode'], property_data.get('address'))
+        if key not in requested:
+            requested.add(key)
+            prefetcher.start([property_data], top_n=1, keep=True)
+        waiting = prefetcher.pending() > 0
+    
+    st.session_state.polling_future_price = waiting
+    st.fragment(_future_price_metric, run_every=PREFETCH_POLL_SECONDS if waiting else None)(property_data)
+
+
+def _future_price_metric(property_data):
+    prefetcher = st.session_state.get("prefetcher")
+    if prefetcher is not None:
+        prefetcher.apply_results()
+    
+    future = property_data.get('future_price')
+    st.metric("Predicted Future Price", f"£{future:,.0f}" if future else "Coming Soon")
+    
+    if st.session_state.get("polling_future_price") and not prefetcher.pending():
+        # the prefetch is done - a full rerun stops the polling
+        st.session_state.polling_future_price = False
+        st.rerun()
+
+
 def render_household_details_view(property_data):
     """
     Render detailed household information for a selected property.
@@ -71,8 +160,7 @@ def render_household_details_view(property_data):
         st.metric("Last Sold Price", f"£{last_sold:,.0f}" if last_sold else "N/A")
     
     with price_col3:
-        future = property_data.get('future_price')
-        st.metric("Predicted Future Price", f"£{future:,.0f}" if future else "Coming Soon")
+        render_future_price_metric(property_data)
     
     st.divider()
     
@@ -85,13 +173,10 @@ def render_household_details_view(property_data):
     if postcode:
         with st.spinner("Loading price history..."):
             try:
-                from scansan_client import get_historical_valuation_frame
-                
-                # Get historical data from API
-                historical_data = get_historical_valuation_frame(
-                    area_code=postcode,
-                    property_address=address
-                )
+                # only "Refresh Data" bypasses the caches
+                refresh = st.session_state.pop("refresh_details", None) == (postcode, address)
+                details_data = get_details_data(postcode, address, refresh=refresh)
+                historical_data = details_data["historical"]
                 
                 if historical_data is not None and not historical_data.empty:
                     st.success(f"✅ Found {len(historical_data)} historical data points")
@@ -100,20 +185,23 @@ def render_household_details_view(property_data):
                     with st.expander("View Raw Data"):
                         st.dataframe(historical_data)
                     
-                    # Create empty DataFrames for forecast and market (placeholders for now)
+                    # Create empty DataFrames for market (placeholder for now)
                     empty_df = pd.DataFrame(columns=["date", "price"])
                     
-                    # TODO: Replace empty_df with actual forecast data from your ML model
-                    forecast_data = empty_df
+                    forecast_data = details_data["forecast"]
                     
                     # TODO: Replace empty_df with market average data
                     market_data = empty_df
                     
-                    # Display the chart
+                    # Display the chart (market_data is a fixed placeholder, so the
+                    # details version covers all three frames)
                     display_price_forecast_from_dataframes(
                         historical_data, 
                         forecast_data, 
-                        market_data
+                        market_data,
+                        postcode,
+                        address,
+                        details_data["version"]
                     )
                     
                 else:
@@ -169,6 +257,7 @@ def render_household_details_view(property_data):
     
     with col2:
         if st.button("🔄 Refresh Data", use_container_width=True):
+            st.session_state.refresh_details = (postcode, address)
             st.rerun()
     
     # Debug: Show raw property data
@@ -182,6 +271,8 @@ def initialise_household_session_state():
         st.session_state.selected_property = None
     if "favorites" not in st.session_state:
         st.session_state.favorites = []
+    if "details_cache" not in st.session_state:
+        st.session_state.details_cache = {}
 
 
 def has_selected_property():
@@ -0,0 +1,137 @@
+"""
+Shared HTTP session for API calls.
+
+One pooled requests.Session is reused by scansan_client and translator so
+connections (and their TLS handshakes) are kept alive between calls, with
+timeouts, client-side rate limiting and retry/backoff on 429/5xx handled in
+one place.
+"""
+
+import json
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests as rq
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import HTTP_POOL_SIZE, HTTP_TIMEOUT, HTTP_RETRIES, HTTP_BACKOFF, HTTP_BACKOFF_MAX, HTTP_RETRY_STATUSES
+from config import RATE_LIMITS, RATE_LIMIT_DEFAULT, RATE_LIMIT_SCALE
+from rate_limit import RateLimiter
+
+# orjson decodes API payloads faster than the stdlib json; optional
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+_session = None
+_session_lock = threading.Lock()
+
+# shared by scansan_client and translator - one bucket per endpoint template
+rate_limiter = RateLimiter(limits=RATE_LIMITS, default=RATE_LIMIT_DEFAULT, scale=RATE_LIMIT_SCALE)
+
+
+def create_session(pool_size=HTTP_POOL_SIZE, retries=HTTP_RETRIES, backoff=HTTP_BACKOFF):
+    """
+    INPUTS:
+    pool_size: int (keep-alive connections kept per host)
+    retries: int (retries on connection errors)
+    backoff: float (exponential backoff factor between them)
+
+    OUTPUTS:
+    requests.Session
+
+    429/5xx responses are retried by http_get, not here, so every retry goes
+    through the rate limiter and shows up in its stats.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=[],
+        allowed_methods=["GET"],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = rq.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """Return the process-wide session, creating it on first use."""
+    global _session
+
+    if (_session is None):
+        with _session_lock:
+            if (_session is None):
+                _session = create_session()
+
+    return _session
+
+
+def retry_delay(response, attempt, backoff=HTTP_BACKOFF, max_delay=HTTP_BACKOFF_MAX):
+    """
+    Seconds to wait before retry number attempt + 1.
+
+    Retry-After (seconds or an HTTP date) wins when the server sends it,
+    otherwise exponential backoff with full jitter; both capped at max_delay.
+    """
+    retry_after = response.headers.get("Retry-After")
+    if (retry_after):
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                seconds = None
+        if (seconds is not None):
+            # a little jitter so waiting threads don't all return at once
+            return min(max_delay, max(0.0, seconds) + random.uniform(0, backoff))
+
+    return random.uniform(0, min(max_delay, backoff * 2 ** attempt))
+
+
+def http_get(url, params=None, headers=None, timeout=HTTP_TIMEOUT, endpoint=None, retries=HTTP_RETRIES):
+    """
+    Rate-limited GET through the shared session.
+
+    INPUTS:
+    endpoint: str (rate limit bucket, normally the url template - defaults to url)
+    retries: int (re-sends after a HTTP_RETRY_STATUSES response)
+
+    OUTPUTS:
+    requests.Response (the last one, if every attempt failed)
+    """
+    key = endpoint or url
+
+    for attempt in range(retries + 1):
+        rate_limiter.acquire(key)
+        response = get_session().get(url=url, params=params, headers=headers, timeout=timeout)
+
+        rate_limiter.record_response(response.status_code)
+
+        if (response.status_code not in HTTP_RETRY_STATUSES or attempt == retries):
+            return response
+
+        delay = retry_delay(response, attempt)
+        if (response.status_code == 429):
+            # over quota - hold the whole endpoint back, not just this thread
+            rate_limiter.bucket(key).pause(delay)
+        rate_limiter.record("retried")
+        response.close()
+        time.sleep(delay)
+
+
+def response_json(response):
+    """Decode a response body with json_loads (orjson when installed)."""
+    return json_loads(response.content)
+
+
+def get_request_stats():
+    """Served/throttled/failed/retried request counters from the rate limiter."""
+    return rate_limiter.stats()
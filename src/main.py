@@ -1,6 +1,19 @@
 import re # regular expressions
-from scansan_client import get_search, get_summary, get_sale_history, get_current_valuations, get_historical_valuations
-from config import API_KEY, HEADERS, UK_AREAS
+import threading
+from scansan_client import get_search, get_summary, get_sale_history, get_current_valuations, get_current_valuations_many, iter_current_valuations, get_historical_valuations
+from config import API_KEY, HEADERS, UK_AREAS, VALUATION_MAX_WORKERS, SEARCH_DEADLINE_SECONDS, MODEL_NAME, FORECAST_YEARS
+from config import ENSEMBLE_MODELS, FORECAST_HORIZON_YEARS, PREDICT_THREAD_COUNT, AREA_INDEX_PATH, AREA_INDEX_MAX_AGE
+from area_index import AreaIndex, normalise_name
+from postcode_index import load_postcode_index
+from valuation_store import current_prices
+from datetime import date
+import pandas as pd
+from translator import translate_many, is_postcode_cached
+from feature_schema import FEATURE_COLUMNS, DATE_FEATURES
+from predictor import predict, predict_ensemble
+
+# features that describe the property itself (not where or when)
+PROPERTY_FEATURE_COLUMNS = [c for c in FEATURE_COLUMNS if c != "postcode" and c not in DATE_FEATURES]
 
 # API Config
 def parse_api_search_response(api_response: dict) -> dict:
@@ -103,86 +116,315 @@ def parse_api_search_response(api_response: dict) -> dict:
     
     return result
 
-def search_properties_from_api(area: str, query: str = "", postcode_district: str = "", street: str = "") -> list[dict]:
+def resolve_area(area_name: str) -> dict | None:
     """
-    Search for properties using the real API.
+    Look an area name up through the search API.
     
-    Valid parameter combinations:
-    1. area_name only (place name like 'Brixton', 'Aberdeen')
-    2. gbr_district AND gbr_street (e.g., 'SW1A' + 'Downing Street')
+    Returns:
+        Parsed search result (see parse_api_search_response), or None
+    """
+    return parse_api_search_response(get_search(area_name=area_name))
+
+# shared by every session - built with `python src/area_index.py`, opened on first use
+_area_index = None
+_area_index_lock = threading.Lock()
+
+# names the index may persist (plus detected areas, see index_detected_area) - not arbitrary input
+INDEXED_AREA_NAMES = {normalise_name(name) for name in UK_AREAS}
+
+def get_area_index() -> AreaIndex:
+    """
+    The shared area index, opened (creating its SQLite file) on first use.
+    
+    Returns:
+        AreaIndex
+    """
+    global _area_index
+    with _area_index_lock:
+        if _area_index is None:
+            _area_index = AreaIndex(AREA_INDEX_PATH, AREA_INDEX_MAX_AGE, resolve=resolve_area)
+        return _area_index
+
+def index_detected_area(area_name: str) -> None:
+    """
+    Add an area detected from search results to the area index, resolved on
+    its background thread, so later dropdown searches for it skip get_search.
     
     Parameters:
-        area: The UK area to search in (used as area_name)
-        query: Optional search query (used as area_name if no district/street)
-        postcode_district: Postcode district (e.g., 'SW1A', 'NG8', 'SS0')
-        street: Street name within the postcode district
+        area_name: Detected area (see get_detected_area_from_properties)
+    """
+    index = get_area_index()
+    if area_name and area_name not in index:
+        index.refresh_in_background(area_name)
+
+def resolve_street(postcode_district: str, street: str) -> dict | None:
+    """
+    Look a postcode district + street up in the local postcode index.
     
     Returns:
-        List of property dictionaries with addresses and area codes
+        Parsed search result like parse_api_search_response's (area codes are
+        the street's postcodes, busiest first), or None when the index hasn't
+        been built or has no exact (normalised) match - the caller then asks
+        the search API, rather than searching a guessed street
+    """
+    index = load_postcode_index()
+    if index is None:
+        return None
+    
+    matched_street, postcodes = index.resolve(postcode_district, street)
+    if not postcodes:
+        return None
+    
+    district = postcode_district.strip().upper()
+    borough = index.boroughs.get(district.replace(" ", ""))
+    return {
+        "search_query": f"{district} {street}",
+        "search_found": "street",
+        "area_codes": postcodes,
+        "boroughs": [borough] if borough else [],
+        "wards": [],
+        "streets": [matched_street.title()],
+        "postcodes": [district]
+    }
+
+def build_properties_from_valuations(area_code: str, valuations: dict, area_label: str) -> list[dict]:
+    """
+    Turn a current valuations response for one area code into property dictionaries.
+    
+    Parameters:
+        area_code: The area code (postcode) the valuations belong to
+        valuations: JSON response from get_current_valuations (or None)
+        area_label: Area name shown on the property cards
+    
+    Returns:
+        List of up to 3 property dictionaries
     """
     properties = []
-    api_response = None
+    
+    if not valuations or not isinstance(valuations, dict):
+        return properties
+    
+    valuation_data = valuations.get("data", [])[:3]  # up to 3
+    
+    for val, current_price in zip(valuation_data, current_prices(valuation_data)):
+        property_address = val.get("property_address", f"Property in {area_code}")
+        last_sold_price = val.get("last_sold_price")
+        last_sold_date = val.get("last_sold_date", "")
+        
+        properties.append({
+            "address": property_address,
+            "postcode": area_code,
+            "area": area_label,
+            "current_price": current_price,
+            "future_price": None,  # for catboost
+            "last_sold_price": last_sold_price,
+            "last_sold_date": last_sold_date,
+            "score": None,  # for catboost
+        })
+    
+    return properties
+
+def add_future_prices(properties: list[dict], model_name: str = MODEL_NAME, cached_only: bool = False) -> list[dict]:
+    """
+    Fill in future_price for properties that don't have one, with one batched model call.
+    
+    Parameters:
+        properties: List of property dictionaries (needs 'postcode' and 'address')
+        model_name: Model file in models/ to predict with
+        cached_only: Only featurise properties whose postcode documents are
+            already cached - no API calls, so it is safe on the search path
+    
+    Returns:
+        The same list; future_price stays None if there are no features for
+        the property, or featurising or prediction fails
+    """
+    pending = [p for p in properties if p.get("future_price") is None and p.get("postcode")]
+    if cached_only:
+        pending = [p for p in pending if is_postcode_cached(p["postcode"])]
+    if not pending:
+        return properties
+    
+    today = date.today()
+    forecast_date = date(today.year + FORECAST_YEARS, today.month, 1)
+    
+    try:
+        features = translate_many([(p["postcode"], p.get("address")) for p in pending], valuation_date=forecast_date)
+        
+        # a row with nothing but postcode and date would be a guess, not a prediction
+        has_features = features[PROPERTY_FEATURE_COLUMNS].notna().any(axis=1).to_numpy()
+        if not has_features.any():
+            return properties
+        
+        prices = predict(features[has_features], model_name)
+    except Exception as e:
+        print(f"Error: {e}")
+        return properties
+    
+    for prop, price in zip([p for p, keep in zip(pending, has_features) if keep], prices):
+        prop["future_price"] = float(price)
+    
+    return properties
+
+def get_price_forecast_frame(postcode: str, address: str, horizon_years: int = FORECAST_HORIZON_YEARS,
+                             model_names: list[str] = ENSEMBLE_MODELS) -> pd.DataFrame:
+    """
+    Forecast a property's price yearly over the horizon with the model ensemble.
+    
+    Parameters:
+        postcode: The property's postcode (area code)
+        address: The property's address
+        horizon_years: How many years ahead to forecast
+        model_names: Model files in models/ to average
+    
+    Returns:
+        DataFrame with columns ['date', 'price', 'low', 'high'] - price is the
+        ensemble mean, low/high the mean -/+ the spread between models.
+        Empty if there are no property features to forecast from.
+        frame.attrs["latency"] holds each model's predict time in seconds
+        (also accumulated in predictor.get_latency_stats)
+    """
+    today = date.today()
+    dates = [date(today.year + offset, today.month, 1) for offset in range(horizon_years + 1)]
+    
+    # featurise once, then only the date features change per forecast point
+    row = translate_many([(postcode, address)])
+    # same guard as add_future_prices - no property features, no forecast
+    if not row[PROPERTY_FEATURE_COLUMNS].notna().any(axis=1).iloc[0]:
+        return pd.DataFrame(columns=["date", "price", "low", "high"])
+    features = pd.concat([row] * len(dates), ignore_index=True)
+    features["year"] = [d.year for d in dates]
+    features["month"] = [d.month for d in dates]
+    features["quarter"] = [(d.month - 1) // 3 + 1 for d in dates]
+    
+    result = predict_ensemble(features, model_names, thread_count=PREDICT_THREAD_COUNT)
+    
+    frame = pd.DataFrame({
+        "date": pd.to_datetime(dates),
+        "price": result["mean"],
+        "low": result["low"],
+        "high": result["high"],
+    })
+    frame.attrs["latency"] = result["latency"]
+    return frame
+
+def resolve_search(area: str, query: str = "", postcode_district: str = "", street: str = "") -> dict | None:
+    """
+    Work out which area codes a search covers.
+    
+    Valid parameter combinations:
+    1. area_name only (place name like 'Brixton', 'Aberdeen')
+    2. gbr_district AND gbr_street (e.g., 'SW1A' + 'Downing Street')
+    
+    Returns:
+        Parsed search result (see parse_api_search_response), or None
+    """
+    parsed = None
+    area_name = None
     
     # determine search method based on provided parameters
     if postcode_district and street:
-        # postcode district + street
-        api_response = get_search(gbr_district=postcode_district.strip().upper(), gbr_street=street.strip())
+        # postcode district + street - local index first, API if it doesn't know the street
+        parsed = resolve_street(postcode_district, street)
+        if parsed is None:
+            api_response = get_search(gbr_district=postcode_district.strip().upper(), gbr_street=street.strip())
+            parsed = parse_api_search_response(api_response)
     elif query:
         # area name
-        api_response = get_search(area_name=query.strip())
+        area_name = query.strip()
     elif area and area not in ["Anywhere in the UK", "Any", ""]:
         # +selected area name
-        api_response = get_search(area_name=area.strip())
+        area_name = area.strip()
+    
+    if area_name:
+        # local index first - no search round-trip for known areas
+        index = get_area_index()
+        parsed = index.get(area_name)
+        if parsed is None:
+            parsed = resolve_area(area_name)
+            # only dropdown areas are kept - free-text queries aren't persisted
+            if parsed and parsed.get("area_codes") and normalise_name(area_name) in INDEXED_AREA_NAMES:
+                index.put(area_name, parsed)
+    
+    return parsed or None
+
+def get_area_label(parsed: dict, area: str) -> str:
+    """Area name shown on the cards: first borough, else first ward, else the selected area."""
+    boroughs = parsed.get("boroughs", [])
+    wards = parsed.get("wards", [])
+    return boroughs[0] if boroughs else (wards[0] if wards else area)
+
+def search_properties_from_api(area: str, query: str = "", postcode_district: str = "", street: str = "",
+                               max_workers: int = VALUATION_MAX_WORKERS, deadline: float = SEARCH_DEADLINE_SECONDS) -> list[dict]:
+    """
+    Search for properties using the real API.
     
-    if not api_response:
-        return []
+    Parameters:
+        area: The UK area to search in (used as area_name)
+        query: Optional search query (used as area_name if no district/street)
+        postcode_district: Postcode district (e.g., 'SW1A', 'NG8', 'SS0')
+        street: Street name within the postcode district
+        max_workers: Max concurrent valuation calls for this search
+        deadline: Seconds allowed for all valuation calls; slower area codes are skipped
     
-    parsed = parse_api_search_response(api_response)
+    Returns:
+        List of property dictionaries with addresses and area codes
+    """
+    properties = []
+    parsed = resolve_search(area, query, postcode_district, street)
     
     if not parsed:
         return []
     
-    area_codes = parsed.get("area_codes", []) # get codes
-    boroughs = parsed.get("boroughs", [])
-    wards = parsed.get("wards", [])
+    # property valuations for each area code, fetched in parallel
+    area_codes = parsed.get("area_codes", [])[:6]  # up to 6
+    all_valuations = get_current_valuations_many(area_codes, max_workers=max_workers, deadline=deadline)
+
+    area_label = get_area_label(parsed, area)
+
+    # results keep area code order regardless of which call finished first
+    for area_code, valuations in zip(area_codes, all_valuations):
+        properties.extend(build_properties_from_valuations(area_code, valuations, area_label))
     
-    # property valuations for each area code
-    for area_code in area_codes[:6]:  # up to 6
-        valuations = get_current_valuations(area_code=area_code)
-        
-        if valuations and isinstance(valuations, dict):
-            valuation_data = valuations.get("data", [])
-            
-            for val in valuation_data[:3]:  # up to 3
-                property_address = val.get("property_address", f"Property in {area_code}")
-                bounded_valuation = val.get("bounded_valuation", [])
-                last_sold_price = val.get("last_sold_price")
-                last_sold_date = val.get("last_sold_date", "")
-                
-                current_price = None
-                if bounded_valuation and len(bounded_valuation) > 0:
-                    if len(bounded_valuation) >= 2:
-                        current_price = (bounded_valuation[0] + bounded_valuation[-1]) // 2
-                    else:
-                        current_price = bounded_valuation[0]
-                elif last_sold_price:
-                    current_price = last_sold_price
-                
-                properties.append({
-                    "address": property_address,
-                    "postcode": area_code,
-                    "area": boroughs[0] if boroughs else (wards[0] if wards else area),
-                    "current_price": current_price,
-                    "future_price": None,  # for catboost
-                    "last_sold_price": last_sold_price,
-                    "last_sold_date": last_sold_date,
-                    "score": None,  # for catboost
-                })
+    # only from postcode documents already cached - featurising the rest would
+    # cost 3 API calls per postcode before any result is shown (the prefetcher
+    # and the details page fill those in)
+    add_future_prices(properties, cached_only=True)
     
     return properties
 
+def iter_search_properties_from_api(area: str, query: str = "", postcode_district: str = "", street: str = "",
+                                    max_workers: int = VALUATION_MAX_WORKERS, deadline: float = SEARCH_DEADLINE_SECONDS):
+    """
+    Streaming search_properties_from_api: yields each area code's properties
+    as soon as its valuations arrive (fastest first), so the first cards can
+    be shown after one valuation round-trip.
+    
+    future_price is filled in afterwards, on the same dicts that were
+    yielded, for properties whose postcode documents are already cached
+    (see add_future_prices) - by the time the generator is exhausted.
+    
+    Yields:
+        Lists of property dictionaries (one per area code with results)
+    """
+    parsed = resolve_search(area, query, postcode_district, street)
+    
+    if not parsed:
+        return
+    
+    area_codes = parsed.get("area_codes", [])[:6]  # up to 6
+    area_label = get_area_label(parsed, area)
+    
+    properties = []
+    for i, valuations in iter_current_valuations(area_codes, max_workers=max_workers, deadline=deadline):
+        batch = build_properties_from_valuations(area_codes[i], valuations, area_label)
+        if batch:
+            properties.extend(batch)
+            yield batch
+    
+    add_future_prices(properties, cached_only=True)
+
 # search func
-def search_properties(area: str, query: str = "", postcode_district: str = "", street: str = "") -> list[dict]:
+def search_properties(area: str, query: str = "", postcode_district: str = "", street: str = "", stream: bool = False):
     """
     Search for properties in a given area using the API.
     
@@ -195,10 +437,15 @@ def search_properties(area: str, query: str = "", postcode_district: str = "", s
         query: Optional search query (place name)
         postcode_district: Postcode district (e.g., 'SW1A')
         street: Street name (required if postcode_district is provided)
+        stream: Return a generator of property batches instead of a list
+            (see iter_search_properties_from_api)
     
     Returns:
-        List of property dictionaries
+        List of property dictionaries, or a generator of lists of them when stream=True
     """
+    if stream:
+        return iter_search_properties(area, query, postcode_district, street)
+    
     try:
         properties = search_properties_from_api(area, query, postcode_district, street)
         return properties
@@ -206,7 +453,36 @@ def search_properties(area: str, query: str = "", postcode_district: str = "", s
         # If API call fails, continue to mock data
         pass
     
-    # fall back to mock data if API returns nothing or fails
+    return get_mock_properties(area, query)
+
+def iter_search_properties(area: str, query: str = "", postcode_district: str = "", street: str = ""):
+    """
+    Generator form of search_properties: property batches as they arrive,
+    falling back to the mock data (as one batch) if the API fails before
+    anything was found.
+    """
+    found = False
+    try:
+        for batch in iter_search_properties_from_api(area, query, postcode_district, street):
+            found = True
+            yield batch
+        return
+    except Exception:
+        # If API call fails, continue to mock data
+        if found:
+            return
+    
+    properties = get_mock_properties(area, query)
+    if properties:
+        yield properties
+
+def get_mock_properties(area: str, query: str = "") -> list[dict]:
+    """
+    Fallback properties from AREA_PROPERTIES when the API fails.
+    
+    Returns:
+        List of property dictionaries
+    """
     properties = []
     
     if area in AREA_PROPERTIES:
@@ -224,7 +500,6 @@ def search_properties(area: str, query: str = "", postcode_district: str = "", s
         properties = [p for p in properties if q in p.get("address", "").lower()]
     
     return properties
-    return []
 
  # property Data (Mock Database - Fallback)
 AREA_PROPERTIES = {
@@ -401,6 +676,52 @@ def validate_search_input(query: str, postcode_district: str, street_name: str)
     
     return None
 
+def get_district_hint(postcode_district: str) -> str | None:
+    """
+    "Did you mean" hint for a district the local postcode index doesn't know.
+    
+    The index only covers England & Wales (it is built from the cleaned
+    shards), so an unknown district - e.g. EH1, G2, BT1 - may still be
+    valid; the search goes ahead through the API either way.
+    
+    Parameters:
+        postcode_district: Postcode district for advanced search
+    
+    Returns:
+        Hint string, or None if the district is known, the index hasn't been
+        built, or there is nothing close to suggest
+    """
+    index = load_postcode_index()
+    if not postcode_district or index is None or index.has_district(postcode_district):
+        return None
+    
+    suggestions = index.suggest_districts(postcode_district)
+    if not suggestions:
+        return None
+    return f"'{postcode_district.strip().upper()}' isn't in the local postcode index - did you mean: {', '.join(suggestions)}?"
+
+def get_postcode_districts() -> list[str]:
+    """
+    Every postcode district in the local index, for the district selectbox.
+    
+    Returns:
+        Sorted district list, empty if the index hasn't been built
+    """
+    index = load_postcode_index()
+    return index.districts if index is not None else []
+
+def get_street_suggestions(postcode_district: str, street: str, limit: int = 5) -> list[str]:
+    """
+    Streets in a district matching a partial or misspelt name.
+    
+    Returns:
+        Street names (title case), empty if the index hasn't been built
+    """
+    index = load_postcode_index()
+    if index is None or not postcode_district:
+        return []
+    return [name.title() for name in index.complete_street(postcode_district, street or "", limit=limit)]
+
 
 def get_detected_area_from_properties(properties: list) -> str | None:
     """
@@ -0,0 +1,283 @@
+"""
+Offline stand-in for the Scansan API, for load testing and air-gapped dev.
+
+Serves the routes scansan_client and translator use, with deterministic
+fixture data (the same area code always gets the same properties), plus
+configurable latency and error injection. Point the app at it with:
+
+    python src/mock_scansan_server.py --port 8765 --latency-ms 80 --error-rate 0.02
+    SCANSAN_BASE_URL=http://127.0.0.1:8765/v1 streamlit run src/app.py
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+STREETS = ["High Street", "Station Road", "Church Lane", "Park Avenue", "Victoria Road", "Mill Lane", "Queen Street", "Kings Road"]
+BOROUGHS = ["Lambeth", "Camden", "Westminster", "Hackney", "Southwark", "Islington"]
+PROPERTY_TYPES = ["Flat", "Maisonette", "Detached", "Semi-Detached", "Terraced"]
+RATINGS = ["A", "B", "C", "D", "E", "F", "G"]
+EFFICIENCY = ["Very Good", "Good", "Average", "Poor"]
+FLOORS = ["Solid, no insulation (assumed)", "Suspended, insulated (assumed)", "(another dwelling below)"]
+WINDOWS = ["Fully double glazed", "Mostly double glazing", "Single glazed"]
+WALLS = ["Cavity wall, filled cavity", "Solid brick, as built, no insulation (assumed)", "Timber frame, as built, insulated (assumed)"]
+ROOFS = ["Pitched, 200 mm loft insulation", "Flat, limited insulation (assumed)", "(another premises above)"]
+MAINHEAT = ["Boiler and radiators, mains gas", "Electric storage heaters", "Air source heat pump, radiators, electric"]
+
+PROPERTIES_PER_POSTCODE = 8
+
+
+# fixture data - seeded by the key so responses are stable across runs
+def rng_for(*keys):
+    return random.Random(zlib.crc32("|".join(str(key) for key in keys).encode()))
+
+
+def normalise(area_code):
+    return area_code.replace(" ", "").upper()
+
+
+def area_codes_for(query):
+    """Six postcodes for a search, e.g. 'Brixton' -> ['BR1 1AA', ...]."""
+    rng = rng_for("search", query.lower())
+    district = (re.sub(r"[^A-Za-z]", "", query)[:2] or "XX").upper() + str(rng.randint(1, 20))
+    return district, [f"{district} {rng.randint(1, 9)}{chr(65 + rng.randint(0, 25))}{chr(65 + rng.randint(0, 25))}" for _ in range(6)]
+
+
+def addresses_for(area_code):
+    rng = rng_for("addresses", normalise(area_code))
+    street = rng.choice(STREETS)
+    return [f"{number} {street}" for number in rng.sample(range(1, 200), PROPERTIES_PER_POSTCODE)]
+
+
+def base_price(area_code, address):
+    return rng_for("price", normalise(area_code), address).randint(150, 1500) * 1000
+
+
+def search(params):
+    query = (params.get("area_name") or [None])[0]
+    if (query is None):
+        district = (params.get("gbr_district") or [""])[0]
+        street = (params.get("gbr_street") or [""])[0]
+        if (not district or not street):
+            return 400, {"error": "area_name or gbr_district + gbr_street required"}
+        query = f"{district} {street}"
+
+    district, area_codes = area_codes_for(query)
+    rng = rng_for("borough", query.lower())
+    return 200, {
+        "search_query": query,
+        "search_found": "ward",
+        "response_time": "0.01",
+        "data": [[{
+            "area_code": {"area_code_district": district, "area_code_count": len(area_codes), "area_code_list": area_codes},
+            "borough": [rng.choice(BOROUGHS)],
+            "ward": [query.title()],
+            "street": {"street_count": 2, "street_list": rng.sample(STREETS, 2)},
+        }]],
+    }
+
+
+def summary(area_code, params):
+    rng = rng_for("summary", normalise(area_code))
+    low = rng.randint(150, 400) * 1000
+    return 200, {"area_code": area_code, "data": {
+        "total_properties": rng.randint(20, 400),
+        "sold_price_range_in_last_5yrs": [low, low * 3],
+        "current_valuation_range": [low, low * 3],
+        "current_rent_listings": rng.randint(0, 30),
+        "current_sale_listings": rng.randint(0, 30),
+    }}
+
+
+def sale_history(area_code, params):
+    data = []
+    for address in addresses_for(area_code):
+        rng = rng_for("history", normalise(area_code), address)
+        data.append({
+            "street_address": address,
+            "property_type": rng.choice(PROPERTY_TYPES),
+            "transactions": [{"date": f"{rng.randint(1995, 2024)}-06-30", "price": base_price(area_code, address) // 2}],
+        })
+    return 200, {"area_code": area_code, "data": data}
+
+
+def current_valuations(area_code, params):
+    data = []
+    for address in addresses_for(area_code):
+        price = base_price(area_code, address)
+        data.append({
+            "property_address": address,
+            "last_sold_price": price // 2,
+            "last_sold_date": "2015-06-30",
+            "lower_outlier": False,
+            "upper_outlier": False,
+            "bounded_valuation": [int(price * 0.9), price, int(price * 1.1)],
+        })
+    return 200, {"area_code": area_code, "data": data}
+
+
+def historical_valuations(area_code, params):
+    data = []
+    today = date.today()
+    for address in addresses_for(area_code):
+        price = base_price(area_code, address)
+        valuations = []
+        for months_back in range(60, 0, -1):
+            year, month = divmod(today.year * 12 + today.month - 1 - months_back, 12)
+            valuations.append({"date": f"{year}-{month + 1:02d}-01", "valuation": int(price * (1 - months_back * 0.003))})
+        data.append({"property_address": address, "valuations": valuations})
+    return 200, {"area_code": area_code, "data": data}
+
+
+def sale_listings(area_code, params):
+    listings = []
+    for address in addresses_for(area_code):
+        rng = rng_for("listing", normalise(area_code), address)
+        listings.append({
+            "street_address": address,
+            "bedrooms": rng.randint(1, 5),
+            "living_rooms": rng.randint(1, 2),
+            "property_size": rng.randint(35, 250),
+        })
+    return 200, {"area_code": area_code, "data": {"sale_listings": listings}}
+
+
+def energy_performance(area_code, params):
+    data = []
+    for address in addresses_for(area_code):
+        rng = rng_for("epc", normalise(area_code), address)
+        data.append({
+            "street_address": address,
+            "EPC": {"current_rating": rng.choice(RATINGS)},
+            "energy_consumption": {"current_annual_energy_consumption": rng.randint(50, 450)},
+            "annual_CO2_emissions": {"current_emissions": round(rng.uniform(0.5, 12), 1)},
+            "annual_energy_costs": {"current_annual_heating_cost": rng.randint(200, 2500), "current_annual_hot_water_cost": rng.randint(50, 500)},
+            "property_efficiency": {
+                "property_main_heating_energy_efficiency": rng.choice(EFFICIENCY),
+                "floor_description": rng.choice(FLOORS),
+                "property_windows_description": rng.choice(WINDOWS),
+                "property_walls_description": rng.choice(WALLS),
+                "roof_description": rng.choice(ROOFS),
+                "property_main_heating_description": rng.choice(MAINHEAT),
+            },
+        })
+    return 200, {"area_code": area_code, "data": data}
+
+
+# route pattern (under the base path) -> handler(area_code, params)
+ROUTES = [
+    (re.compile(r"^/area_codes/([^/]+)/summary$"), summary),
+    (re.compile(r"^/area_codes/([^/]+)/sale/listings$"), sale_listings),
+    (re.compile(r"^/postcode/([^/]+)/sale/history$"), sale_history),
+    (re.compile(r"^/postcode/([^/]+)/valuations/current$"), current_valuations),
+    (re.compile(r"^/postcode/([^/]+)/valuations/historical$"), historical_valuations),
+    (re.compile(r"^/postcode/([^/]+)/energy/performance$"), energy_performance),
+]
+
+
+class MockScansanHandler(BaseHTTPRequestHandler):
+    # keep-alive, like the real API
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+
+        # latency injection
+        delay = server.latency + server.random.uniform(0, server.jitter)
+        if (delay > 0):
+            time.sleep(delay)
+
+        # error injection
+        roll = server.random.random()
+        if (roll < server.rate_limit_rate):
+            return self.send_json(429, {"error": "Too Many Requests"}, {"Retry-After": "1"})
+        if (roll < server.rate_limit_rate + server.error_rate):
+            return self.send_json(503, {"error": "Service Unavailable"})
+
+        path = url.path
+        if (not path.startswith(server.base_path)):
+            return self.send_json(404, {"error": "Not Found"})
+        path = path[len(server.base_path):]
+
+        if (path == "/area_codes/search"):
+            return self.send_json(*search(params))
+
+        for pattern, handler in ROUTES:
+            match = pattern.match(path)
+            if (match):
+                return self.send_json(*handler(unquote(match.group(1)), params))
+
+        return self.send_json(404, {"error": "Not Found"})
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if (self.server.verbose):
+            super().log_message(format, *args)
+
+
+def start_server(host="127.0.0.1", port=0, latency_ms=0, jitter_ms=0, error_rate=0.0, rate_limit_rate=0.0,
+                 base_path="/v1", seed=0, verbose=False):
+    """
+    Start the mock in a background thread.
+
+    INPUTS:
+    port: int (0 picks a free port)
+    latency_ms / jitter_ms: fixed + uniform random delay per request
+    error_rate: fraction of requests answered 503
+    rate_limit_rate: fraction of requests answered 429 with Retry-After
+
+    OUTPUTS:
+    (server, base_url) - call server.shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), MockScansanHandler)
+    server.daemon_threads = True
+    server.latency = latency_ms / 1000
+    server.jitter = jitter_ms / 1000
+    server.error_rate = error_rate
+    server.rate_limit_rate = rate_limit_rate
+    server.base_path = base_path
+    server.random = random.Random(seed)
+    server.verbose = verbose
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}{base_path}"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local mock of the Scansan API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503s")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of 429s")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                                    args.rate_limit_rate, verbose=args.verbose)
+    print(f"Mock Scansan API on {base_url} - run the app with SCANSAN_BASE_URL={base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,48 +1,39 @@
-import catboost as cb
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 from catboost import CatBoostRegressor, Pool
-from sklearn.model_selection import train_test_split, GridSearchCV
-import matplotlib as plt
+from sklearn.model_selection import train_test_split, ParameterSampler
 
-from sklearn.pipeline import Pipeline
 import pandas as pd
 from sklearn.metrics import mean_absolute_error, r2_score
+from feature_schema import CATEGORICAL_FEATURES, TARGET_COLUMN
+from dataset import TRAINING_DATA_PATH
+from preprocessing import load_preprocessed, CACHE_DIR
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models")
 
-df = pd.read_parquet("./data/training_data.parquet")
-df["year"] = df["dateoftransfer".str[:4]].astype(int)
-df = df.drop(columns=["dateoftransfer"])
-
-X = df.drop(columns=["price"])
-y = df["price"]
-
-categorical_features = [
-    'postcode',
-    'propertytype',
-    'CURRENT_ENERGY_RATING',
-    "FLOOR_TYPE",
-    "FLOOR_INSULATED",
-    "WINDOWS_TYPE",
-    "WINDOWS_DEGREE",
-    "WALLS_TYPE",
-    "WALLS_CAVITY",
-    "WALLS_INSULATED",
-    "ROOF_TYPE",
-    "ROOF_INSULATED",
-    "MAINHEAT_TYPE",
-    'MAINHEAT_ENERGY_EFF'
-]
-
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
 
-train_pool = Pool(data=X_train, label=y_train, cat_features=categorical_features)
+def physical_cores():
+    """Physical core count (hyper-threads don't help CatBoost on CPU)."""
+    try:
+        import psutil
+        cores = psutil.cpu_count(logical=False)
+    except ImportError:
+        cores = None
+    return cores or max(1, (os.cpu_count() or 2) // 2)
 
-test_pool = Pool(data=X_test, label=y_test, cat_features=categorical_features)
+
+# CPU-only training profile - our training boxes have no GPU
+CPU_PROFILE = dict(
+    task_type="CPU",
+    boosting_type="Plain", # faster than Ordered on large data
+    border_count=128, # fewer float splits to evaluate
+    one_hot_max_size=10, # small categoricals one-hot instead of CTRs
+    thread_count=physical_cores()
+)
 
 params = dict(
-    task_type="GPU",
-    devices="0",
     loss_function="MAE",
     depth=6,
     learning_rate=0.05,
@@ -51,27 +42,144 @@ params = dict(
     random_seed=42,
     od_type="Iter",
     od_wait=150,
-    thread_count=-1
+    **CPU_PROFILE
 )
 
-# attempt to use GPU to speed up process; falling back to CPU when failing
-try:
-    model = CatBoostRegressor(task_type="GPU", devices="0", **params)
-    model.fit(train_pool, eval_set=test_pool, use_best_model=True)
-except Exception:
-    model = CatBoostRegressor(task_type="CPU", **params)
-    model.fit(train_pool, eval_set=test_pool, use_best_model=True)
+# randomized search space for the hyper-parameter search
+SEARCH_SPACE = {
+    "depth": [4, 6, 8],
+    "learning_rate": [0.03, 0.05, 0.1],
+    "l2_leaf_reg": [1, 3, 9],
+    "border_count": [64, 128, 254],
+}
+
+
+def load_training_data(data_path=TRAINING_DATA_PATH, cache_dir=CACHE_DIR):
+    """(X, y) from the cached preprocessed training data."""
+    # compact dtypes + year/month/quarter, cached by input file hash
+    df = load_preprocessed(data_path, cache_dir=cache_dir)
+
+    X = df.drop(columns=[TARGET_COLUMN])
+    y = df[TARGET_COLUMN]
+    return X, y
+
+
+def make_pools(X, y):
+    """Fixed 80/20 split -> (train_pool, test_pool, y_test)"""
+    categorical_features = [column for column in CATEGORICAL_FEATURES if column in X.columns]
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+
+    train_pool = Pool(data=X_train, label=y_train, cat_features=categorical_features)
+    test_pool = Pool(data=X_test, label=y_test, cat_features=categorical_features)
+    return train_pool, test_pool, y_test
+
+
+def train(X, y, overrides=None):
+    """
+    Fit with params (+ overrides) and score on the held-out 20%.
+
+    OUTPUTS:
+    (model, {"mae": float, "r2": float, "seconds": float})
+    """
+    train_pool, test_pool, y_test = make_pools(X, y)
+
+    start = time.perf_counter()
+    model = CatBoostRegressor(**{**params, **(overrides or {})})
+    model.fit(train_pool, eval_set=test_pool, use_best_model=True, verbose=False)
+    seconds = time.perf_counter() - start
+
+    preds = model.predict(test_pool)
+    return model, {
+        "mae": mean_absolute_error(y_test, preds),
+        "r2": r2_score(y_test, preds),
+        "seconds": seconds,
+    }
+
+
+# hyper-parameter search - each worker process loads the data once
+_worker_data = None
+
+
+def _init_worker(data_path, cache_dir):
+    global _worker_data
+    _worker_data = load_training_data(data_path, cache_dir)
+
+
+def _run_trial(trial_params):
+    X, y = _worker_data
+    model, metrics = train(X, y, trial_params)
+    return {**metrics, "params": trial_params, "trees": model.tree_count_}
+
+
+def hyperparameter_search(data_path=TRAINING_DATA_PATH, n_trials=8, jobs=2, iterations=None,
+                          search_space=SEARCH_SPACE, cache_dir=CACHE_DIR):
+    """
+    Randomized search, several trials at once in a process pool.
+
+    Each trial gets physical_cores() // jobs CatBoost threads so concurrent
+    trials don't oversubscribe the CPU.
+
+    OUTPUTS:
+    list of trial results (params, mae, r2, seconds, trees), best mae first
+    """
+    thread_budget = max(1, physical_cores() // jobs)
+    trials = []
+    for sampled in ParameterSampler(search_space, n_iter=n_trials, random_state=42):
+        trial_params = {**sampled, "thread_count": thread_budget}
+        if (iterations is not None):
+            trial_params["iterations"] = iterations
+        trials.append(trial_params)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(data_path, cache_dir)) as pool:
+        for result in pool.map(_run_trial, trials):
+            print(f"trial {len(results) + 1}/{len(trials)}: {result['seconds']:.1f}s "
+                  f"MAE {result['mae']:.0f} R² {result['r2']:.3f} {result['params']}")
+            results.append(result)
+
+    return sorted(results, key=lambda result: result["mae"])
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the CatBoost price model (CPU profile)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = subparsers.add_parser("train", help="fit once and save the model")
+    train_parser.add_argument("--data", default=TRAINING_DATA_PATH)
+    train_parser.add_argument("--iterations", type=int, default=params["iterations"])
+    train_parser.add_argument("--threads", type=int, default=CPU_PROFILE["thread_count"])
+    train_parser.add_argument("--output", default=os.path.join(MODEL_DIR, "model.cbm"))
+
+    search_parser = subparsers.add_parser("search", help="parallel randomized hyper-parameter search")
+    search_parser.add_argument("--data", default=TRAINING_DATA_PATH)
+    search_parser.add_argument("--trials", type=int, default=8)
+    search_parser.add_argument("--jobs", type=int, default=2, help="trials run at once")
+    search_parser.add_argument("--iterations", type=int, default=None)
+
+    args = parser.parse_args()
+
+    if (args.command == "train"):
+        X, y = load_training_data(args.data)
+        model, metrics = train(X, y, {"iterations": args.iterations, "thread_count": args.threads})
+        print("MAE:", metrics["mae"])
+        print("R²:", metrics["r2"])
+        print(f"Trained in {metrics['seconds']:.1f}s")
 
+        importances = model.get_feature_importance()
+        for name, score in sorted(zip(model.feature_names_, importances), key=lambda x: -x[1]):
+            print(f"{name}: {score:.2f}")
 
-preds = model.predict(test_pool)
+        model.save_model(args.output)
 
-mae = mean_absolute_error(y_test, preds)
-r2 = r2_score(y_test, preds)
-print("MAE:", mae)
-print("R²:", r2)
+    elif (args.command == "search"):
+        results = hyperparameter_search(args.data, n_trials=args.trials, jobs=args.jobs, iterations=args.iterations)
+        print("Best:", results[0]["params"], f"MAE {results[0]['mae']:.0f}")
 
-importances = model.get_feature_importance(train_pool)
-feature_names = X_train.columns
 
-for name, score in sorted(zip(feature_names, importances), key=lambda x: -x[1]):
-    print(f"{name}: {score:.2f}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
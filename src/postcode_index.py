@@ -0,0 +1,170 @@
+"""
+Local postcode district -> street -> postcodes index for the advanced search.
+
+Built once from the postcode/street columns of the cleaned shards and kept
+as a small parquet file. In memory, districts are a sorted array (prefix
+autocomplete by binary search) and (district, street) resolves to its
+postcodes with a dict lookup, so district+street searches and input checks
+need no network call. Street names are normalised ("St. John's Rd" ->
+"ST JOHNS ROAD") before the exact lookup; near misses are only suggested,
+with difflib.
+
+    python src/postcode_index.py    # build data/postcode_index.parquet from the shards
+"""
+
+import bisect
+import difflib
+import os
+import re
+from collections import Counter
+
+import pandas as pd
+
+from dataset import iter_batches, open_dataset
+
+POSTCODE_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "postcode_index.parquet")
+
+STREET_ABBREVIATIONS = {
+    "RD": "ROAD", "ST": "STREET", "AVE": "AVENUE", "AV": "AVENUE", "LN": "LANE", "DR": "DRIVE",
+    "CL": "CLOSE", "CT": "COURT", "CRES": "CRESCENT", "GDNS": "GARDENS", "GRN": "GREEN", "GR": "GROVE",
+    "PL": "PLACE", "SQ": "SQUARE", "TER": "TERRACE", "TERR": "TERRACE",
+}
+
+
+def normalise_district(district):
+    return "".join(district.split()).upper()
+
+
+def normalise_street(street):
+    """Upper case, no punctuation, single spaces, common suffix abbreviations spelt out."""
+    words = re.sub(r"[^A-Z0-9 ]", "", street.upper().replace("-", " ")).split()
+    if (words and words[-1] in STREET_ABBREVIATIONS):
+        words[-1] = STREET_ABBREVIATIONS[words[-1]]
+    return " ".join(words)
+
+
+class PostcodeIndex:
+    def __init__(self, frame):
+        """
+        INPUTS:
+        frame: DataFrame with district, street (normalised), postcode, borough, count columns
+        """
+        frame = frame.sort_values(["district", "street", "count"], ascending=[True, True, False])
+
+        self.districts = sorted(frame["district"].unique().tolist())
+        self.streets = {} # district -> sorted normalised street names
+        self.postcodes = {} # (district, street) -> postcodes, most transactions first
+        self.boroughs = {} # district -> most common local authority
+        for (district, street), group in frame.groupby(["district", "street"], sort=True, observed=True):
+            self.streets.setdefault(district, []).append(street)
+            self.postcodes[(district, street)] = group["postcode"].tolist()
+
+        boroughs = frame.dropna(subset=["borough"]).groupby(["district", "borough"], observed=True)["count"].sum()
+        for (district, borough), _ in boroughs.sort_values().items():
+            self.boroughs[district] = borough
+
+    def has_district(self, district):
+        return normalise_district(district) in self.streets
+
+    def complete_district(self, prefix, limit=10):
+        """Districts starting with prefix, in order (e.g. "SW1" -> SW1A, SW1E, ...)."""
+        prefix = normalise_district(prefix)
+        start = bisect.bisect_left(self.districts, prefix)
+        matches = []
+        for district in self.districts[start:start + limit]:
+            if (not district.startswith(prefix)):
+                break
+            matches.append(district)
+        return matches
+
+    def suggest_districts(self, district, limit=5):
+        """Closest known districts to a mistyped one."""
+        return difflib.get_close_matches(normalise_district(district), self.districts, n=limit, cutoff=0.6)
+
+    def complete_street(self, district, text, limit=10):
+        """
+        Streets in district for (partial, possibly mistyped) text: prefix
+        matches first, then close matches.
+        """
+        streets = self.streets.get(normalise_district(district), [])
+        text = normalise_street(text)
+        if (not text):
+            return streets[:limit]
+
+        start = bisect.bisect_left(streets, text)
+        matches = []
+        for street in streets[start:start + limit]:
+            if (not street.startswith(text)):
+                break
+            matches.append(street)
+
+        for street in difflib.get_close_matches(text, streets, n=limit, cutoff=0.6):
+            if (street not in matches):
+                matches.append(street)
+        return matches[:limit]
+
+    def resolve(self, district, street):
+        """
+        OUTPUTS:
+        (street, postcodes) for an exact match after normalising; (None, []) otherwise -
+        near misses are only offered as suggestions (complete_street), never searched
+        """
+        district = normalise_district(district)
+        street = normalise_street(street)
+
+        postcodes = self.postcodes.get((district, street))
+        if (postcodes):
+            return street, postcodes
+        return None, []
+
+
+def build_postcode_index(paths=None, output_path=POSTCODE_INDEX_PATH):
+    """
+    Stream the postcode/street (and local authority "district", when the
+    shards have it) columns of the shards into output_path.
+
+    OUTPUTS:
+    PostcodeIndex
+    """
+    columns = ["postcode", "street"]
+    if ("district" in open_dataset(paths).schema.names):
+        columns.append("district")
+
+    counts = Counter()
+    for batch in iter_batches(paths, columns=columns):
+        batch = batch.dropna(subset=["postcode", "street"])
+        boroughs = batch["district"].tolist() if "district" in batch else [None] * len(batch)
+        counts.update(zip(batch["postcode"].astype(str), batch["street"].astype(str), boroughs))
+
+    rows = []
+    for (postcode, street, borough), count in counts.items():
+        street = normalise_street(street)
+        if (not street or " " not in postcode.strip()):
+            continue
+        borough = borough.title() if isinstance(borough, str) else None
+        rows.append((normalise_district(postcode.split()[0]), street, postcode.strip().upper(), borough, count))
+
+    frame = pd.DataFrame(rows, columns=["district", "street", "postcode", "borough", "count"])
+    frame = frame.groupby(["district", "street", "postcode"], as_index=False).agg(
+        borough=("borough", "first"), count=("count", "sum")
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    frame.to_parquet(output_path, index=False)
+    return PostcodeIndex(frame)
+
+
+_index = None
+
+
+def load_postcode_index(path=POSTCODE_INDEX_PATH):
+    """The index from path, loaded once - None if it hasn't been built."""
+    global _index
+    if (_index is None and os.path.exists(path)):
+        _index = PostcodeIndex(pd.read_parquet(path))
+    return _index
+
+
+if __name__ == "__main__":
+    index = build_postcode_index()
+    print(f"Indexed {len(index.postcodes)} streets in {len(index.districts)} districts -> {POSTCODE_INDEX_PATH}")
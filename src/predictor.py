@@ -0,0 +1,149 @@
+"""
+CatBoost price model inference.
+
+Each .cbm file is deserialised once per process and kept in memory, so
+searches and page reruns only pay for predict(), never for loading.
+"""
+
+import os
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from catboost import CatBoostRegressor
+
+from feature_schema import MISSING_CATEGORY
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models")
+
+_load_lock = threading.Lock()
+
+# per-model predict latency across predict_ensemble calls - model name -> {"calls", "seconds", "max_seconds"}
+_latency = {}
+_latency_lock = threading.Lock()
+
+
+def model_path(model_name):
+    """models/<model_name>, accepting an explicit path too."""
+    if (os.path.sep in model_name or "/" in model_name):
+        return model_name
+    return os.path.join(MODEL_DIR, model_name)
+
+
+@lru_cache(maxsize=None)
+def _load(path):
+    model = CatBoostRegressor()
+    model.load_model(path)
+    return model
+
+
+def load_model(model_name):
+    """
+    INPUTS:
+    model_name: str (e.g. "prototype_3.cbm", or a path)
+
+    OUTPUTS:
+    CatBoostRegressor - the same instance for every call in this process
+    """
+    # lock so concurrent first calls (Streamlit threads) only load it once
+    with _load_lock:
+        return _load(os.path.abspath(model_path(model_name)))
+
+
+def prepare_features(model, features):
+    """
+    Line a feature frame up with what the model was trained on: its column
+    order, categoricals as strings with no NaN. Missing columns are NaN.
+    """
+    names = model.feature_names_
+    X = features.reindex(columns=names)
+
+    for index in model.get_cat_feature_indices():
+        column = names[index]
+        X[column] = X[column].astype(object).where(X[column].notna(), MISSING_CATEGORY).astype(str)
+
+    return X
+
+
+def predict(features, model_name):
+    """
+    INPUTS:
+    features: DataFrame (translator.translate_many schema)
+    model_name: str
+
+    OUTPUTS:
+    numpy array of predicted prices, one per row
+    """
+    if (features is None or len(features) == 0):
+        return np.array([])
+
+    model = load_model(model_name)
+    return model.predict(prepare_features(model, features))
+
+
+def predict_ensemble(features, model_names, thread_count=-1):
+    """
+    Score one feature batch through several models.
+
+    INPUTS:
+    features: DataFrame (translator.translate_many schema)
+    model_names: list of str (e.g. the three prototypes)
+    thread_count: int (CatBoost predict threads per model, -1 for all cores)
+
+    OUTPUTS:
+    {
+        "mean": array, "std": array,  # per row, across models
+        "low": array, "high": array,  # mean -/+ std, a cheap uncertainty band
+        "predictions": {model_name: array},
+        "latency": {model_name: seconds}  # per-model predict time, to spot slow prototypes
+    }
+    """
+    predictions = {}
+    latency = {}
+
+    for model_name in model_names:
+        model = load_model(model_name)
+        X = prepare_features(model, features)
+
+        start = time.perf_counter()
+        predictions[model_name] = model.predict(X, thread_count=thread_count)
+        latency[model_name] = time.perf_counter() - start
+
+    record_latency(latency)
+
+    stacked = np.vstack(list(predictions.values())) if predictions else np.empty((0, len(features)))
+    mean = stacked.mean(axis=0)
+    std = stacked.std(axis=0)
+
+    return {
+        "mean": mean,
+        "std": std,
+        "low": mean - std,
+        "high": mean + std,
+        "predictions": predictions,
+        "latency": latency,
+    }
+
+
+def record_latency(latency):
+    """Add one predict_ensemble call's {model_name: seconds} to the process-wide latency stats."""
+    with _latency_lock:
+        for model_name, seconds in latency.items():
+            entry = _latency.setdefault(model_name, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+
+def get_latency_stats():
+    """
+    OUTPUTS:
+    {model_name: {"calls", "seconds", "max_seconds", "mean_seconds"}} - the slow ensemble members stand out
+    """
+    with _latency_lock:
+        return {
+            model_name: {**entry, "mean_seconds": entry["seconds"] / entry["calls"]}
+            for model_name, entry in _latency.items()
+        }
@@ -0,0 +1,113 @@
+"""
+Background prefetch of details-page data for the cards on a results page.
+
+Each Streamlit session gets one Prefetcher. start() warms the shared caches
+the details page reads (historical valuation frames, translator features)
+for the top cards on a small thread pool, and cancels whatever the previous
+search still had queued - so "View Details" usually opens on warm caches.
+With the features cached, each card's future price is computed too (the
+search itself skips postcodes it would have to fetch for); the workers only
+return it, and apply_results() writes it onto the card from the script
+thread.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from main import add_future_prices
+from scansan_client import get_historical_valuation_frame
+from translator import get_postcode_index
+
+
+def prefetch_property(prop):
+    """
+    Warm every cache the details page reads for one property card.
+
+    OUTPUTS:
+    the card's future price (float), None if it has one already or it can't be predicted
+    """
+    postcode = prop.get("postcode")
+    if (not postcode):
+        return None
+    get_historical_valuation_frame(area_code=postcode, property_address=prop.get("address"))
+    get_postcode_index(postcode)
+
+    if (prop.get("future_price") is not None):
+        return None
+    # priced on a copy - the card itself belongs to the script thread
+    priced = add_future_prices([{"postcode": postcode, "address": prop.get("address")}], cached_only=True)
+    return priced[0].get("future_price")
+
+
+class Prefetcher:
+    def __init__(self, max_workers=2):
+        """
+        INPUTS:
+        max_workers: int (concurrent prefetches for this session)
+        """
+        self.max_workers = max_workers
+        self._pools = []
+        self._jobs = [] # (card, future)
+        self._lock = threading.Lock()
+
+    def start(self, properties, top_n=6, keep=False):
+        """
+        Queue the first top_n properties - after cancelling the previous
+        prefetch, unless keep=True.
+
+        OUTPUTS:
+        list of futures (one per queued property)
+        """
+        properties = [prop for prop in properties[:top_n] if prop.get("postcode")]
+
+        with self._lock:
+            if (not keep):
+                self._cancel()
+            if (not properties):
+                return []
+
+            pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prefetch")
+            futures = [pool.submit(prefetch_property, prop) for prop in properties]
+            # threads exit once the queue is done (or cancelled), so idle sessions hold none
+            pool.shutdown(wait=False)
+            self._pools.append(pool)
+            self._jobs.extend(zip(properties, futures))
+            return futures
+
+    def apply_results(self):
+        """
+        Write finished prefetches' future prices onto their cards. Call it from
+        the script thread (it is the one that renders the cards).
+
+        OUTPUTS:
+        int (cards updated)
+        """
+        with self._lock:
+            finished = [(prop, future) for prop, future in self._jobs if future.done()]
+            self._jobs = [(prop, future) for prop, future in self._jobs if not future.done()]
+
+        updated = 0
+        for prop, future in finished:
+            if (future.cancelled() or future.exception() is not None):
+                continue
+            price = future.result()
+            if (price is not None and prop.get("future_price") is None):
+                prop["future_price"] = price
+                updated += 1
+        return updated
+
+    def cancel(self):
+        """Drop queued prefetches (ones already running finish, but their results are dropped too)."""
+        with self._lock:
+            self._cancel()
+
+    def pending(self):
+        with self._lock:
+            return sum(1 for prop, future in self._jobs if not future.done())
+
+    # caller holds the lock
+    def _cancel(self):
+        for pool in self._pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pools = []
+        self._jobs = []
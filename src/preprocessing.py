@@ -0,0 +1,96 @@
+"""
+Reusable preprocessing stage for model training.
+
+Dates are parsed once, vectorised, into year/month/quarter features and the
+result is cached as a parquet artifact keyed by the input file's hash and
+PREPROCESS_VERSION, so retraining and hyper-parameter runs reuse it.
+"""
+
+import hashlib
+import os
+
+import pandas as pd
+
+from dataset import read_compact, TRAINING_DATA_PATH
+from feature_schema import CATEGORICAL_FEATURES, MISSING_CATEGORY, NUMERIC_DTYPES
+
+# bump whenever preprocess() changes what it produces
+PREPROCESS_VERSION = 2
+CACHE_DIR = "./data/cache"
+
+
+def add_date_features(df, date_column="dateoftransfer"):
+    """
+    Replace date_column with year, month and quarter columns.
+
+    The column is converted to datetime64 in one vectorised pass (ISO strings
+    or dates); unparseable dates become NaT and their rows are dropped.
+    """
+    dates = pd.to_datetime(df[date_column], errors="coerce", format="ISO8601")
+    df = df.loc[dates.notna()].drop(columns=[date_column])
+    dates = dates[dates.notna()]
+
+    df["year"] = dates.dt.year.astype(NUMERIC_DTYPES["year"])
+    df["month"] = dates.dt.month.astype(NUMERIC_DTYPES["month"])
+    df["quarter"] = dates.dt.quarter.astype(NUMERIC_DTYPES["quarter"])
+    return df
+
+
+def fill_categoricals(df):
+    """Replace missing CATEGORICAL_FEATURES values with MISSING_CATEGORY, keeping category dtype."""
+    for column in CATEGORICAL_FEATURES:
+        if (column not in df.columns):
+            continue
+        if (isinstance(df[column].dtype, pd.CategoricalDtype)):
+            if (MISSING_CATEGORY not in df[column].cat.categories):
+                df[column] = df[column].cat.add_categories([MISSING_CATEGORY])
+            df[column] = df[column].fillna(MISSING_CATEGORY)
+        else:
+            df[column] = df[column].astype(object).where(df[column].notna(), MISSING_CATEGORY).astype(str)
+    return df
+
+
+def preprocess(df):
+    """Training frame -> model-ready frame (features + price)."""
+    return fill_categoricals(add_date_features(df))
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """sha256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def artifact_path(path, cache_dir=CACHE_DIR):
+    """Where the preprocessed artifact for this input file (and version) lives."""
+    name = f"preprocessed_{file_hash(path)[:16]}_v{PREPROCESS_VERSION}.parquet"
+    return os.path.join(cache_dir, name)
+
+
+def load_preprocessed(path=TRAINING_DATA_PATH, cache_dir=CACHE_DIR, refresh=False):
+    """
+    INPUTS:
+    path: str (raw training parquet)
+    cache_dir: str (where artifacts are kept)
+    refresh: bool (ignore and overwrite an existing artifact)
+
+    OUTPUTS:
+    preprocessed DataFrame, in the compact dtypes
+    """
+    cached = artifact_path(path, cache_dir)
+
+    if (not refresh and os.path.exists(cached)):
+        return read_compact(cached)
+
+    df = preprocess(read_compact(path))
+
+    # write then rename, so an interrupted run never leaves a half artifact
+    os.makedirs(cache_dir, exist_ok=True)
+    partial = cached + ".partial"
+    df.to_parquet(partial, index=False)
+    os.replace(partial, cached)
+
+    return df
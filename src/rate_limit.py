@@ -0,0 +1,117 @@
+"""
+Client-side token-bucket rate limiting, one bucket per endpoint.
+
+Each bucket refills at `rate` tokens per second up to `burst`; acquire()
+blocks until a token is free. pause() empties a bucket until a given time,
+so when the API answers 429 every thread calling that endpoint backs off,
+not just the one that got the 429. A RateLimiter with scale 0 hands out
+tokens without waiting - limiting is off, only the counters run.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        """
+        INPUTS:
+        rate: float (tokens added per second)
+        burst: int (bucket size - requests allowed back to back)
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token if one is free -> 0, else seconds until one will be."""
+        with self._lock:
+            now = time.monotonic()
+            if (now < self._paused_until):
+                return self._paused_until - now
+
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if (self._tokens >= 1):
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a token is taken -> seconds spent waiting."""
+        waited = 0.0
+        while True:
+            delay = self._reserve()
+            if (delay <= 0):
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds):
+        """Hand out no tokens for `seconds` (e.g. a 429's Retry-After), then refill from empty."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            if (until > self._paused_until):
+                self._paused_until = until
+                self._updated = until
+                self._tokens = 0
+
+
+class RateLimiter:
+    def __init__(self, limits=None, default=(5, 10), scale=1.0):
+        """
+        INPUTS:
+        limits: dict (endpoint key, e.g. a url template -> (rate, burst))
+        default: (rate, burst) for endpoints not in limits
+        scale: float (multiplies every rate and burst - 0 turns limiting off)
+        """
+        self.limits = limits or {}
+        self.default = default
+        self.scale = scale
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._counters = {"served": 0, "throttled": 0, "failed": 0, "retried": 0, "delayed": 0, "wait_seconds": 0.0}
+
+    def bucket(self, key):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if (bucket is None):
+                rate, burst = self.limits.get(key, self.default)
+                bucket = self._buckets[key] = TokenBucket(rate * self.scale, max(1, round(burst * self.scale)))
+            return bucket
+
+    def acquire(self, key):
+        if (self.scale <= 0):
+            return 0.0
+        waited = self.bucket(key).acquire()
+        if (waited > 0):
+            self.record("delayed", wait_seconds=waited)
+        return waited
+
+    def record_response(self, status_code):
+        """Count one API response: 2xx served, 429 throttled, anything else failed."""
+        if (200 <= status_code < 300):
+            self.record("served")
+        elif (status_code == 429):
+            self.record("throttled")
+        else:
+            self.record("failed")
+
+    def record(self, counter, wait_seconds=0.0):
+        with self._lock:
+            self._counters[counter] += 1
+            self._counters["wait_seconds"] += wait_seconds
+
+    def stats(self):
+        """
+        served: 2xx responses from the API
+        throttled: 429s received from the API
+        failed: any other non-2xx response (5xx, 404, ...)
+        retried: requests re-sent after a 429/5xx
+        delayed / wait_seconds: requests held back by the local buckets, and for how long
+        """
+        with self._lock:
+            return dict(self._counters)
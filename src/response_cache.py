@@ -0,0 +1,203 @@
+"""
+TTL + LRU cache for API responses, with an optional SQLite tier.
+
+Entries are keyed by the endpoint's URL template plus its params, expire
+after a per-template TTL and are evicted least-recently-used once the
+in-memory size budget is exceeded. When a db_path is given, entries are
+also written to SQLite so they survive process restarts. The SQLite tier
+is kept bounded too: expired rows are deleted when a lookup finds them and
+in periodic sweeps, which also trim it to max_rows, least recently used
+first.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    def __init__(self, max_bytes, ttls=None, default_ttl=3600, db_path=None, max_rows=100_000, sweep_every=100):
+        """
+        INPUTS:
+        max_bytes: int (in-memory budget, measured as response body / JSON-encoded size)
+        ttls: dict (url template -> seconds)
+        default_ttl: int (seconds, for templates not in ttls)
+        db_path: str | None (SQLite file for the persistent tier, None to disable)
+        max_rows: int (rows kept in the SQLite tier after each sweep)
+        sweep_every: int (writes between sweeps of the SQLite tier)
+        """
+        self.max_bytes = max_bytes
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.max_rows = max_rows
+        self.sweep_every = sweep_every
+        self._writes = 0
+
+        self._entries = OrderedDict() # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "disk_hits": 0, "evictions": 0, "disk_evictions": 0}
+
+        self._db = None
+        if (db_path is not None):
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, payload TEXT NOT NULL, used_at REAL NOT NULL DEFAULT 0)"
+            )
+            # files written before used_at existed
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(responses)")]
+            if ("used_at" not in columns):
+                self._db.execute("ALTER TABLE responses ADD COLUMN used_at REAL NOT NULL DEFAULT 0")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)")
+            self._sweep(time.time())
+
+    @staticmethod
+    def make_key(url_template, params):
+        """Stable key for (url template, params) - param order doesn't matter."""
+        return json.dumps([url_template, sorted((params or {}).items())], default=str)
+
+    def get(self, url_template, params):
+        """
+        OUTPUTS:
+        (True, value) on a hit, (False, None) on a miss
+        Cached values are shared between callers - treat them as read-only.
+        """
+        key = self.make_key(url_template, params)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if (entry is not None):
+                expires_at, size, value = entry
+                if (expires_at > now):
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return True, value
+                self._remove(key)
+
+            if (self._db is not None):
+                row = self._db.execute(
+                    "SELECT expires_at, payload FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if (row is not None and row[0] > now):
+                    self._db.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    value = json.loads(row[1])
+                    self._insert(key, row[0], len(row[1]), value)
+                    self._counters["hits"] += 1
+                    self._counters["disk_hits"] += 1
+                    return True, value
+                if (row is not None):
+                    # expired - nothing will ever read it again
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self._counters["misses"] += 1
+            return False, None
+
+    def contains(self, url_template, params):
+        """True if a fresh entry exists (memory or disk) - no counters, no LRU update."""
+        key = self.make_key(url_template, params)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if (entry is not None and entry[0] > now):
+                return True
+            if (self._db is not None):
+                row = self._db.execute("SELECT expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+                return row is not None and row[0] > now
+            return False
+
+    def set(self, url_template, params, value, raw=None):
+        """
+        Store a response under (url template, params) with the template's TTL.
+
+        INPUTS:
+        raw: bytes | None (the response body value was decoded from - it is
+            used for the size and the SQLite row, so value isn't re-encoded)
+        """
+        key = self.make_key(url_template, params)
+        if (raw is not None):
+            size = len(raw)
+            payload = raw.decode("utf-8") if (self._db is not None) else None
+        else:
+            payload = json.dumps(value, default=str)
+            size = len(payload)
+        now = time.time()
+        expires_at = now + self.ttls.get(url_template, self.default_ttl)
+
+        with self._lock:
+            self._insert(key, expires_at, size, value)
+
+            if (self._db is not None):
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, expires_at, payload, used_at) VALUES (?, ?, ?, ?)",
+                    (key, expires_at, payload, now)
+                )
+                self._writes += 1
+                if (self._writes % self.sweep_every == 0):
+                    self._sweep(now)
+                self._db.commit()
+
+    def invalidate(self, url_template, params):
+        """Drop one entry, in memory and on disk (the next get is a miss)."""
+        key = self.make_key(url_template, params)
+        with self._lock:
+            if (key in self._entries):
+                self._remove(key)
+            if (self._db is not None):
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+
+    def clear(self):
+        """Drop every entry, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if (self._db is not None):
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self):
+        """Hit/miss counters plus current size."""
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    # internal helpers - caller holds the lock
+    def _insert(self, key, expires_at, size, value):
+        if (key in self._entries):
+            self._remove(key)
+
+        # too big to ever fit - don't flush everything else for it
+        if (size > self.max_bytes):
+            return
+
+        self._entries[key] = (expires_at, size, value)
+        self._bytes += size
+
+        while (self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._counters["evictions"] += 1
+
+    def _sweep(self, now):
+        """Delete expired rows, then trim the SQLite tier to max_rows (least recently used first)."""
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        trimmed = self._db.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY used_at DESC LIMIT -1 OFFSET ?)", (self.max_rows,)
+        )
+        self._counters["disk_evictions"] += trimmed.rowcount
+        self._db.commit()
+
+    def _remove(self, key):
+        expires_at, size, value = self._entries.pop(key)
+        self._bytes -= size
@@ -1,21 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
 import requests as rq
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from config import SEARCH_URL, SUMMARY_URL, SALE_HISTORY_URL, CURRENT_VALUATIONS_URL, HISTORICAL_VALUATIONS_URL, HEADERS
+from config import VALUATION_MAX_WORKERS, SEARCH_DEADLINE_SECONDS
+from config import CACHE_TTLS, CACHE_MAX_BYTES, CACHE_DB_PATH, CACHE_DB_MAX_ROWS, HISTORICAL_POSTCODE_CACHE_SIZE
+from http_client import http_get, get_request_stats, response_json
+from response_cache import ResponseCache
+from single_flight import SingleFlight
+from valuation_store import PostcodeValuations
 
-# helper method - TODO: UPDATE
+# shared by every getter (and every Streamlit session in this process)
+response_cache = ResponseCache(max_bytes=CACHE_MAX_BYTES, ttls=CACHE_TTLS, db_path=CACHE_DB_PATH, max_rows=CACHE_DB_MAX_ROWS)
+
+# identical requests already in flight (from any session's thread) are joined, not repeated
+in_flight = SingleFlight()
+
+# parsed historical valuations, shared by every session - postcode -> (expires_at, PostcodeValuations)
+# entries expire with the response cache's TTL for the endpoint, then are fetched again
+historical_store = OrderedDict()
+historical_store_lock = threading.Lock()
+
+# helper method
 def check_http_status(response):
+    """True for a 2xx response; prints why not otherwise (http_get has already retried 429/5xx)"""
+    if (response.status_code == 429):
+        print(f"Error: rate limited by the API (429) after retries: {response.url}")
+        return False
     try:
         response.raise_for_status()
         print(f"Success!")
         return True
-    except rq.exceptions.RequestException as e:
-        print(f"Error: {e}")
-        return False
-    # error 429
-    except rq.exceptions.TooManyRedirects as e:
+    except rq.exceptions.HTTPError as e:
         print(f"Error: {e}")
         return False
 
+def fetch_json(url_template, url, params, headers=HEADERS, cache_params=None):
+    """
+    INPUTS:
+    url_template: str (e.g. SUMMARY_URL - the cache key and TTL come from it)
+    url: str (url_template with the area code filled in)
+    params: dict
+    headers: dict
+    cache_params: dict (identifies the response in the cache when params
+        don't, e.g. the area code is only in the path - defaults to params)
+
+    OUTPUTS:
+    data: JSON (from the cache when fresh)
+    None (if the request failed or the body isn't JSON - failures are not cached)
+    """
+    if (cache_params is None):
+        cache_params = params
+
+    hit, data = response_cache.get(url_template, cache_params)
+    if (hit):
+        return data
+
+    def request():
+        response = http_get(url=url, params=params, headers=headers, endpoint=url_template)
+
+        # check HTTP status before parsing JSON
+        if (not check_http_status(response=response)):
+            return None
+
+        try:
+            data = response_json(response)
+        except ValueError as e:
+            print(f"Error: response is not JSON ({e}): {url}")
+            return None
+
+        response_cache.set(url_template, cache_params, data, raw=response.content)
+        return data
+
+    # concurrent misses for the same key share one request
+    return in_flight.do(ResponseCache.make_key(url, cache_params), request)
+
+def is_cached(url_template, params):
+    """True if fetch_json would answer (url_template, params) from the cache, without a request."""
+    return response_cache.contains(url_template, params)
+
+def get_cache_stats():
+    """Hit/miss counters for the Scansan response cache, plus coalesced requests."""
+    return {**response_cache.stats(), **in_flight.stats()}
+
+def get_rate_limit_stats():
+    """Served vs throttled (429) requests, retries and time spent waiting on the rate limiter."""
+    return get_request_stats()
+
 # route methods for API
 def get_search(area_name=None, gbr_district=None, gbr_street=None):
     """
@@ -44,13 +117,7 @@ def get_search(area_name=None, gbr_district=None, gbr_street=None):
     if (params is None):
         return None
 
-    response = rq.get(url=SEARCH_URL, params=params, headers=HEADERS)
-
-    # check HTTP status before parsing JSON
-    if (not check_http_status(response=response)):
-        return None
-        
-    return response.json()
+    return fetch_json(SEARCH_URL, SEARCH_URL, params)
 
 # summary
 def get_summary(area_code=None, area_code_district=None):
@@ -84,12 +151,7 @@ def get_summary(area_code=None, area_code_district=None):
     if (area_code_district is not None):
         params["area_code_district"] = area_code_district
 
-    response = rq.get(url=url, params=params, headers=HEADERS)
-
-    if (not check_http_status(response=response)):
-        return None
-
-    return response.json()
+    return fetch_json(SUMMARY_URL, url, params)
 
 # history
 def get_sale_history(area_code_postal=None, area_code=None):
@@ -118,12 +180,7 @@ def get_sale_history(area_code_postal=None, area_code=None):
     elif (area_code is not None):
         params["area_code"] = area_code
     
-    response = rq.get(url=url, params=params, headers=HEADERS)
-
-    if (not check_http_status(response=response)):
-        return None
-    
-    return response.json()
+    return fetch_json(SALE_HISTORY_URL, url, params)
 
 # helper functions for nirmal
 def get_current_valuations(area_code_postal=None, area_code=None):
@@ -148,12 +205,54 @@ def get_current_valuations(area_code_postal=None, area_code=None):
     elif (area_code is not None):
         params["area_code"] = area_code
     
-    response = rq.get(url=url, params=params, headers=HEADERS)
+    return fetch_json(CURRENT_VALUATIONS_URL, url, params)
 
-    if (not check_http_status(response=response)):
-        return None
+def iter_current_valuations(area_codes, max_workers=VALUATION_MAX_WORKERS, deadline=SEARCH_DEADLINE_SECONDS):
+    """
+    INPUTS:
+    area_codes: list of str (e.g. ["SW1A 2AA", "SW1A 2AB"])
+    max_workers: int (max concurrent calls for this fan-out)
+    deadline: float (seconds for the whole fan-out, None for no limit)
 
-    return response.json()
+    OUTPUTS:
+    generator of (position in area_codes, JSON) as each call succeeds, fastest first
+    (failed calls, and calls still running at the deadline, are skipped)
+    """
+
+    if (not area_codes):
+        return
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(area_codes))))
+    futures = {pool.submit(get_current_valuations, area_code=area_code): i for i, area_code in enumerate(area_codes)}
+
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            if (future.exception() is None):
+                yield futures[future], future.result()
+    except FuturesTimeoutError:
+        pass
+    finally:
+        # don't block the search on stragglers past the deadline (or an abandoned generator)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def get_current_valuations_many(area_codes, max_workers=VALUATION_MAX_WORKERS, deadline=SEARCH_DEADLINE_SECONDS):
+    """
+    INPUTS:
+    area_codes: list of str (e.g. ["SW1A 2AA", "SW1A 2AB"])
+    max_workers: int (max concurrent calls for this fan-out)
+    deadline: float (seconds for the whole fan-out, None for no limit)
+
+    OUTPUTS:
+    list of JSON | None, in the same order as area_codes
+    (None where the call failed or missed the deadline)
+    """
+
+    # wait for the slowest call, not the sum of them all
+    results = [None] * len(area_codes or [])
+    for i, valuations in iter_current_valuations(area_codes, max_workers=max_workers, deadline=deadline):
+        results[i] = valuations
+
+    return results
 
 def get_historical_valuations(area_code_postal=None, area_code=None):
     """
@@ -178,50 +277,67 @@ def get_historical_valuations(area_code_postal=None, area_code=None):
     elif (area_code is not None):
         params["area_code"] = area_code
 
-    response = rq.get(url=url, params=params, headers=HEADERS)
+    return fetch_json(HISTORICAL_VALUATIONS_URL, url, params)
+
+def get_postcode_valuations(area_code_postal=None, area_code=None, refresh=False):
+    """
+    Historical valuations for every property in a postcode, fetched and
+    parsed once and shared by every session (see valuation_store) until the
+    endpoint's response cache TTL runs out.
+
+    OUTPUTS:
+    PostcodeValuations | None (if the request failed - failures are not stored)
+    """
+    postcode = area_code if (area_code is not None) else area_code_postal
 
-    if (not check_http_status(response)):
+    if (refresh):
+        invalidate_historical_valuations(area_code_postal=area_code_postal, area_code=area_code)
+    else:
+        with historical_store_lock:
+            entry = historical_store.get(postcode)
+            if (entry is not None and entry[0] > time.time()):
+                historical_store.move_to_end(postcode)
+                return entry[1]
+            # expired - its response has expired from the cache too, so this refetches
+            historical_store.pop(postcode, None)
+
+    resp = get_historical_valuations(area_code_postal=area_code_postal, area_code=area_code)
+    if not resp:
         return None
-    
-    return response.json()
 
-def get_historical_valuation_frame(area_code_postal=None, area_code=None, property_address=None):
+    valuations = PostcodeValuations.from_response(resp)
+    expires_at = time.time() + CACHE_TTLS.get(HISTORICAL_VALUATIONS_URL, response_cache.default_ttl)
+
+    with historical_store_lock:
+        historical_store[postcode] = (expires_at, valuations)
+        historical_store.move_to_end(postcode)
+        while (len(historical_store) > HISTORICAL_POSTCODE_CACHE_SIZE):
+            historical_store.popitem(last=False)
+
+    return valuations
+
+def get_historical_valuation_frame(area_code_postal=None, area_code=None, property_address=None, refresh=False):
     """
     Uses get_historical_valuations() and returns a DataFrame with columns:
     ['date', 'price'] (ready for your plot function)
+
+    The postcode is fetched once for all its properties - the frame is a
+    read-only view onto the shared store. refresh=True drops the postcode's
+    cached response and store and fetches again.
     """
-    resp = get_historical_valuations(area_code_postal=area_code_postal, area_code=area_code)
-    if not resp:
+    valuations = get_postcode_valuations(area_code_postal=area_code_postal, area_code=area_code, refresh=refresh)
+    if valuations is None:
         return pd.DataFrame(columns=["date", "price"])
 
-    # Many APIs wrap results in {"data": [...]}
-    if isinstance(resp, dict) and isinstance(resp.get("data"), list) and resp["data"]:
-        props = resp["data"]
-    else:
-        # Or return a single property object
-        props = [resp] if isinstance(resp, dict) else []
-
-    if not props:
-        return pd.DataFrame(columns=["date", "price"])
+    return valuations.frame(property_address)
 
-    # If multiple properties returned, select one
-    chosen = None
-    if property_address:
-        for p in props:
-            addr = p.get("property_address") or p.get("address")
-            if addr == property_address:
-                chosen = p
-                break
-    if chosen is None:
-        chosen = props[0]
-
-    vals = chosen.get("valuations") or []
-    df = pd.DataFrame([{"date": v.get("date"), "price": v.get("valuation")} for v in vals])
-
-    if df.empty:
-        return pd.DataFrame(columns=["date", "price"])
+def invalidate_historical_valuations(area_code_postal=None, area_code=None):
+    """Forget a postcode's cached historical valuations (response and parsed store)."""
+    postcode = area_code if (area_code is not None) else area_code_postal
+    if (area_code_postal is not None):
+        response_cache.invalidate(HISTORICAL_VALUATIONS_URL, {"area_code_postal": area_code_postal})
+    if (area_code is not None):
+        response_cache.invalidate(HISTORICAL_VALUATIONS_URL, {"area_code": area_code})
 
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df["price"] = pd.to_numeric(df["price"], errors="coerce")
-    df = df.dropna().sort_values("date")
-    return df[["date", "price"]]
+    with historical_store_lock:
+        historical_store.pop(postcode, None)
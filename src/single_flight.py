@@ -0,0 +1,65 @@
+"""
+Single-flight: concurrent calls for the same key share one execution.
+
+The first caller for a key (the leader) runs the function; callers that
+arrive while it is in flight wait for it and get the same result, or the
+same exception. Nothing is remembered afterwards - caching is the job of
+ResponseCache - so the next call after the flight lands runs again.
+"""
+
+import threading
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights = {} # key -> _Flight in progress
+        self._lock = threading.Lock()
+        self._counters = {"executed": 0, "coalesced": 0}
+
+    def do(self, key, function):
+        """
+        INPUTS:
+        key: hashable (callers with equal keys share a flight)
+        function: callable with no arguments
+
+        OUTPUTS:
+        function's result - shared between coalesced callers, treat it as read-only
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if (leader):
+                flight = self._flights[key] = _Flight()
+                self._counters["executed"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if (not leader):
+            flight.done.wait()
+            if (flight.error is not None):
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = function()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+        return flight.result
+
+    def stats(self):
+        """executed (leader calls), coalesced (callers that shared a flight), in_flight"""
+        with self._lock:
+            return {**self._counters, "in_flight": len(self._flights)}
@@ -0,0 +1,65 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from area_index import AreaIndex
+
+
+def parsed_for(name):
+    return {"area_codes": [f"{name[:2].upper()}1 1AA"], "boroughs": [name], "wards": []}
+
+
+def test_area_index_persists_and_normalises_names(tmp_path):
+    """Entries survive a reopen and match regardless of case/spacing"""
+    path = str(tmp_path / "areas.sqlite")
+    AreaIndex(path).put("Brixton", parsed_for("Brixton"))
+
+    index = AreaIndex(path)
+    assert index.get("  brixton ") == parsed_for("Brixton")
+    assert index.get("Camden") is None
+    assert index.names() == ["Brixton"]
+
+
+def test_area_index_refreshes_stale_entries_in_background():
+    """A stale entry is served immediately and replaced once the refresh lands"""
+    calls = []
+
+    def resolve(name):
+        calls.append(name)
+        time.sleep(0.1)
+        return {"area_codes": ["NEW 1AA"], "boroughs": [], "wards": []}
+
+    index = AreaIndex(max_age=0, resolve=resolve)
+    index.put("Camden", parsed_for("Camden"))
+    time.sleep(0.01)
+
+    # both calls see the old entry; only one refresh is queued
+    assert index.get("Camden") == parsed_for("Camden")
+    assert index.get("Camden") == parsed_for("Camden")
+
+    time.sleep(0.3)
+    index.max_age = 3600
+    assert index.get("Camden")["area_codes"] == ["NEW 1AA"]
+    assert calls == ["Camden"]
+
+
+def test_only_dropdown_and_detected_areas_are_indexed(monkeypatch):
+    """Free-text queries resolve through the API but aren't persisted; UK_AREAS and detected areas are"""
+    import main
+    from config import UK_AREAS
+
+    index = AreaIndex(resolve=parsed_for)
+    assert index._refresher is None # no thread until something needs refreshing
+    monkeypatch.setattr(main, "_area_index", index)
+    monkeypatch.setattr(main, "resolve_area", parsed_for)
+
+    assert main.resolve_search("", query="my flat near the park")["boroughs"] == ["my flat near the park"]
+    assert "my flat near the park" not in index
+
+    main.resolve_search(UK_AREAS[0])
+    assert UK_AREAS[0] in index
+
+    main.index_detected_area("Lambeth")
+    time.sleep(0.2)
+    assert index.get("Lambeth") == parsed_for("Lambeth")
@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+import dataset
+
+
+def write_shards(directory, parts=3, rows=10):
+    """Write small shards shaped like cleaned_property_data"""
+    for part in range(parts):
+        df = pd.DataFrame({
+            "postcode": [("SW1A 2AA" if i % 2 else "NG8 1BB") for i in range(rows)],
+            "price": [part * 1000 + i for i in range(rows)],
+            "dateoftransfer": [f"{1995 + part * 10 + (i % 5)}-06-30" for i in range(rows)],
+        })
+        df.to_parquet(os.path.join(directory, f"cleaned_property_data_part_{part * 5}.parquet"), row_group_size=4)
+
+
+def test_list_shards_orders_by_part_number(tmp_path):
+    write_shards(str(tmp_path))
+    names = [os.path.basename(path) for path in dataset.list_shards(str(tmp_path))]
+    assert names == [
+        "cleaned_property_data_part_0.parquet",
+        "cleaned_property_data_part_5.parquet",
+        "cleaned_property_data_part_10.parquet",
+    ]
+
+
+def test_iter_batches_is_bounded_and_projected(tmp_path):
+    write_shards(str(tmp_path))
+    paths = dataset.list_shards(str(tmp_path))
+
+    batches = list(dataset.iter_batches(paths, columns=["postcode", "price"], batch_size=3))
+
+    assert all(len(batch) <= 3 for batch in batches)
+    assert all(list(batch.columns) == ["postcode", "price"] for batch in batches)
+    assert sum(len(batch) for batch in batches) == 30
+
+
+def test_iter_batches_filters_postcode_and_year(tmp_path):
+    write_shards(str(tmp_path))
+    paths = dataset.list_shards(str(tmp_path))
+
+    df = pd.concat(dataset.iter_batches(paths, postcode_prefixes=["sw1a"], years=(2005, 2009)))
+
+    assert len(df) == 5
+    assert df["postcode"].str.startswith("SW1A").all()
+    assert df["dateoftransfer"].str[:4].astype(int).between(2005, 2009).all()
+    assert dataset.count_rows(paths, postcode_prefixes=["SW1A"], years=(2005, 2009)) == 5
+
+
+def test_compact_dtypes_round_trip(tmp_path):
+    """Categoricals come back as category, numerics as 32 bit, before and after a rewrite"""
+    source = str(tmp_path / "training.parquet")
+    target = str(tmp_path / "training_compact.parquet")
+    pd.DataFrame({
+        "postcode": ["SW1A 2AA", "NG8 1BB", "SW1A 2AA"],
+        "CURRENT_ENERGY_RATING": ["D", None, "C"],
+        "price": [850000, 112000, 251000],
+        "TOTAL_FLOOR_AREA": [54.0, None, 120.5],
+        "dateoftransfer": ["2023-02-24", "1998-09-11", "2021-05-28"],
+    }).to_parquet(source)
+
+    df = dataset.read_compact(source)
+    assert str(df["postcode"].dtype) == "category"
+    assert str(df["CURRENT_ENERGY_RATING"].dtype) == "category"
+    assert str(df["price"].dtype) == "int32"
+    assert str(df["TOTAL_FLOOR_AREA"].dtype) == "float32"
+    assert df["dateoftransfer"].tolist()[0] == "2023-02-24"
+
+    dataset.rewrite_compact(source, target, batch_size=2)
+    rewritten = pd.read_parquet(target)
+    assert str(rewritten["postcode"].dtype) == "category"
+    assert str(rewritten["price"].dtype) == "int32"
+    assert rewritten["postcode"].tolist() == ["SW1A 2AA", "NG8 1BB", "SW1A 2AA"]
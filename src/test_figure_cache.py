@@ -0,0 +1,50 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from figure_cache import FigureCache, lttb, downsample_frame, data_version
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(10_000)
+    y = np.sin(x / 500.0)
+    y[4321] = 50 # a single spike must survive
+
+    kept = lttb(x, y, 300)
+
+    assert len(kept) == 300
+    assert kept[0] == 0 and kept[-1] == 9_999
+    assert np.all(np.diff(kept) > 0)
+    assert 4321 in kept
+
+
+def test_downsample_frame_handles_dates_and_short_frames():
+    df = pd.DataFrame({"date": pd.date_range("2000-01-01", periods=2_000, freq="D"), "price": np.arange(2_000.0)})
+
+    assert len(downsample_frame(df, 100)) == 100
+    assert len(downsample_frame(df.head(50), 100)) == 50
+
+
+def test_figure_cache_builds_once_per_data_version():
+    """The same Figure object comes back until the key changes - nothing is re-serialised"""
+    cache = FigureCache(max_entries=2)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return go.Figure(go.Scatter(x=[1, 2], y=[3, 4]))
+
+    df = pd.DataFrame({"date": ["2024-01-01"], "price": [1]})
+    key = ("price", "SW1A 2AA", "10 Downing Street", data_version(df))
+
+    first = cache.get_or_build(key, build)
+    assert isinstance(first, go.Figure)
+    assert cache.get_or_build(key, build) is first
+    assert len(builds) == 1
+
+    changed = df.assign(price=[2])
+    assert data_version(changed) != data_version(df)
@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+import main
+
+
+def test_future_prices_skip_uncached_postcodes_and_featureless_rows(monkeypatch, postcode_api):
+    """The search path makes no postcode calls; rows without any features aren't predicted"""
+    predicted = []
+
+    def fake_predict(features, model_name):
+        predicted.append(len(features))
+        return np.full(len(features), 500_000.0)
+
+    monkeypatch.setattr(main, "predict", fake_predict)
+    properties = [{"postcode": "SW1A", "address": "10 Downing Street"}, {"postcode": "SW1A", "address": "Unknown House"}]
+
+    main.add_future_prices(properties, cached_only=True)
+    assert postcode_api == [] and predicted == []
+    assert all(p.get("future_price") is None for p in properties)
+
+    main.add_future_prices(properties)
+    assert len(postcode_api) == 3 and predicted == [1]
+    assert properties[0]["future_price"] == 500_000.0
+    assert properties[1].get("future_price") is None
+
+    # cached now - the search path fills it without another call
+    later = [{"postcode": "SW1A", "address": "10 Downing Street"}]
+    main.add_future_prices(later, cached_only=True)
+    assert len(postcode_api) == 3 and later[0]["future_price"] == 500_000.0
+
+
+def test_forecast_frame_is_empty_without_property_features(monkeypatch, postcode_api):
+    """Like add_future_prices, the forecast doesn't run the models on a postcode-and-date row"""
+    import pandas as pd
+
+    def fake_predict_ensemble(features, model_names, thread_count=None):
+        n = len(features)
+        return {"mean": np.full(n, 500_000.0), "low": np.full(n, 450_000.0), "high": np.full(n, 550_000.0), "latency": {}}
+
+    monkeypatch.setattr(main, "predict_ensemble", fake_predict_ensemble)
+
+    assert main.get_price_forecast_frame("SW1A", "Unknown House").empty
+
+    frame = main.get_price_forecast_frame("SW1A", "10 Downing Street", horizon_years=3)
+    assert list(frame.columns) == ["date", "price", "low", "high"]
+    assert len(frame) == 4
+    assert pd.api.types.is_datetime64_any_dtype(frame["date"])
@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+import mock_scansan_server
+
+
+def test_mock_server_fixtures_are_stable_and_joinable():
+    """Same area code -> same data, and valuations/EPC share addresses"""
+    server, base_url = mock_scansan_server.start_server()
+    try:
+        search = requests.get(base_url + "/area_codes/search", params={"area_name": "Brixton"}).json()
+        area_code = search["data"][0][0]["area_code"]["area_code_list"][0]
+
+        url = f"{base_url}/postcode/{area_code}/valuations/current"
+        first = requests.get(url).json()
+        assert requests.get(url).json() == first
+
+        epc = requests.get(f"{base_url}/postcode/{area_code}/energy/performance").json()
+        assert {p["property_address"] for p in first["data"]} == {p["street_address"] for p in epc["data"]}
+
+        assert requests.get(base_url + "/nowhere").status_code == 404
+    finally:
+        server.shutdown()
+
+
+def test_mock_server_injects_errors():
+    """rate_limit_rate=1 answers every request 429 with Retry-After"""
+    server, base_url = mock_scansan_server.start_server(rate_limit_rate=1.0)
+    try:
+        response = requests.get(base_url + "/postcode/SW1A 1AA/valuations/current")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+    finally:
+        server.shutdown()
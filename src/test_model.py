@@ -0,0 +1,39 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+import model
+
+
+def write_training_data(path, rows=400):
+    rng = np.random.default_rng(0)
+    area = rng.uniform(30, 200, rows)
+    pd.DataFrame({
+        "postcode": rng.choice(["SW1A 2AA", "NG8 1BB", "SL4 1QN"], rows),
+        "propertytype": rng.choice(["F", "D", "S", "T"], rows),
+        "TOTAL_FLOOR_AREA": area,
+        "dateoftransfer": [f"{rng.integers(1995, 2025)}-06-30" for _ in range(rows)],
+        "price": (area * 3000).astype(int),
+    }).to_parquet(path)
+
+
+def test_cpu_profile_has_no_gpu_settings():
+    assert model.params["task_type"] == "CPU"
+    assert "devices" not in model.params
+    assert model.params["boosting_type"] == "Plain"
+    assert model.params["thread_count"] >= 1
+
+
+def test_hyperparameter_search_runs_trials_in_parallel(tmp_path):
+    data_path = str(tmp_path / "training.parquet")
+    write_training_data(data_path)
+
+    results = model.hyperparameter_search(data_path, n_trials=3, jobs=2, iterations=10, cache_dir=str(tmp_path / "cache"))
+
+    assert len(results) == 3
+    assert [r["mae"] for r in results] == sorted(r["mae"] for r in results)
+    assert all(r["seconds"] > 0 for r in results)
+    assert all(r["params"]["thread_count"] == max(1, model.physical_cores() // 2) for r in results)
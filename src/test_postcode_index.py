@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+import postcode_index
+
+
+def build_index(tmp_path):
+    """Index built from one small shard shaped like cleaned_property_data"""
+    shard = str(tmp_path / "cleaned_property_data_part_0.parquet")
+    pd.DataFrame({
+        "postcode": ["SW1A 2AA", "SW1A 2AA", "SW1A 2AB", "SW1E 5JL", "NG8 1BB", None],
+        "street": ["DOWNING STREET", "Downing St", "DOWNING STREET", "VICTORIA STREET", "ST. JOHN'S RD", "HIGH STREET"],
+        "district": ["CITY OF WESTMINSTER"] * 4 + ["NOTTINGHAM", "NOTTINGHAM"],
+    }).to_parquet(shard)
+    return postcode_index.build_postcode_index([shard], output_path=str(tmp_path / "index.parquet"))
+
+
+def test_postcode_index_resolves_only_exact_normalised_streets(tmp_path):
+    index = build_index(tmp_path)
+
+    # busiest postcode first; "Downing St" normalises onto the same street
+    assert index.resolve("sw1a", "downing st") == ("DOWNING STREET", ["SW1A 2AA", "SW1A 2AB"])
+    assert index.resolve("NG8", "St Johns Road")[1] == ["NG8 1BB"]
+    # a misspelling is suggested, not resolved
+    assert index.resolve("SW1A", "Downnig Street") == (None, [])
+    assert index.complete_street("SW1A", "Downnig Street") == ["DOWNING STREET"]
+    assert index.resolve("SW1A", "Abbey Road") == (None, [])
+    assert index.boroughs["SW1A"] == "City Of Westminster"
+
+
+def test_inexact_streets_fall_through_to_the_search_api(tmp_path, monkeypatch):
+    import main
+
+    index = build_index(tmp_path)
+    monkeypatch.setattr(main, "load_postcode_index", lambda: index)
+    searched = []
+
+    def fake_get_search(gbr_district=None, gbr_street=None, **kwargs):
+        searched.append((gbr_district, gbr_street))
+        return None
+
+    monkeypatch.setattr(main, "get_search", fake_get_search)
+
+    assert main.resolve_search("", postcode_district="SW1A", street="Downing St")["area_codes"] == ["SW1A 2AA", "SW1A 2AB"]
+    assert searched == []
+    main.resolve_search("", postcode_district="sw1a", street="Downnig Street")
+    assert searched == [("SW1A", "Downnig Street")]
+
+
+def test_postcode_index_autocomplete_and_unknown_districts(tmp_path):
+    index = build_index(tmp_path)
+
+    assert index.complete_district("sw1") == ["SW1A", "SW1E"]
+    assert index.complete_street("SW1E", "vic") == ["VICTORIA STREET"]
+    assert not index.has_district("SW1Z")
+    assert "SW1A" in index.suggest_districts("SW1Z")
+
+
+def test_unknown_districts_get_a_hint_not_an_error(tmp_path, monkeypatch):
+    """Districts outside the England & Wales index (e.g. Edinburgh's EH1) still search"""
+    import main
+
+    index = build_index(tmp_path)
+    monkeypatch.setattr(main, "load_postcode_index", lambda: index)
+
+    assert main.validate_search_input("", "EH1", "Princes Street") is None
+    assert main.validate_search_input("", "SW1Z", "Downing Street") is None
+    assert "SW1A" in main.get_district_hint("SW1Z")
+    assert main.get_district_hint("SW1A") is None
@@ -0,0 +1,79 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+from catboost import CatBoostRegressor
+
+import predictor
+
+
+def train_tiny_model(path):
+    """Small model on a few of the real feature columns"""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({
+        "propertytype": rng.choice(["F", "D", "S", "T"], 200),
+        "TOTAL_FLOOR_AREA": rng.uniform(30, 200, 200),
+        "year": rng.integers(1995, 2025, 200),
+    })
+    y = X["TOTAL_FLOOR_AREA"] * 3000 + (X["year"] - 1995) * 5000
+    model = CatBoostRegressor(iterations=20, depth=3, verbose=False, random_seed=42)
+    model.fit(X, y, cat_features=["propertytype"])
+    model.save_model(path)
+    return model
+
+
+def test_load_model_is_cached(tmp_path):
+    path = str(tmp_path / "tiny.cbm")
+    train_tiny_model(path)
+
+    assert predictor.load_model(path) is predictor.load_model(path)
+
+
+def test_predict_reorders_and_fills_missing(tmp_path):
+    """Extra columns, different order and missing categoricals are handled"""
+    path = str(tmp_path / "tiny.cbm")
+    model = train_tiny_model(path)
+
+    features = pd.DataFrame({
+        "year": [2020, 2021],
+        "postcode": ["SW1A 2AA", "NG8 1BB"],
+        "TOTAL_FLOOR_AREA": [54.0, 120.0],
+        "propertytype": ["F", None],
+    })
+
+    prices = predictor.predict(features, path)
+    expected = model.predict(pd.DataFrame({
+        "propertytype": ["F", predictor.MISSING_CATEGORY],
+        "TOTAL_FLOOR_AREA": [54.0, 120.0],
+        "year": [2020, 2021],
+    }))
+
+    assert prices.shape == (2,)
+    assert np.allclose(prices, expected)
+
+
+def test_predict_ensemble_mean_spread_and_latency(tmp_path):
+    paths = []
+    for seed in range(3):
+        path = str(tmp_path / f"prototype_{seed + 1}.cbm")
+        train_tiny_model(path)
+        paths.append(path)
+    # one model with a different seed so the spread is non-zero
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame({"propertytype": rng.choice(["F", "D"], 100), "TOTAL_FLOOR_AREA": rng.uniform(30, 200, 100), "year": rng.integers(1995, 2025, 100)})
+    CatBoostRegressor(iterations=20, depth=3, verbose=False, random_seed=7).fit(X, X["TOTAL_FLOOR_AREA"] * 2500, cat_features=["propertytype"]).save_model(paths[2])
+
+    features = pd.DataFrame({"propertytype": ["F", "D"], "TOTAL_FLOOR_AREA": [54.0, 120.0], "year": [2026, 2027]})
+    result = predictor.predict_ensemble(features, paths, thread_count=1)
+
+    stacked = np.vstack([result["predictions"][path] for path in paths])
+    assert np.allclose(result["mean"], stacked.mean(axis=0))
+    assert (result["high"] - result["low"] > 0).all()
+    assert set(result["latency"]) == set(paths)
+    assert all(seconds >= 0 for seconds in result["latency"].values())
+
+    # accumulated per model for finding slow ensemble members
+    stats = predictor.get_latency_stats()
+    assert all(stats[path]["calls"] >= 1 and stats[path]["max_seconds"] >= 0 for path in paths)
@@ -0,0 +1,50 @@
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import prefetch
+
+
+def test_prefetcher_warms_top_cards_and_cancels_on_new_search(monkeypatch):
+    """Only the first top_n cards are fetched; a new start drops the old queue"""
+    started = []
+    release = threading.Event()
+
+    def fake_prefetch_property(prop):
+        started.append(prop["postcode"])
+        release.wait(1)
+
+    monkeypatch.setattr(prefetch, "prefetch_property", fake_prefetch_property)
+    prefetcher = prefetch.Prefetcher(max_workers=1)
+
+    first = prefetcher.start([{"postcode": f"A{i}"} for i in range(5)], top_n=3)
+    time.sleep(0.05)
+    second = prefetcher.start([{"postcode": "B1"}, {"postcode": ""}], top_n=3)
+    release.set()
+    for future in second:
+        future.result(timeout=2)
+
+    assert len(first) == 3 and len(second) == 1
+    # A0 was already running; A1/A2 were still queued and got cancelled
+    assert started == ["A0", "B1"]
+    assert first[1].cancelled() and first[2].cancelled()
+
+
+def test_apply_results_writes_prices_onto_cards(monkeypatch):
+    """Workers only return prices; apply_results puts them on the cards that lack one"""
+    prices = {"A1": 410000.0, "A2": None, "A3": 520000.0}
+    monkeypatch.setattr(prefetch, "prefetch_property", lambda prop: prices[prop["postcode"]])
+    prefetcher = prefetch.Prefetcher(max_workers=2)
+
+    cards = [{"postcode": "A1"}, {"postcode": "A2"}, {"postcode": "A3", "future_price": 500000.0}]
+    for future in prefetcher.start(cards, top_n=3):
+        future.result(timeout=2)
+    assert all("future_price" not in card for card in cards[:2])
+
+    assert prefetcher.apply_results() == 1
+    assert cards[0]["future_price"] == 410000.0
+    assert "future_price" not in cards[1]
+    assert cards[2]["future_price"] == 500000.0
+    assert prefetcher.pending() == 0 and prefetcher.apply_results() == 0
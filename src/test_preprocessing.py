@@ -0,0 +1,50 @@
+import sys
+import os
+from datetime import date
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+import preprocessing
+
+
+def test_add_date_features_vectorised():
+    df = pd.DataFrame({
+        "price": [960000, 112000, 251000],
+        "dateoftransfer": ["2023-02-24", "1998-09-11", "not a date"],
+    })
+
+    out = preprocessing.add_date_features(df)
+
+    assert "dateoftransfer" not in out.columns
+    assert out["year"].tolist() == [2023, 1998]
+    assert out["month"].tolist() == [2, 9]
+    assert out["quarter"].tolist() == [1, 3]
+    assert str(out["year"].dtype) == "int16"
+
+
+def test_add_date_features_accepts_dates():
+    df = pd.DataFrame({"dateoftransfer": [date(2021, 5, 28)]})
+    assert preprocessing.add_date_features(df)["quarter"].tolist() == [2]
+
+
+def test_load_preprocessed_reuses_artifact(tmp_path, monkeypatch):
+    """Second load reads the cached artifact instead of preprocessing again"""
+    source = str(tmp_path / "training.parquet")
+    cache_dir = str(tmp_path / "cache")
+    pd.DataFrame({
+        "postcode": ["SL4 1QN", "MK7 7DB"],
+        "price": [960000, 112000],
+        "dateoftransfer": ["2023-02-24", "1998-09-11"],
+    }).to_parquet(source)
+
+    first = preprocessing.load_preprocessed(source, cache_dir=cache_dir)
+    assert os.path.exists(preprocessing.artifact_path(source, cache_dir))
+
+    def fail(df):
+        raise AssertionError("preprocess should not run on a cache hit")
+    monkeypatch.setattr(preprocessing, "preprocess", fail)
+
+    second = preprocessing.load_preprocessed(source, cache_dir=cache_dir)
+    assert second["year"].tolist() == first["year"].tolist() == [2023, 1998]
+    assert str(second["postcode"].dtype) == "category"
@@ -0,0 +1,101 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from response_cache import ResponseCache
+
+URL = "https://api.scansan.com/v1/postcode/{area_code}/valuations/current"
+
+
+def test_hit_and_miss_counters():
+    """Second lookup for the same template + params is a hit"""
+    cache = ResponseCache(max_bytes=10_000)
+
+    assert cache.get(URL, {"area_code": "SW1A2AA"}) == (False, None)
+    cache.set(URL, {"area_code": "SW1A2AA"}, {"data": [1, 2, 3]})
+
+    assert cache.get(URL, {"area_code": "SW1A2AA"}) == (True, {"data": [1, 2, 3]})
+    assert cache.get(URL, {"area_code": "NW10BH"}) == (False, None)
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_ttl_per_template():
+    """Entries expire after their template's TTL"""
+    cache = ResponseCache(max_bytes=10_000, ttls={URL: 0.05})
+    cache.set(URL, {"area_code": "SW1A2AA"}, {"data": []})
+
+    time.sleep(0.1)
+
+    assert cache.get(URL, {"area_code": "SW1A2AA"}) == (False, None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_by_size():
+    """Least recently used entries go first once over the byte budget"""
+    value = {"data": "x" * 100}
+    cache = ResponseCache(max_bytes=300)
+
+    cache.set(URL, {"area_code": "A"}, value)
+    cache.set(URL, {"area_code": "B"}, value)
+    cache.get(URL, {"area_code": "A"}) # A is now most recent
+    cache.set(URL, {"area_code": "C"}, value)
+
+    assert cache.get(URL, {"area_code": "A"})[0]
+    assert not cache.get(URL, {"area_code": "B"})[0]
+    assert cache.get(URL, {"area_code": "C"})[0]
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= 300
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    """A new cache on the same file serves entries from disk"""
+    db_path = str(tmp_path / "cache.sqlite")
+
+    first = ResponseCache(max_bytes=10_000, db_path=db_path)
+    first.set(URL, {"area_code": "SW1A2AA"}, {"data": [42]})
+
+    second = ResponseCache(max_bytes=10_000, db_path=db_path)
+    assert second.get(URL, {"area_code": "SW1A2AA"}) == (True, {"data": [42]})
+    assert second.stats()["disk_hits"] == 1
+
+
+def test_sqlite_tier_drops_expired_rows_and_caps_size(tmp_path):
+    """Expired rows are deleted on lookup; sweeps trim the file to max_rows, least recently used first"""
+    db_path = str(tmp_path / "cache.sqlite")
+
+    def disk_rows(cache):
+        return cache._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    cache = ResponseCache(max_bytes=10_000, ttls={URL: 0.05}, db_path=db_path)
+    cache.set(URL, {"area_code": "OLD"}, {"data": []})
+    time.sleep(0.1)
+    assert cache.get(URL, {"area_code": "OLD"}) == (False, None)
+    assert disk_rows(cache) == 0
+
+    cache = ResponseCache(max_bytes=10_000, db_path=db_path, max_rows=2, sweep_every=1)
+    cache.set(URL, {"area_code": "A"}, {"data": 1})
+    cache.set(URL, {"area_code": "B"}, {"data": 2})
+    cache.set(URL, {"area_code": "C"}, {"data": 3})
+    assert disk_rows(cache) == 2
+    assert cache.stats()["disk_evictions"] == 1
+
+    restarted = ResponseCache(max_bytes=10_000, db_path=db_path)
+    assert not restarted.get(URL, {"area_code": "A"})[0]
+    assert restarted.get(URL, {"area_code": "C"})[0]
+
+
+def test_raw_body_sizes_and_persists_without_reencoding(tmp_path):
+    """With the response body given, its length is the size and it is the SQLite row"""
+    db_path = str(tmp_path / "cache.sqlite")
+    raw = b'{"data": [1, 2, 3]}'
+
+    cache = ResponseCache(max_bytes=10_000, db_path=db_path)
+    cache.set(URL, {"area_code": "SW1A2AA"}, {"data": [1, 2, 3]}, raw=raw)
+    assert cache.stats()["bytes"] == len(raw)
+
+    restarted = ResponseCache(max_bytes=10_000, db_path=db_path)
+    assert restarted.get(URL, {"area_code": "SW1A2AA"}) == (True, {"data": [1, 2, 3]})
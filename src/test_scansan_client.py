@@ -0,0 +1,214 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import scansan_client
+
+
+def fake_valuations(delays):
+    """Build a stand-in for get_current_valuations that sleeps per area code"""
+    def get_current_valuations(area_code_postal=None, area_code=None):
+        delay = delays[area_code]
+        if delay is None:
+            raise RuntimeError("API down")
+        time.sleep(delay)
+        return {"area_code": area_code, "data": []}
+    return get_current_valuations
+
+
+def test_get_current_valuations_many_keeps_order(monkeypatch):
+    """Results line up with the area codes, not with completion order"""
+    delays = {"A1": 0.2, "B2": 0.0, "C3": 0.1}
+    monkeypatch.setattr(scansan_client, "get_current_valuations", fake_valuations(delays))
+
+    results = scansan_client.get_current_valuations_many(["A1", "B2", "C3"], max_workers=3, deadline=5)
+
+    assert [r["area_code"] for r in results] == ["A1", "B2", "C3"]
+
+
+def test_get_current_valuations_many_runs_in_parallel(monkeypatch):
+    """Fan-out takes about as long as the slowest call"""
+    delays = {code: 0.2 for code in ["A1", "B2", "C3", "D4", "E5", "F6"]}
+    monkeypatch.setattr(scansan_client, "get_current_valuations", fake_valuations(delays))
+
+    start = time.perf_counter()
+    results = scansan_client.get_current_valuations_many(list(delays), max_workers=6, deadline=5)
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 6
+    assert elapsed < 0.6
+
+
+def test_get_current_valuations_many_deadline_and_errors(monkeypatch):
+    """Slow or failing area codes come back as None"""
+    delays = {"A1": 0.0, "B2": 1.0, "C3": None}
+    monkeypatch.setattr(scansan_client, "get_current_valuations", fake_valuations(delays))
+
+    start = time.perf_counter()
+    results = scansan_client.get_current_valuations_many(["A1", "B2", "C3"], max_workers=3, deadline=0.3)
+    elapsed = time.perf_counter() - start
+
+    assert results[0]["area_code"] == "A1"
+    assert results[1] is None
+    assert results[2] is None
+    assert elapsed < 0.9
+
+
+def test_shared_session_is_reused():
+    """All getters go through one pooled session with connection retries mounted"""
+    import http_client
+
+    session = http_client.get_session()
+    adapter = session.get_adapter("https://api.scansan.com")
+
+    assert http_client.get_session() is session
+    assert adapter.max_retries.total == http_client.HTTP_RETRIES
+
+
+def test_http_get_retries_429_after_retry_after(monkeypatch, fake_response):
+    """A 429 is retried once Retry-After has passed and counted as throttled"""
+    import http_client
+    from rate_limit import RateLimiter
+
+    responses = [fake_response(status_code=429, headers={"Retry-After": "0.2"}), fake_response()]
+
+    class FakeSession:
+        def get(self, **kwargs):
+            return responses.pop(0)
+
+    monkeypatch.setattr(http_client, "get_session", lambda: FakeSession())
+    monkeypatch.setattr(http_client, "rate_limiter", RateLimiter())
+
+    start = time.perf_counter()
+    response = http_client.http_get("https://example.test/x", endpoint="x")
+    elapsed = time.perf_counter() - start
+
+    stats = http_client.get_request_stats()
+    assert response.status_code == 200
+    assert elapsed >= 0.2
+    assert (stats["throttled"], stats["served"], stats["retried"]) == (1, 1, 1)
+
+
+def test_only_2xx_responses_count_as_served(monkeypatch, fake_response):
+    """A 5xx that runs out of retries is failed, not served"""
+    import http_client
+    from rate_limit import RateLimiter
+
+    class FakeSession:
+        def get(self, **kwargs):
+            return fake_response(status_code=503)
+
+    monkeypatch.setattr(http_client, "get_session", lambda: FakeSession())
+    monkeypatch.setattr(http_client, "rate_limiter", RateLimiter())
+    monkeypatch.setattr(http_client, "retry_delay", lambda response, attempt: 0)
+
+    response = http_client.http_get("https://example.test/x", endpoint="x", retries=1)
+
+    stats = http_client.get_request_stats()
+    assert response.status_code == 503
+    assert (stats["served"], stats["failed"], stats["retried"]) == (0, 2, 1)
+
+
+def test_token_bucket_limits_rate():
+    """burst requests go straight through, the rest wait for refills"""
+    from rate_limit import TokenBucket
+
+    bucket = TokenBucket(rate=20, burst=2)
+
+    start = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+    elapsed = time.perf_counter() - start
+
+    # 2 from the burst, 4 more at 20/s
+    assert 0.15 < elapsed < 0.5
+
+
+def test_rate_limiter_scale():
+    """scale multiplies rate and burst; 0 never waits"""
+    from rate_limit import RateLimiter
+
+    assert RateLimiter(limits={"x": (2, 4)}, scale=4).bucket("x").burst == 16
+
+    limiter = RateLimiter(default=(1, 1), scale=0)
+    start = time.perf_counter()
+    for _ in range(20):
+        limiter.acquire("x")
+    assert time.perf_counter() - start < 0.1
+    assert limiter.stats()["delayed"] == 0
+
+
+def test_concurrent_identical_requests_are_coalesced(monkeypatch, fake_response):
+    """Eight threads asking for the same uncached key make one HTTP call"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    calls = []
+
+    def fake_http_get(url, params=None, headers=None, **kwargs):
+        calls.append(url)
+        time.sleep(0.2)
+        return fake_response({"data": ["shared"]})
+
+    monkeypatch.setattr(scansan_client, "http_get", fake_http_get)
+    monkeypatch.setattr(scansan_client, "response_cache", scansan_client.ResponseCache(max_bytes=0))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: scansan_client.get_current_valuations(area_code="Z9 9ZZ"), range(8)))
+
+    assert len(calls) == 1
+    assert all(result == {"data": ["shared"]} for result in results)
+
+
+def test_iter_current_valuations_yields_fastest_first(monkeypatch):
+    """Streaming fan-out hands back each result as it lands, skipping failures"""
+    delays = {"A1": 0.3, "B2": 0.0, "C3": None, "D4": 0.1}
+    monkeypatch.setattr(scansan_client, "get_current_valuations", fake_valuations(delays))
+
+    start = time.perf_counter()
+    first_position, _ = next(scansan_client.iter_current_valuations(["A1", "B2", "C3", "D4"], max_workers=4, deadline=5))
+    assert first_position == 1
+    assert time.perf_counter() - start < 0.2
+
+    positions = [i for i, _ in scansan_client.iter_current_valuations(["A1", "B2", "C3", "D4"], max_workers=4, deadline=5)]
+    assert positions == [1, 3, 0]
+
+
+def test_historical_valuations_are_cached_until_refresh(monkeypatch):
+    """Repeat calls reuse the parsed postcode; refresh=True fetches again"""
+    calls = []
+
+    def fake_get_historical_valuations(area_code_postal=None, area_code=None):
+        calls.append(area_code)
+        return {"data": [{"property_address": "1 High Street", "valuations": [
+            {"date": "2024-02-01", "valuation": 2}, {"date": "2024-01-01", "valuation": 1}]}]}
+
+    monkeypatch.setattr(scansan_client, "get_historical_valuations", fake_get_historical_valuations)
+    monkeypatch.setattr(scansan_client, "historical_store", scansan_client.OrderedDict())
+
+    first = scansan_client.get_historical_valuation_frame(area_code="Z9 9ZZ", property_address="1 High Street")
+    second = scansan_client.get_historical_valuation_frame(area_code="Z9 9ZZ", property_address="1 High Street")
+    scansan_client.get_historical_valuation_frame(area_code="Z9 9ZZ", property_address="1 High Street", refresh=True)
+
+    assert list(first["price"]) == [1, 2]
+    assert second["price"].equals(first["price"])
+    assert calls == ["Z9 9ZZ", "Z9 9ZZ"]
+
+
+def test_historical_valuations_expire_with_the_response_ttl(monkeypatch):
+    """A parsed postcode is fetched again once the endpoint's TTL has passed"""
+    calls = []
+
+    def fake_get_historical_valuations(area_code_postal=None, area_code=None):
+        calls.append(area_code)
+        return {"data": [{"property_address": "1 High Street", "valuations": [{"date": "2024-01-01", "valuation": len(calls)}]}]}
+
+    monkeypatch.setattr(scansan_client, "get_historical_valuations", fake_get_historical_valuations)
+    monkeypatch.setattr(scansan_client, "historical_store", scansan_client.OrderedDict())
+    monkeypatch.setattr(scansan_client, "CACHE_TTLS", {scansan_client.HISTORICAL_VALUATIONS_URL: 0.05})
+
+    assert list(scansan_client.get_historical_valuation_frame(area_code="Z9 9ZZ")["price"]) == [1]
+    assert list(scansan_client.get_historical_valuation_frame(area_code="Z9 9ZZ")["price"]) == [1]
+    time.sleep(0.1)
+    assert list(scansan_client.get_historical_valuation_frame(area_code="Z9 9ZZ")["price"]) == [2]
+    assert len(calls) == 2
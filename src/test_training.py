@@ -0,0 +1,86 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import training
+
+
+def write_shards(directory, parts=3, rows=300, drop=()):
+    """Small shards with every column load_shard reads (EPC descriptions included)"""
+    rng = np.random.default_rng(0)
+    for part in range(parts):
+        area = rng.uniform(30, 200, rows)
+        df = pd.DataFrame({
+            "postcode": rng.choice(["SW1A 2AA", "NG8 1BB", None], rows),
+            "propertytype": rng.choice(["F", "D", "S", "T"], rows),
+            "TOTAL_FLOOR_AREA": area,
+            "NUMBER_HABITABLE_ROOMS": rng.integers(1, 8, rows).astype(float),
+            # sorted, so read in small batches each batch sees only some ratings
+            "CURRENT_ENERGY_RATING": np.sort(rng.choice(["B", "C", "D", "E"], rows)),
+            "ENERGY_CONSUMPTION_CURRENT": rng.uniform(100, 400, rows),
+            "CO2_EMISSIONS_CURRENT": rng.uniform(1, 6, rows),
+            "HEATING_COST_CURRENT": rng.uniform(300, 1500, rows),
+            "HOT_WATER_COST_CURRENT": rng.uniform(50, 200, rows),
+            "MAINHEAT_ENERGY_EFF": rng.choice(["Good", "Average", "Poor"], rows),
+            "FLOOR_DESCRIPTION": rng.choice(["Solid, no insulation (assumed)", "Suspended, insulated", None], rows),
+            "WINDOWS_DESCRIPTION": rng.choice(["Fully double glazed", "Single glazed"], rows),
+            "WALLS_DESCRIPTION": rng.choice(["Cavity wall, filled cavity", "Solid brick, as built, no insulation"], rows),
+            "ROOF_DESCRIPTION": rng.choice(["Pitched, 200 mm loft insulation", "(another premises above)"], rows),
+            # each shard sees different heating, so their dictionaries differ
+            "MAINHEAT_DESCRIPTION": rng.choice(["Boiler and radiators, mains gas", "Electric storage heaters", "Boiler and radiators, oil"][part:], rows),
+            "dateoftransfer": [f"{rng.integers(1995, 2025)}-06-30" for _ in range(rows)],
+            "price": (area * 3000).astype(int),
+        })
+        df.drop(columns=list(drop)).to_parquet(os.path.join(directory, f"cleaned_property_data_part_{part}.parquet"))
+
+
+def test_split_holdout_is_deterministic(tmp_path):
+    write_shards(str(tmp_path))
+    paths = training.list_shards(str(tmp_path))
+
+    train_paths, holdout = training.split_holdout(paths)
+
+    assert holdout.endswith("part_2.parquet")
+    assert len(train_paths) == 2 and holdout not in train_paths
+
+
+def test_train_out_of_core_continues_across_shards(tmp_path):
+    write_shards(str(tmp_path))
+    paths = training.list_shards(str(tmp_path))
+    model_path = str(tmp_path / "model.cbm")
+
+    model = training.train_out_of_core(paths, params={"thread_count": 1}, iterations_per_shard=5, model_path=model_path)
+
+    # each training shard adds its trees on top of the last
+    assert model.tree_count_ == 10
+    assert os.path.exists(model_path)
+    assert "year" in model.feature_names_
+
+
+def test_load_shard_derives_description_features(tmp_path):
+    """Every model column comes back, the description ones derived as at inference, categoricals kept compact"""
+    write_shards(str(tmp_path), parts=1)
+    path = training.list_shards(str(tmp_path))[0]
+
+    X, y = training.load_shard(path, batch_size=50)
+
+    assert list(X.columns) == training.FEATURE_COLUMNS
+    assert len(X) == len(y) == 300
+    assert set(X["MAINHEAT_TYPE"]) == {"gas boiler", "electric storage", "oil boiler"}
+    assert set(X["FLOOR_TYPE"]) == {"solid", "suspended", "None"}
+    # batches were dictionary encoded separately - still one category dtype after concat
+    assert isinstance(X["MAINHEAT_TYPE"].dtype, pd.CategoricalDtype)
+    assert isinstance(X["CURRENT_ENERGY_RATING"].dtype, pd.CategoricalDtype)
+    assert set(X["CURRENT_ENERGY_RATING"]) == {"B", "C", "D", "E"}
+
+
+def test_load_shard_rejects_missing_columns(tmp_path):
+    write_shards(str(tmp_path), parts=1, drop=["ROOF_DESCRIPTION"])
+    path = training.list_shards(str(tmp_path))[0]
+
+    with pytest.raises(ValueError, match="ROOF_DESCRIPTION"):
+        training.load_shard(path)
@@ -76,6 +76,107 @@ def test_get_desc_df():
         print(f"    FAIL: {str(e)}")
 
 
+def test_translator_fetches_each_document_once(postcode_api):
+    """A feature row costs three calls, and other addresses in the postcode cost none"""
+    import translator as translator_module
+
+    calls = postcode_api
+
+    row = translator_module.translator("SW1A", "10 Downing Street")
+    translator_module.translator("SW1A", "11 Downing Street")
+
+    assert len(calls) == 3
+    # built once while the cached documents stay the same, rebuilt once they're refetched
+    index = translator_module.get_postcode_index("SW1A")
+    assert translator_module.get_postcode_index("SW1A") is index
+    import scansan_client
+    scansan_client.response_cache.clear()
+    assert translator_module.get_postcode_index("SW1A") is not index
+    assert len(calls) == 6
+    assert row["propertytype"] == "T"
+    assert row["NUMBER_HABITABLE_ROOMS"] == 5
+    assert row["TOTAL_FLOOR_AREA"] == 120
+    assert row["CURRENT_ENERGY_RATING"] == "D"
+    assert row["MAINHEAT_TYPE"] == "gas boiler"
+    assert row["WINDOWS_DEGREE"] == "fully"
+
+
+def test_translate_many_matches_model_schema(postcode_api):
+    """Batch rows follow the training schema and reuse one fetch per postcode"""
+    import translator as translator_module
+    from datetime import date
+    from feature_schema import FEATURE_COLUMNS
+
+    calls = postcode_api
+
+    df = translator_module.translate_many(
+        [("SW1A", "10 Downing Street"), ("SW1A", "11 Downing Street"), ("SW1A", "10 Downing Street")],
+        valuation_date=date(2026, 10, 18)
+    )
+
+    assert list(df.columns) == FEATURE_COLUMNS
+    assert len(df) == 3
+    assert len(calls) == 3
+    assert df["NUMBER_HABITABLE_ROOMS"].tolist()[0] == 5
+    assert df["NUMBER_HABITABLE_ROOMS"].isna().tolist() == [False, True, False]
+    assert df["MAINHEAT_TYPE"].tolist()[0] == "gas boiler"
+    assert (df["year"] == 2026).all()
+    assert (df["quarter"] == 4).all()
+
+
+def test_postcode_index_does_not_keep_failed_fetches(monkeypatch, postcode_api, fake_response):
+    """A 503 (or non-JSON body) gives an empty index once; the next lookup fetches again"""
+    import scansan_client
+    import translator as translator_module
+
+    calls = postcode_api
+    working = scansan_client.http_get
+    failing = {"left": 3}
+
+    def flaky_http_get(url, params=None, headers=None, **kwargs):
+        if failing["left"]:
+            failing["left"] -= 1
+            calls.append(url)
+            return fake_response({"detail": "unavailable"}, status_code=503)
+        return working(url, params=params, headers=headers, **kwargs)
+
+    monkeypatch.setattr(scansan_client, "http_get", flaky_http_get)
+
+    assert translator_module.get_postcode_index("SW1A")["history"] == {}
+    assert "10 Downing Street" in translator_module.get_postcode_index("SW1A")["history"]
+    translator_module.get_postcode_index("SW1A")
+    assert len(calls) == 6
+
+
+def test_sort_descriptions_matches_keyword_loop():
+    """Precompiled classifier keeps the old per-keyword .loc semantics (last match wins)"""
+    import pandas as pd
+    from translator import sort_descriptions, description_rules
+
+    def reference(df):
+        for old_column_name, new_column_name, key in description_rules:
+            df[new_column_name] = pd.Series(pd.NA, index=df.index, dtype="string")
+            for keyword in key:
+                df.loc[df[old_column_name].str.contains(keyword, case=False, na=False), new_column_name] = key[keyword]
+        return df
+
+    texts = {
+        "FLOOR_DESCRIPTION": ["Solid, no insulation (assumed)", "Suspended, insulated", "(another dwelling below)", None, "To unheated space, limited insulation"],
+        "WINDOWS_DESCRIPTION": ["Fully double glazed", "Mostly secondary glazing", "Some triple glazing", "Single glazed", None],
+        "WALLS_DESCRIPTION": ["Cavity wall, filled cavity", "Solid brick, as built, no insulation", "Timber frame, with internal insulation", None, "Granite or whinstone, partial insulation"],
+        "ROOF_DESCRIPTION": ["Pitched, 200 mm loft insulation", "Flat, limited insulation", "(another premises above)", "Roof room(s), no insulation", None],
+        "MAINHEAT_DESCRIPTION": ["Boiler and radiators, mains gas", "Electric storage heaters", "Air source heat pump, radiators, electric", "Room heaters, electric", None]
+    }
+    rows = 1000
+    df = pd.DataFrame({column: [values[i % len(values)] for i in range(rows)] for column, values in texts.items()}, dtype="string")
+
+    expected = reference(df.copy())
+    actual = sort_descriptions(df.copy())
+
+    for old_column_name, new_column_name, key in description_rules:
+        pd.testing.assert_series_equal(actual[new_column_name], expected[new_column_name])
+
+
 def run_all_tests():
     """Run all translator tests"""
     print("=" * 60)
@@ -88,6 +189,11 @@ def run_all_tests():
     test_get_epc_values()
     test_get_desc_df()
     
+    # offline tests - they need the conftest fixtures, so pytest runs them
+    import pytest
+    pytest.main(["-q", os.path.abspath(__file__), "-k", "fetches_each_document or matches_model_schema or failed_fetches"])
+    test_sort_descriptions_matches_keyword_loop()
+    
     print("\n" + "=" * 60)
     print("✓ Test suite completed")
     print("=" * 60)
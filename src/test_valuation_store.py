@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from valuation_store import PostcodeValuations, current_prices
+
+RESPONSE = {"data": [
+    {"property_address": "1 High Street", "valuations": [
+        {"date": "2024-03-01", "valuation": 300},
+        {"date": "2024-01-01", "valuation": 100},
+        {"date": "not a date", "valuation": 999},
+    ]},
+    {"property_address": "2 High Street", "valuations": [{"date": "2024-02-01", "valuation": 200}]},
+    {"property_address": "3 High Street", "valuations": []},
+]}
+
+
+def test_postcode_valuations_slices_per_address():
+    store = PostcodeValuations.from_response(RESPONSE)
+
+    first = store.frame("1 High Street")
+    assert list(first["price"]) == [100, 300]
+    assert first["date"].is_monotonic_increasing
+    assert list(store.frame("2 High Street")["price"]) == [200]
+    assert store.frame("3 High Street").empty
+
+    # unknown address falls back to the first property, like the old scan
+    assert list(store.frame("99 Nowhere")["price"]) == [100, 300]
+
+
+def test_postcode_valuations_frames_are_views():
+    store = PostcodeValuations.from_response(RESPONSE)
+    frame = store.frame("2 High Street")
+    assert np.shares_memory(frame["price"].to_numpy(), store.prices)
+
+
+def test_current_prices_matches_per_record_rule():
+    records = [
+        {"bounded_valuation": [100, 150, 201], "last_sold_price": 90},
+        {"bounded_valuation": [7]},
+        {"bounded_valuation": [], "last_sold_price": 50},
+        {"last_sold_price": 0},
+        {"bounded_valuation": None, "last_sold_price": None},
+    ]
+    assert current_prices(records) == [150, 7, 50, None, None]
+    assert current_prices([]) == []
+
+
+def test_current_prices_bulk_path_matches_small_path():
+    """The column-wise path gives the per-record answers, floats included"""
+    import valuation_store
+
+    records = [
+        {"bounded_valuation": [100, 150, 201], "last_sold_price": 90},
+        {"bounded_valuation": [7.5]},
+        {"bounded_valuation": [], "last_sold_price": 50.25},
+        {"last_sold_price": 0},
+        {"bounded_valuation": None, "last_sold_price": None},
+    ]
+    expected = [150, 7.5, 50.25, None, None]
+    copies = valuation_store.BULK_MIN_RECORDS // len(records) + 1
+
+    assert current_prices(records) == expected
+    assert current_prices(records * copies) == expected * copies
@@ -0,0 +1,144 @@
+"""
+Out-of-core CatBoost training over the cleaned_property_data shards.
+
+Only one shard is in memory at a time: each shard becomes a Pool, the model
+continues training from the previous shard's model (init_model), and the
+shard is released before the next is read. One shard, chosen by position,
+is held out for evaluation so runs are comparable.
+"""
+
+import os
+import time
+
+from catboost import CatBoostRegressor, Pool
+
+from dataset import concat_batches, iter_batches, list_shards, open_dataset
+from feature_schema import CATEGORICAL_FEATURES, DATE_FEATURES, FEATURE_COLUMNS, TARGET_COLUMN
+from model import CPU_PROFILE
+from preprocessing import preprocess
+from translator import desc_columns, description_rules, sort_descriptions
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models")
+
+# same settings as model.py
+BASE_PARAMS = dict(
+    loss_function="MAE",
+    depth=6,
+    learning_rate=0.05,
+    random_seed=42,
+    **CPU_PROFILE
+)
+
+HOLDOUT_SHARD = -1 # position in list_shards() order - the last part
+HOLDOUT_MAX_ROWS = 200_000 # eval rows kept from the holdout shard
+ITERATIONS_PER_SHARD = 200
+
+# the EPC description text sort_descriptions derives its features from
+DESCRIPTION_COLUMNS = list(dict.fromkeys(old_column_name for old_column_name, new_column_name, key in description_rules))
+
+
+def shard_source_columns():
+    """
+    Columns load_shard reads: the features stored as-is, the EPC descriptions
+    the description features are derived from, the transfer date and the target.
+    """
+    derived = set(desc_columns) | set(DATE_FEATURES)
+    return [column for column in FEATURE_COLUMNS if column not in derived] + DESCRIPTION_COLUMNS + ["dateoftransfer", TARGET_COLUMN]
+
+
+def load_shard(path, batch_size=100_000):
+    """
+    Read one shard (in batches, compact dtypes, only the columns the model
+    needs) and derive the same features translator builds at inference.
+
+    OUTPUTS:
+    (X, y) - X has every FEATURE_COLUMNS column, in order
+    """
+    columns = shard_source_columns()
+    missing = [column for column in columns if column not in open_dataset(path).schema.names]
+    if (missing):
+        raise ValueError(f"{os.path.basename(path)} is missing columns: {missing}")
+
+    df = concat_batches(iter_batches(path, columns=columns, batch_size=batch_size, compact=True))
+    df = sort_descriptions(df)
+    df = df.drop(columns=DESCRIPTION_COLUMNS).astype({column: "category" for column in desc_columns})
+    df = preprocess(df)
+
+    return df[FEATURE_COLUMNS], df[TARGET_COLUMN]
+
+
+def make_pool(X, y):
+    return Pool(data=X, label=y, cat_features=[column for column in CATEGORICAL_FEATURES if column in X.columns])
+
+
+def split_holdout(paths, holdout_shard=HOLDOUT_SHARD):
+    """(training shard paths, holdout shard path) - deterministic for a given shard list"""
+    holdout = paths[holdout_shard]
+    return [path for path in paths if path != holdout], holdout
+
+
+def train_out_of_core(shard_paths=None, params=None, iterations_per_shard=ITERATIONS_PER_SHARD,
+                      holdout_shard=HOLDOUT_SHARD, holdout_max_rows=HOLDOUT_MAX_ROWS, model_path=None):
+    """
+    INPUTS:
+    shard_paths: list of str (None for every shard in dataset.SHARD_DIR)
+    params: dict (CatBoost params, BASE_PARAMS by default)
+    iterations_per_shard: int (trees added per shard)
+    holdout_shard: int (position of the eval shard)
+    holdout_max_rows: int (eval rows sampled, with a fixed seed, from the holdout)
+    model_path: str (where to save the final .cbm, None to skip)
+
+    OUTPUTS:
+    trained CatBoostRegressor
+    """
+    paths = shard_paths if shard_paths is not None else list_shards()
+    if (len(paths) < 2):
+        raise ValueError("Need at least two shards: one to train on and one held out")
+
+    params = {**BASE_PARAMS, **(params or {})}
+    train_paths, holdout_path = split_holdout(paths, holdout_shard)
+
+    X_eval, y_eval = load_shard(holdout_path)
+    if (len(X_eval) > holdout_max_rows):
+        X_eval = X_eval.sample(n=holdout_max_rows, random_state=42)
+        y_eval = y_eval.loc[X_eval.index]
+    eval_pool = make_pool(X_eval, y_eval)
+    del X_eval, y_eval
+
+    model = None
+    for number, path in enumerate(train_paths, start=1):
+        start = time.perf_counter()
+
+        X, y = load_shard(path)
+        train_pool = make_pool(X, y)
+        del X, y
+
+        shard_model = CatBoostRegressor(iterations=iterations_per_shard, **params)
+        shard_model.fit(train_pool, eval_set=eval_pool, init_model=model, verbose=False)
+        model = shard_model
+        del train_pool
+
+        best = model.get_best_score().get("validation", {})
+        print(f"shard {number}/{len(train_paths)} {os.path.basename(path)}: "
+              f"{model.tree_count_} trees, holdout {best} ({time.perf_counter() - start:.1f}s)")
+
+    if (model_path is not None):
+        model.save_model(model_path)
+
+    return model
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train CatBoost shard by shard over cleaned_property_data")
+    parser.add_argument("--iterations-per-shard", type=int, default=ITERATIONS_PER_SHARD)
+    parser.add_argument("--holdout-shard", type=int, default=HOLDOUT_SHARD)
+    parser.add_argument("--output", default=os.path.join(MODEL_DIR, "out_of_core.cbm"))
+    args = parser.parse_args()
+
+    train_out_of_core(
+        iterations_per_shard=args.iterations_per_shard,
+        holdout_shard=args.holdout_shard,
+        model_path=args.output,
+    )
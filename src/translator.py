@@ -1,56 +1,140 @@
+import re
+import threading
+import numpy as np
 import pandas as pd
-import requests as rq
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import lru_cache
+from scansan_client import fetch_json, is_cached
+from config import SALE_HISTORY_URL, SALE_LISTINGS_URL, ENERGY_PERFORMANCE_URL, POSTCODE_INDEX_CACHE_SIZE
+from feature_schema import FEATURE_COLUMNS, NUMERIC_FEATURES
 
 AUTH_TOKEN = "370b0b6f-3f09-4807-b7fe-270a4e5ba2c2"
 
+# postcode-level documents - fetched once per postcode (through the shared
+# response cache, see scansan_client.fetch_json) and indexed by street_address
+POSTCODE_DOCUMENTS = {
+    # index key -> (url template, keys to follow to the records)
+    "history": (SALE_HISTORY_URL, ("data",)),
+    "listings": (SALE_LISTINGS_URL, ("data", "sale_listings")),
+    "epc": (ENERGY_PERFORMANCE_URL, ("data",))
+}
+
+# built indexes - postcode -> (the cached documents they were built from, index)
+postcode_indexes = OrderedDict()
+postcode_indexes_lock = threading.Lock()
+
+def fetch_postcode_document (url_template, postcode):
+    """The decoded response (shared with the response cache - read-only), None if the request failed"""
+    return fetch_json(url_template, url_template.format(area_code=postcode), None,
+                      headers={"X-Auth-Token": AUTH_TOKEN}, cache_params={"area_code": postcode})
+
+def records_at (data, path):
+    """Follow path (e.g. "data", "sale_listings") into a response -> list of records, [] if absent"""
+    for key in path:
+        if not isinstance(data, dict):
+            return []
+        data = data.get(key)
+    return data if isinstance(data, list) else []
+
+def fetch_postcode_data (url_template, postcode, *path):
+    """
+    INPUTS:
+    url_template: str (e.g. SALE_HISTORY_URL)
+    postcode: str
+    path: keys to follow inside the response (e.g. "data", "sale_listings")
+
+    OUTPUTS:
+    list of records, [] if the request failed or has no data
+    """
+    return records_at(fetch_postcode_document(url_template, postcode), path)
+
+def index_by_address (records):
+    """street_address -> records for that address, in response order"""
+    index = {}
+    for p in records:
+        if p is None:
+            continue
+        index.setdefault(p.get("street_address"), []).append(p)
+    return index
+
+def get_postcode_index (postcode):
+    """
+    Fetches sale history, sale listings and energy performance for a postcode
+    (3 calls, then served from the response cache until their TTL) and
+    indexes each by street_address, so every address in the postcode is
+    then a dict lookup.
+
+    The built index is kept while the response cache keeps returning the same
+    documents, so repeat calls are 3 cache lookups - once a document expires
+    and is fetched again, the index is rebuilt. Failed requests aren't kept -
+    the next call retries.
+
+    OUTPUTS:
+    {"history": {...}, "listings": {...}, "epc": {...}}
+    """
+    documents = tuple(fetch_postcode_document(url_template, postcode) for url_template, path in POSTCODE_DOCUMENTS.values())
+
+    with postcode_indexes_lock:
+        entry = postcode_indexes.get(postcode)
+        if entry is not None and all(old is new for old, new in zip(entry[0], documents)):
+            postcode_indexes.move_to_end(postcode)
+            return entry[1]
+
+    index = {
+        name: index_by_address(records_at(document, path))
+        for (name, (url_template, path)), document in zip(POSTCODE_DOCUMENTS.items(), documents)
+    }
+
+    if all(document is not None for document in documents):
+        with postcode_indexes_lock:
+            postcode_indexes[postcode] = (documents, index)
+            postcode_indexes.move_to_end(postcode)
+            while len(postcode_indexes) > POSTCODE_INDEX_CACHE_SIZE:
+                postcode_indexes.popitem(last=False)
+    return index
+
+def is_postcode_cached (postcode):
+    """True if get_postcode_index(postcode) would make no API calls"""
+    return all(is_cached(url_template, {"area_code": postcode})
+               for url_template, path in POSTCODE_DOCUMENTS.values())
+
 # HOUSE MAIN FEATURES:
-def get_property_type (postcode, address):
-    URL = "https://api.scansan.com/v1/postcode/" + postcode + "/sale/history"
-    data = rq.get(URL, headers={"X-Auth-Token": AUTH_TOKEN}).json () ["data"]
-    if (data is None):
-        return None
-    for p in data:
+def get_property_type (postcode, address, index=None):
+    index = index or get_postcode_index(postcode)
+    for p in index["history"].get(address, [])[:1]:
         pt = p ["property_type"]
-        test_address = p ["street_address"]
-        if test_address == address:
-            if pt == None:
-                return None
-            if "flat" in pt.lower():
-                return "F"
-            elif "maisonette" in pt.lower():
-                return "F"
-            elif "detached" in pt.lower():
-                return "D"
-            elif "semi" in pt.lower():
-                return "S"
-            elif "terrace" in pt.lower():
-                return "T"
-            else:
-                return None
+        if pt == None:
+            return None
+        if "flat" in pt.lower():
+            return "F"
+        elif "maisonette" in pt.lower():
+            return "F"
+        elif "detached" in pt.lower():
+            return "D"
+        elif "semi" in pt.lower():
+            return "S"
+        elif "terrace" in pt.lower():
+            return "T"
+        else:
+            return None
     return None
 
-def get_habitable_rooms (postcode, address):
-    URL = "https://api.scansan.com/v1/area_codes/" + postcode + "/sale/listings"
-    data = rq.get(URL, headers={"X-Auth-Token": AUTH_TOKEN}).json () ["data"] ["sale_listings"]
-    if data is None:
-        return None
-    for p in data:
-        test_address = p ["street_address"]
+def get_habitable_rooms (postcode, address, index=None):
+    index = index or get_postcode_index(postcode)
+    for p in index["listings"].get(address, []):
         bedrooms = p ["bedrooms"]
         living_rooms = p ["living_rooms"]
-        if test_address == address and bedrooms is not None and living_rooms is not None:
+        if bedrooms is not None and living_rooms is not None:
             return bedrooms + living_rooms
     return None
 
-def get_floor_area (postcode, address):
-    URL = "https://api.scansan.com/v1/area_codes/" + postcode + "/sale/listings"
-    data = rq.get(URL, headers={"X-Auth-Token": AUTH_TOKEN}).json () ["data"] ["sale_listings"]
-    if data is None:
-        return None
-    for p in data:
-        test_address = p ["street_address"]
+def get_floor_area (postcode, address, index=None):
+    index = index or get_postcode_index(postcode)
+    for p in index["listings"].get(address, []):
         floor_area = p ["property_size"]
-        if test_address == address and floor_area is not None:
+        if floor_area is not None:
             return int(floor_area)
         
     return None
@@ -67,7 +151,7 @@ epc_key = {
 
 # def get_epc_values (postcode, address):
 #     URL = "https://api.scansan.com/v1/postcode/" + postcode + "/energy/performance"
-#     d = rq.get(URL, headers={"X-Auth-Token": AUTH_TOKEN}).json ()
+#     d = http_get(URL, headers={"X-Auth-Token": AUTH_TOKEN}).json ()
 #     if (d is None):
 #         return None
 #     data = d["data"]
@@ -87,29 +171,18 @@ epc_key = {
 
 #     return epc_values
 
-def get_epc_values (uprn, address):
-    URL = "https://api.scansan.com/v1/postcode/" + uprn + "/energy/performance"
-    d = rq.get(URL, headers={"X-Auth-Token": AUTH_TOKEN}).json()
-    if (d is None):
-        return None
-    data = d["data"]
+def get_epc_values (postcode, address, index=None):
+    index = index or get_postcode_index(postcode)
     epc_values = {}
-    for p in data:
-        if (p is None):
-            return None
-        test_address = p["street_address"]
-        if test_address == address:
-            for key in epc_key:
-                if (key is None):
-                    return None
-                category = epc_key[key]["category"]
-                value = epc_key[key]["value"]
-                epc_values[key] = p[category][value]
+    # last matching certificate wins
+    for p in index["epc"].get(address, []):
+        for key in epc_key:
+            category = epc_key[key]["category"]
+            value = epc_key[key]["value"]
+            epc_values[key] = p[category][value]
 
     return epc_values
 
-get_epc_values("SW1A", "10 Downing Street")
-
 # hash key - gives path in energy performance to description values - handled separately due to more complex values
 
 epc_desc_key = {
@@ -120,96 +193,84 @@ epc_desc_key = {
     "MAINHEAT_DESCRIPTION": "property_main_heating_description"
 }
 
-def get_desc_df (postcode, address):
-    URL = "https://api.scansan.com/v1/postcode/" + postcode + "/energy/performance"
-    data = rq.get(URL, headers={"X-Auth-Token": AUTH_TOKEN}).json () ["data"]
-    if data is None:
+def get_desc_df (postcode, address, index=None):
+    index = index or get_postcode_index(postcode)
+    if not index["epc"].get(address):
         return None
-    for p in data:
-        test_address = p ["street_address"]
-        if test_address == address:
-            return pd.DataFrame([{
-                key: p ["property_efficiency"] [value]
-                for key, value in epc_desc_key.items()
-            }])
+    return pd.DataFrame([get_desc_values (address, index)])
 
 # Key word identifiers for descriptions - descriptions have more complicated values and are broken down with key word analysis
-def sort_description (df, old_column_name, new_column_name, key):
-    df[new_column_name] = pd.Series(pd.NA, index=df.index, dtype="string")
-    for keyword in key:
-        df.loc[df[old_column_name].str.contains(keyword, case=False, na=False), new_column_name] = key[keyword]
-
-def sort_descriptions (df):
-    values = {}
-    values ["FLOOR_TYPE"] = sort_description (df, "FLOOR_DESCRIPTION", "FLOOR_TYPE", {
+# (source column, new column, keyword regex -> value); when several keywords match, the last one listed wins
+description_rules = [
+    ("FLOOR_DESCRIPTION", "FLOOR_TYPE", {
         "solid": "solid",
         "suspended": "suspended",
         "unheated space": "to unheated space",
         "external air": "to external air",
         "conservatory": "conservatory",
         "dwelling|premise": "premise below"
-    })
+    }),
 
-    values ["FLOOR_INSULATED"] = sort_description (df, "FLOOR_DESCRIPTION", "FLOOR_INSULATED", {
+    ("FLOOR_DESCRIPTION", "FLOOR_INSULATED", {
         "insulated": "Y",
         "uninsulated|no insulation|limited": "N"
-    })
+    }),
 
     # WINDOWS_DESCRIPTION sorted
-    values ["WINDOWS_TYPE"] = sort_description (df, "WINDOWS_DESCRIPTION", "WINDOWS_TYPE", {
+    ("WINDOWS_DESCRIPTION", "WINDOWS_TYPE", {
         "single": "single",
         "double": "double",
         "triple": "triple",
         "secondary": "secondary",
         "multiple": "multiple"
-    })
+    }),
 
-    values ["WINDOWS_DEGREE"] = sort_description (df, "WINDOWS_DESCRIPTION", "WINDOWS_DEGREE", {
+    ("WINDOWS_DESCRIPTION", "WINDOWS_DEGREE", {
         "full": "fully",
         "mostly": "mostly",
         "some|partial": "partial"
-    })
+    }),
 
     # WALLS_DESCRIPTION
-    values ["WALLS_TYPE"] = sort_description (df, "WALLS_DESCRIPTION", "WALLS_TYPE", {
+    ("WALLS_DESCRIPTION", "WALLS_TYPE", {
         "granite or whin": "granite or whinstone",
         "solid brick": "solid brick",
         "sandstone|limestone": "sandstone or limestone",
         "timber frame": "timber frame",
         "system built": "system built",
         "cob": "cob"
-    })
+    }),
 
-    values ["WALLS_CAVITY"] = sort_description (df, "WALLS_DESCRIPTION", "WALLS_CAVITY", {
+    ("WALLS_DESCRIPTION", "WALLS_CAVITY", {
         "cavity": "unfilled",
         "filled": "filled"
-    })
+    }),
 
-    values ["WALLS_INSULATED"] = sort_description (df, "WALLS_DESCRIPTION", "WALLS_INSULATED", {
+    ("WALLS_DESCRIPTION", "WALLS_INSULATED", {
         "insulated": "insulated",
         "internal": "internal",
         "external": "external",
         "partial": "partial",
         "no insulation": "no insulation"
-    })
+    }),
 
     # ROOF_DESCRIPTION
-    values ["WALLS_CAVITY"] = sort_description (df, "ROOF_DESCRIPTION", "ROOF_TYPE", {
+    ("ROOF_DESCRIPTION", "ROOF_TYPE", {
         "pitched": "pitched",
         "flat": "flat",
         "roof room": "roof rooms",
         "thatched": "thatched",
         "premise": "other premises above"
-    })
+    }),
 
-    values ["ROOF_INSULATED"] = sort_description (df, "ROOF_DESCRIPTION", "ROOF_INSULATED", {
+    ("ROOF_DESCRIPTION", "ROOF_INSULATED", {
         "insulated|additional": "insulated",
         "limited": "limited insulation",
         "no insulation": "no insulation"
-    })
+    }),
 
     # MAINHEAT_DESCRIPTION
-    values ["MAINHEAT_TYPE"] = sort_description (df, "MAINHEAT_DESCRIPTION", "MAINHEAT_TYPE",{
+    ("MAINHEAT_DESCRIPTION", "MAINHEAT_TYPE", {
         "room heaters|electric heaters|no System": "room heaters",
         "electric ceiling": "electric ceiling",
         "coal|wood|dual fuel": "solid fuel",
@@ -222,37 +283,124 @@ def sort_descriptions (df):
         "electric storage heaters": "electric storage",
         "mains gas": "gas boiler"
     })
+]
 
-    return values
+@lru_cache(maxsize=None)
+def compile_key (key_items):
+    """
+    Precompiles a keyword -> value mapping once.
 
+    OUTPUTS:
+    (any keyword regex, [(keyword regex, value), ...] with the last listed keyword first)
+    """
+    any_keyword = re.compile("|".join(f"(?:{keyword})" for keyword, value in key_items), re.IGNORECASE)
+    keywords = [(re.compile(keyword, re.IGNORECASE), value) for keyword, value in reversed(key_items)]
+    return any_keyword, keywords
 
+def classify_description (text, compiled_key):
+    """Value of the last listed keyword found in text, None if none match"""
+    any_keyword, keywords = compiled_key
+    if not any_keyword.search(text):
+        return None
+    for pattern, value in keywords:
+        if pattern.search(text):
+            return value
+    return None
 
-def translator (postcode, address):
-    epc_values = get_epc_values (postcode, address)
-    desc_df = get_desc_df (postcode, address)
-    desc_values = sort_descriptions (desc_df)
+def sort_description (df, old_column_name, new_column_name, key):
+    # descriptions repeat heavily, so classify each distinct text once and broadcast
+    compiled_key = compile_key (tuple(key.items()))
+    codes, uniques = pd.factorize(df[old_column_name].astype("string"))
 
+    # trailing NA so missing descriptions (code -1) map to NA
+    labels = [classify_description (text, compiled_key) for text in uniques] + [None]
+    df[new_column_name] = pd.array(np.asarray(labels, dtype=object)[codes], dtype="string")
+
+def sort_descriptions (df):
+    for old_column_name, new_column_name, key in description_rules:
+        sort_description (df, old_column_name, new_column_name, key)
+
+    return df
+
+
+
+# columns sort_descriptions derives from the EPC descriptions
+desc_columns = [new_column_name for old_column_name, new_column_name, key in description_rules]
+
+def get_base_features (postcode, address, index):
+    """Every feature except the description-derived ones, from a postcode index"""
+    epc_values = get_epc_values (postcode, address, index=index)
     return {
         "postcode": postcode,
-        "propertytype": get_property_type (postcode, address),
-        "TOTAL_FLOOR_AREA": get_floor_area (postcode, address),
-        "NUMBER_HABITABLE_ROOMS": get_habitable_rooms (postcode, address),
-        "CURRENT_ENERGY_RATING": epc_values ["CURRENT_ENERGY_RATING"],
-        "ENERGY_CONSUMPTION_CURRENT": epc_values ["ENERGY_CONSUMPTION_CURRENT"],
-        "CO2_EMISSIONS_CURRENT": epc_values ["CO2_EMISSIONS_CURRENT"],
-        "HEATING_COST_CURRENT": epc_values ["HEATING_COST_CURRENT"],
-        "HOT_WATER_COST_CURRENT": epc_values ["HOT_WATER_COST_CURRENT"],
-        "MAINHEAT_ENERGY_EFF": epc_values ["MAINHEAT_ENERGY_EFF"],
-        "FLOOR_TYPE": desc_values ["FLOOR_TYPE"],
-        "FLOOR_INSULATED": desc_values ["FLOOR_INSULATED"],
-        "WINDOWS_TYPE": desc_values ["WINDOWS_TYPE"],
-        "WINDOWS_DEGREE": desc_values ["WINDOWS_DEGREE"],
-        "WALLS_TYPE": desc_values ["WALLS_TYPE"],
-        "WALLS_CAVITY": desc_values ["WALLS_CAVITY"],
-        "WALLS_INSULATED": desc_values ["WALLS_INSULATED"],
-        "ROOF_TYPE": desc_values ["ROOF_TYPE"],
-        "ROOF_INSULATED": desc_values ["ROOF_INSULATED"],
-        "MAINHEAT_TYPE": desc_values ["MAINHEAT_TYPE"],
-        "MAINHEAT_ENERGY_EFF": desc_values ["MAINHEAT_ENERGY_EFF"]
+        "propertytype": get_property_type (postcode, address, index=index),
+        "TOTAL_FLOOR_AREA": get_floor_area (postcode, address, index=index),
+        "NUMBER_HABITABLE_ROOMS": get_habitable_rooms (postcode, address, index=index),
+        "CURRENT_ENERGY_RATING": epc_values.get ("CURRENT_ENERGY_RATING"),
+        "ENERGY_CONSUMPTION_CURRENT": epc_values.get ("ENERGY_CONSUMPTION_CURRENT"),
+        "CO2_EMISSIONS_CURRENT": epc_values.get ("CO2_EMISSIONS_CURRENT"),
+        "HEATING_COST_CURRENT": epc_values.get ("HEATING_COST_CURRENT"),
+        "HOT_WATER_COST_CURRENT": epc_values.get ("HOT_WATER_COST_CURRENT"),
+        "MAINHEAT_ENERGY_EFF": epc_values.get ("MAINHEAT_ENERGY_EFF")
     }
 
+def get_desc_values (address, index):
+    """Raw EPC description strings for an address (None where missing)"""
+    for p in index["epc"].get(address, [])[:1]:
+        return {key: p ["property_efficiency"] [value] for key, value in epc_desc_key.items()}
+    return {key: None for key in epc_desc_key}
+
+def translator (postcode, address):
+    # one fetch per postcode document, shared by every lookup below
+    index = get_postcode_index (postcode)
+
+    desc_df = pd.DataFrame([get_desc_values (address, index)], dtype="string")
+    sort_descriptions (desc_df)
+    desc_values = desc_df.iloc[0]
+
+    def desc_value (column):
+        value = desc_values [column]
+        return None if pd.isna(value) else value
+
+    return {
+        **get_base_features (postcode, address, index),
+        **{column: desc_value (column) for column in desc_columns}
+    }
+
+def translate_many (addresses, valuation_date=None, max_workers=4):
+    """
+    Batch version of translator.
+
+    INPUTS:
+    addresses: iterable of (postcode, address) pairs - may span many postcodes
+    valuation_date: date (source of the year/month/quarter features, defaults to today)
+    max_workers: int (postcodes fetched concurrently)
+
+    OUTPUTS:
+    DataFrame with FEATURE_COLUMNS, one row per pair, in input order
+    """
+    pairs = list(addresses)
+    if not pairs:
+        return pd.DataFrame(columns=FEATURE_COLUMNS)
+
+    # each postcode's documents are fetched once, however many addresses it has
+    postcodes = list(dict.fromkeys(postcode for postcode, address in pairs))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(postcodes)))) as pool:
+        indexes = dict(zip(postcodes, pool.map(get_postcode_index, postcodes)))
+
+    df = pd.DataFrame([get_base_features (postcode, address, indexes [postcode]) for postcode, address in pairs])
+
+    # descriptions are classified for the whole batch at once
+    desc_df = pd.DataFrame([get_desc_values (address, indexes [postcode]) for postcode, address in pairs], dtype="string")
+    sort_descriptions (desc_df)
+    for column in desc_columns:
+        df [column] = desc_df [column].to_numpy()
+
+    valuation_date = valuation_date or date.today()
+    df ["year"] = valuation_date.year
+    df ["month"] = valuation_date.month
+    df ["quarter"] = (valuation_date.month - 1) // 3 + 1
+
+    for column in NUMERIC_FEATURES:
+        df [column] = pd.to_numeric(df [column], errors="coerce")
+
+    return df [FEATURE_COLUMNS]
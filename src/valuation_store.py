@@ -0,0 +1,215 @@
+"""
+Columnar store for one postcode's historical valuations.
+
+The historical valuations endpoint returns every property in a postcode, so
+the response is parsed once into two arrays (dates, prices) grouped by
+address and sorted by date within each address. A property's price history
+is then a slice of those arrays - no rescanning of the response and no copy.
+
+Decoded payloads are turned into columns by pyarrow (struct/list inference
+runs in C++), so parsing cost doesn't grow with per-valuation Python work.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+class PostcodeValuations:
+    def __init__(self, addresses, dates, prices, offsets):
+        """
+        INPUTS:
+        addresses: list of str (response order)
+        dates: datetime64[ns] array, grouped by address, ascending within each
+        prices: float64 array, same layout as dates
+        offsets: int array, len(addresses) + 1 - address i is [offsets[i], offsets[i + 1])
+        """
+        self.addresses = addresses
+        self.dates = dates
+        self.prices = prices
+        self.offsets = offsets
+        self._positions = {address: i for i, address in enumerate(addresses)}
+
+    @classmethod
+    def from_response(cls, resp):
+        """Parse a historical valuations response (see get_historical_valuations)."""
+        # Many APIs wrap results in {"data": [...]}
+        if isinstance(resp, dict) and isinstance(resp.get("data"), list):
+            props = resp["data"]
+        else:
+            # Or return a single property object
+            props = [resp] if isinstance(resp, dict) else []
+
+        try:
+            return cls.from_arrow(props)
+        except (pa.ArrowException, KeyError, TypeError, AttributeError):
+            # payload pyarrow can't type (mixed value types) - parse it row by row
+            return cls.from_records(props)
+
+    @classmethod
+    def from_arrow(cls, props):
+        """Columnar parse: pyarrow builds the arrays straight from the decoded list."""
+        props = pa.array(props)
+        if len(props) == 0 or not pa.types.is_struct(props.type):
+            return cls.from_columns([], [], [], [])
+
+        names = [field.name for field in props.type]
+        if "property_address" in names and "address" in names:
+            address_column = pc.coalesce(props.field("property_address"), props.field("address"))
+        else:
+            address_column = props.field("property_address" if "property_address" in names else "address")
+        all_addresses = address_column.to_pylist()
+
+        # a repeated address keeps its first entry, as the linear scan did
+        first_seen = {}
+        for i, address in enumerate(all_addresses):
+            first_seen.setdefault(address, i)
+        addresses = list(first_seen)
+        position = np.full(len(all_addresses), -1, dtype=np.int64)
+        position[list(first_seen.values())] = np.arange(len(addresses))
+
+        valuations = props.field("valuations") if "valuations" in names else None
+        if valuations is None or not pa.types.is_list(valuations.type) or not pa.types.is_struct(valuations.type.value_type):
+            # no property has any valuations
+            return cls.from_columns(addresses, [], [], [])
+
+        flat = pc.list_flatten(valuations)
+        codes = position[pc.list_parent_indices(valuations).to_numpy()]
+
+        raw_dates = flat.field("date")
+        parsed = pc.strptime(raw_dates, format="%Y-%m-%d", unit="ns", error_is_null=True)
+        if parsed.null_count == raw_dates.null_count:
+            dates = parsed.to_numpy(zero_copy_only=False).astype("datetime64[ns]")
+        else:
+            # not all plain YYYY-MM-DD - let pandas parse the column (still vectorised)
+            dates = pd.to_datetime(raw_dates.to_pandas(), errors="coerce", format="ISO8601").to_numpy(dtype="datetime64[ns]")
+        prices = pc.cast(flat.field("valuation"), pa.float64()).to_numpy(zero_copy_only=False)
+
+        keep = codes >= 0
+        return cls.from_arrays(addresses, codes[keep], dates[keep], prices[keep])
+
+    @classmethod
+    def from_records(cls, props):
+        """Row by row parse, for payloads from_arrow can't type."""
+        addresses = []
+        codes = []
+        raw_dates = []
+        raw_prices = []
+        for p in props:
+            if not isinstance(p, dict):
+                continue
+            address = p.get("property_address") or p.get("address")
+            # a repeated address keeps its first entry, as the linear scan did
+            if address in addresses:
+                continue
+            code = len(addresses)
+            addresses.append(address)
+            for v in p.get("valuations") or []:
+                codes.append(code)
+                raw_dates.append(v.get("date"))
+                raw_prices.append(v.get("valuation"))
+
+        return cls.from_columns(addresses, codes, raw_dates, raw_prices)
+
+    @classmethod
+    def from_columns(cls, addresses, codes, raw_dates, raw_prices):
+        """
+        Build from flat columns: codes[i] is the position in addresses of
+        valuation i. Unparseable dates/prices are dropped.
+        """
+        dates = pd.to_datetime(pd.Series(raw_dates, dtype=object), errors="coerce").to_numpy(dtype="datetime64[ns]")
+        prices = pd.to_numeric(pd.Series(raw_prices, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+        return cls.from_arrays(addresses, np.asarray(codes, dtype=np.int64), dates, prices)
+
+    @classmethod
+    def from_arrays(cls, addresses, codes, dates, prices):
+        """Build from parsed arrays (NaT/NaN rows are dropped)."""
+        valid = ~np.isnat(dates) & ~np.isnan(prices)
+        codes, dates, prices = codes[valid], dates[valid], prices[valid]
+
+        # group by address, date order within each
+        order = np.lexsort((dates, codes))
+        codes, dates, prices = codes[order], dates[order], prices[order]
+        offsets = np.searchsorted(codes, np.arange(len(addresses) + 1))
+
+        return cls(addresses, dates, prices, offsets)
+
+    def frame(self, property_address=None):
+        """
+        ['date', 'price'] DataFrame for property_address (the first property
+        when it's None or not in this postcode). The columns are views onto
+        the store's arrays - treat the frame as read-only.
+        """
+        if not self.addresses:
+            return pd.DataFrame(columns=["date", "price"])
+
+        i = self._positions.get(property_address, 0)
+        start, end = self.offsets[i], self.offsets[i + 1]
+        if start == end:
+            return pd.DataFrame(columns=["date", "price"])
+
+        return pd.DataFrame({"date": self.dates[start:end], "price": self.prices[start:end]}, copy=False)
+
+    def __len__(self):
+        return len(self.addresses)
+
+
+# below this many records the per-record loop beats building an arrow array
+BULK_MIN_RECORDS = 64
+
+
+def current_prices(records):
+    """
+    Current price for each current-valuations record: midpoint of the first
+    and last bounded_valuation values (the only value if there is one), else
+    last_sold_price, else None. Bulk inputs are computed column-wise.
+
+    INPUTS:
+    records: list of dicts from get_current_valuations()["data"]
+
+    OUTPUTS:
+    list of int | float | None, one per record (non-whole values stay floats)
+    """
+    if len(records) < BULK_MIN_RECORDS:
+        return [_current_price(record) for record in records]
+
+    try:
+        table = pa.array(records)
+        names = [field.name for field in table.type]
+        n = len(table)
+
+        mid = np.full(n, np.nan)
+        has_bounds = np.zeros(n, dtype=bool)
+        if "bounded_valuation" in names and pa.types.is_list(table.field("bounded_valuation").type):
+            bounds = table.field("bounded_valuation")
+            lengths = pc.fill_null(pc.list_value_length(bounds), 0).to_numpy()
+            values = pc.cast(bounds.values, pa.float64()).to_numpy(zero_copy_only=False)
+            offsets = bounds.offsets.to_numpy()
+            has_bounds = lengths > 0
+            if len(values):
+                first = values[np.minimum(offsets[:-1], len(values) - 1)]
+                last = values[np.maximum(offsets[1:] - 1, 0)]
+                mid = np.where(lengths >= 2, np.floor((first + last) / 2), first)
+
+        last_sold = np.full(n, np.nan)
+        if "last_sold_price" in names:
+            last_sold = pc.cast(table.field("last_sold_price"), pa.float64()).to_numpy(zero_copy_only=False)
+            # a 0 sold price means unknown, like the falsy check it replaces
+            last_sold = np.where(last_sold == 0, np.nan, last_sold)
+
+        prices = np.where(has_bounds, mid, last_sold)
+    except (pa.ArrowException, KeyError, TypeError, AttributeError):
+        # payload pyarrow can't type - one record at a time
+        return [_current_price(record) for record in records]
+
+    return [None if np.isnan(price) else int(price) if price.is_integer() else float(price) for price in prices.tolist()]
+
+
+def _current_price(record):
+    bounded_valuation = record.get("bounded_valuation") or []
+    if len(bounded_valuation) >= 2:
+        return (bounded_valuation[0] + bounded_valuation[-1]) // 2
+    if bounded_valuation:
+        return bounded_valuation[0]
+    return record.get("last_sold_price") or None